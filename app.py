@@ -1,17 +1,30 @@
 from flask import Flask, Response, request, jsonify, render_template, send_file
+from flask import g as contexto_peticion
 from flask import Flask, request, jsonify, render_template, send_file
 import time
-from modules.pruebas.dispatcher import ejecutar_pruebas
-from modules.generadores.minimos_cuadrados import generar as generar_mc
-from modules.generadores.congruencia_lineal import generar as generar_cl
-from modules.generadores.congruencia_multi import generar as generar_cm
-from modules.generadores.distribucion_normal import distribucion_normal_inversa, graficar_distribucion_normal
+import threading
+from modules.pruebas.dispatcher import ejecutar_pruebas, clave_resultados, resultados_a_dict
+from modules.pruebas.incremental import EstadisticasIncrementales, ESTADO_INCREMENTAL
+from modules.generadores.minimos_cuadrados import generar_por_bloques as generar_mc_por_bloques, semilla_degenerada
+from modules.generadores.congruencia_lineal import generar_por_bloques as generar_cl_por_bloques, ventana as ventana_cl
+from modules.generadores.congruencia_multi import generar_por_bloques as generar_cm_por_bloques, ventana as ventana_cm
+from modules.generadores.secuencia import Secuencia
+from modules.generadores.corridas import guardar_corrida, abrir_corrida
+from modules.generadores.cache import CacheLRU
+from modules.estado_sesion import AlmacenSesiones, DURACION_SESION, id_valido
+from modules.generadores.exportacion import (EXTENSIONES, encabezado_npy, encabezado_crudo,
+                                             flujo_npy, flujo_crudo, flujo_parquet)
+from modules.generadores.periodo import periodo_lineal, periodo_multiplicativo, periodo_cuadrados
+from modules.generadores.distribucion_normal import distribucion_normal_inversa, graficar_distribucion_normal, METODOS_NORMAL
 from modules.generadores.distribucion_uniforme import distribucion_uniforme, graficar_distribucion_uniforme
 #from modules.pruebas import media as prueba_media_mod
 
+import numpy as np
 import pandas as pd
-import json
 import io
+import os
+import json
+import uuid
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
@@ -19,40 +32,268 @@ import matplotlib.pyplot as plt
 import base64
 import io
 
-# Variables globales para almacenar los Ri generados
-ri_cuadrados = []
-ri_lineal = []
-ri_multiplicativo = []
-
-# Variables globales para almacenar semilla seleccionada por método
-semilla_seleccionada_cuadrados = None
-semilla_seleccionada_lineal = None
-semilla_seleccionada_multiplicativo = None
+# Filas por bloque al exportar CSV: pandas tarda ~0.15 s en formatear 2^16 filas,
+# así que el primer byte sale rápido sin importar el tamaño del archivo
+FILAS_POR_BLOQUE_CSV = 1 << 16
 
-# Variable global para rastrear el último método de generación usado
-ultimo_metodo_generacion = None
+# Caché de secuencias generadas, acotado por bytes (las columnas están mapeadas desde outputs/corridas)
+MAX_BYTES_CACHE = 1024 ** 3
+cache_secuencias = CacheLRU(MAX_BYTES_CACHE)
 
-# Variable global para cachear resultados de pruebas estadísticas
-ultimos_resultados_pruebas_raw = None
-ultimos_resultados_pruebas_procesados = None
+# Caché de resultados de pruebas, acotado por cantidad de baterías. La clave es la huella de los
+# Ri con las pruebas, sus k y alpha: repetir pruebas o distribuciones sobre los mismos datos no las recalcula
+MAX_RESULTADOS_PRUEBAS = 256
+cache_resultados = CacheLRU(MAX_RESULTADOS_PRUEBAS, tamano=lambda resultados: 1)
 
 app = Flask(__name__)
 
-nums = []
+# Estado de cada usuario (últimas corridas y semillas cargadas),
+# guardado por sesión en outputs/sesiones (o RUTA_SESIONES) para que varios hilos o procesos lo compartan
+RUTA_SESIONES = os.environ.get("RUTA_SESIONES") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "outputs", "sesiones")
+COOKIE_SESION = "sesion_id"
+sesiones = AlmacenSesiones(RUTA_SESIONES)
+
+# Pruebas incrementales de /pruebas: los acumuladores de cada sesión van en un almacén aparte
+# (su JSON no crece con los números) y los números recibidos en <id>.f8, agregados al final
+sesiones_incrementales = AlmacenSesiones(os.path.join(RUTA_SESIONES, "incremental"), ESTADO_INCREMENTAL)
+
+# Segundos entre limpiezas de sesiones vencidas en cada proceso: limpiar recorre las carpetas
+# de sesiones, así que no se hace en cada petición sin cookie (clientes sin cookies, bots)
+INTERVALO_LIMPIEZA_SESIONES = 10 * 60
+ultima_limpieza_sesiones = float("-inf")
+candado_limpieza_sesiones = threading.Lock()
+
+def limpiar_sesiones_vencidas():
+    """Borra las sesiones vencidas, a lo sumo una vez cada INTERVALO_LIMPIEZA_SESIONES segundos."""
+    global ultima_limpieza_sesiones
+    if time.monotonic() - ultima_limpieza_sesiones < INTERVALO_LIMPIEZA_SESIONES:
+        return
+    # Si otro hilo ya está limpiando, no se espera
+    if not candado_limpieza_sesiones.acquire(blocking=False):
+        return
+    try:
+        if time.monotonic() - ultima_limpieza_sesiones < INTERVALO_LIMPIEZA_SESIONES:
+            return
+        ultima_limpieza_sesiones = time.monotonic()
+        sesiones.limpiar()
+        sesiones_incrementales.limpiar()
+    finally:
+        candado_limpieza_sesiones.release()
+
+@app.before_request
+def identificar_sesion():
+    id_sesion = request.cookies.get(COOKIE_SESION)
+    contexto_peticion.sesion_nueva = not id_valido(id_sesion)
+    if contexto_peticion.sesion_nueva:
+        id_sesion = uuid.uuid4().hex
+        limpiar_sesiones_vencidas()
+    contexto_peticion.id_sesion = id_sesion
+
+@app.after_request
+def guardar_cookie_sesion(respuesta):
+    if getattr(contexto_peticion, "sesion_nueva", False):
+        respuesta.set_cookie(COOKIE_SESION, contexto_peticion.id_sesion,
+                             max_age=DURACION_SESION, httponly=True, samesite="Lax")
+    return respuesta
+
+def estado_sesion():
+    """Copia del estado de la sesión actual (solo lectura)."""
+    return sesiones.leer(contexto_peticion.id_sesion)
+
+def modificar_sesion():
+    """Bloque `with` que entrega el estado de la sesión actual y lo guarda al salir."""
+    return sesiones.modificar(contexto_peticion.id_sesion)
+
+def ri_de(generador, estado=None):
+    """Ri de la última corrida de `generador` en esta sesión (arreglo vacío si no hay)."""
+    corrida = (estado or estado_sesion())["corridas"][generador]
+    if corrida is None:
+        return np.empty(0)
+    return obtener_secuencia(corrida["parametros"], corrida["n"]).ri
+
+def registrar_corrida(generador, parametros, n):
+    """Anota en la sesión la corrida recién generada como la última del generador."""
+    with modificar_sesion() as estado:
+        estado["corridas"][generador] = {"parametros": parametros, "n": n}
+        estado["ultimo_metodo"] = generador
+
+def tomar_semilla(generador):
+    """Semilla cargada para el generador, que se limpia al tomarla (None si no hay)."""
+    if estado_sesion()["semillas"][generador] is None:
+        return None
+    return sesiones.tomar(contexto_peticion.id_sesion, "semillas", generador)
 
 @app.route("/pruebas")
 def pruebas():
     return render_template("pruebas.html")
 
+# Formatos de los números en cuerpos binarios de /evaluar (little-endian, como Float64Array/Float32Array)
+TIPOS_BINARIOS = {"float64": "<f8", "float32": "<f4"}
+
+# Bytes que se leen del cuerpo por vez
+BYTES_POR_BLOQUE = 1 << 20
+
+def leer_numeros_binarios(flujo, tipo="float64", longitud=None):
+    """
+    Números de un cuerpo binario leídos por bloques directo a un arreglo del
+    tamaño de los datos (sin el texto de un JSON ni una copia del cuerpo).
+    `longitud` son los bytes del cuerpo; si no se conoce se lee hasta el final.
+    """
+    if tipo not in TIPOS_BINARIOS:
+        raise ValueError(f"Tipo '{tipo}' no soportado (usa float64 o float32)")
+    dtype = np.dtype(TIPOS_BINARIOS[tipo])
+
+    if longitud is None:
+        cuerpo = b"".join(iter(lambda: flujo.read(BYTES_POR_BLOQUE), b""))
+        datos = np.frombuffer(cuerpo, dtype=np.uint8)
+        longitud = len(datos)
+    else:
+        datos = np.empty(longitud, dtype=np.uint8)
+        vista = memoryview(datos)
+        leidos = 0
+        while leidos < longitud:
+            cantidad = flujo.readinto(vista[leidos:leidos + BYTES_POR_BLOQUE])
+            if not cantidad:
+                raise ValueError(f"El cuerpo terminó después de {leidos} de {longitud} bytes")
+            leidos += cantidad
+
+    if longitud % dtype.itemsize:
+        raise ValueError(f"{longitud} bytes no son un número entero de valores {tipo}")
+    return datos.view(dtype).astype(np.float64, copy=False)
+
+def tamano_archivo(archivo):
+    """Bytes de un archivo subido (los de más de 500 KB quedan en disco, así que se mide con seek)."""
+    archivo.stream.seek(0, os.SEEK_END)
+    tamano = archivo.stream.tell()
+    archivo.stream.seek(0)
+    return tamano
+
+def leer_archivo_numeros(archivo, tipo="float64"):
+    """
+    Números de un archivo subido: un .npy (como los de /export_binario), que
+    se reconoce por su encabezado, o binario crudo de `tipo`.
+    """
+    prefijo = archivo.stream.read(len(np.lib.format.MAGIC_PREFIX))
+    archivo.stream.seek(0)
+    if prefijo != np.lib.format.MAGIC_PREFIX:
+        return leer_numeros_binarios(archivo.stream, tipo, tamano_archivo(archivo))
+
+    datos = np.load(archivo.stream, allow_pickle=False)
+    if datos.ndim != 1 or datos.dtype.kind not in "fiu":
+        raise ValueError("el .npy debe ser un arreglo numérico de una dimensión")
+    return datos.astype(np.float64, copy=False)
+
+def configuracion_pruebas(parametros):
+    """pruebasSeleccionadas (JSON) y alpha de la query string o de los campos de un formulario."""
+    pruebas = json.loads(parametros.get("pruebasSeleccionadas", "{}"))
+    if not isinstance(pruebas, dict):
+        raise ValueError("pruebasSeleccionadas debe ser un objeto JSON")
+    return pruebas, float(parametros.get("alpha", 0.05))
+
 @app.route("/evaluar", methods=["POST"])
 def api_pruebas():
+    """
+    Ejecuta las pruebas seleccionadas. Los números pueden llegar como:
+    - JSON: {"numeros": [...], "pruebasSeleccionadas": {...}, "alpha": 0.05}
+    - application/octet-stream: los números en binario (float64, o float32 con
+      ?tipo=float32), con pruebasSeleccionadas (JSON) y alpha en la query string
+    - multipart/form-data: varios conjuntos, un archivo por conjunto (.npy o binario
+      crudo), con pruebasSeleccionadas, alpha y tipo como campos del formulario. Devuelve
+      {nombre del archivo: resultados} con un resultado por conjunto.
+    """
+    try:
+        if request.mimetype == "application/octet-stream":
+            pruebas, alpha = configuracion_pruebas(request.args)
+            conjuntos = {None: leer_numeros_binarios(request.stream, request.args.get("tipo", "float64"),
+                                                     request.content_length)}
+        elif request.mimetype == "multipart/form-data":
+            pruebas, alpha = configuracion_pruebas(request.form)
+            tipo = request.form.get("tipo", "float64")
+            conjuntos = {}
+            for campo, archivo in request.files.items(multi=True):
+                nombre = archivo.filename or campo
+                if nombre in conjuntos:
+                    raise ValueError(f"Conjunto repetido: '{nombre}'")
+                conjuntos[nombre] = leer_archivo_numeros(archivo, tipo)
+            if not conjuntos:
+                raise ValueError("El formulario no trae archivos con números")
+        else:
+            data = request.get_json()
+            pruebas = data.get("pruebasSeleccionadas", {})
+            alpha = data.get("alpha", 0.05)
+            conjuntos = {None: np.asarray(data.get("numeros", []), dtype=np.float64)}
+            if conjuntos[None].ndim != 1:
+                raise ValueError("se esperaba una lista de números")
+    except (TypeError, ValueError, AttributeError) as e:
+        return {"error": f"Datos inválidos: {str(e)}"}, 400
+
+    for nombre, datos in conjuntos.items():
+        if len(datos) == 0:
+            return {"error": f"No hay números para evaluar{f' en {nombre}' if nombre else ''}"}, 400
+
+    try:
+        resultados = {nombre: resultados_a_dict(ejecutar_pruebas_con_cache(datos, pruebas, alpha))
+                      for nombre, datos in conjuntos.items()}
+    except ValueError as e:
+        # Configuración que las pruebas rechazan (p. ej. poker con d=7): no queda en el caché
+        return {"error": f"Configuración inválida: {str(e)}"}, 400
+    return jsonify(resultados[None] if None in resultados else resultados)
+
+def ruta_numeros_incrementales():
+    return sesiones_incrementales.ruta_archivo(contexto_peticion.id_sesion, "f8")
+
+def numeros_incrementales():
+    """Números recibidos por /evaluar/agregar en esta sesión (float64)."""
+    try:
+        return np.fromfile(ruta_numeros_incrementales(), dtype="<f8")
+    except FileNotFoundError:
+        return np.empty(0, dtype=np.float64)
+
+def reiniciar_incrementales():
+    """Descarta el conjunto incremental de la sesión (acumuladores y números)."""
+    with sesiones_incrementales.modificar(contexto_peticion.id_sesion) as estado:
+        estado["estadisticas"] = None
+        try:
+            os.remove(ruta_numeros_incrementales())
+        except FileNotFoundError:
+            pass
+
+@app.route("/evaluar/agregar", methods=["POST"])
+def api_pruebas_incrementales():
+    """
+    Agrega un lote de números al conjunto de la sesión y devuelve las pruebas
+    actualizadas. Solo se procesan los números del lote: los anteriores ya
+    están en los acumuladores. Con "reiniciar": true empieza un conjunto nuevo.
+    """
     data = request.get_json()
-    datos = data.get("numeros", [])
+    try:
+        lote = np.asarray(data.get("numeros", []), dtype=np.float64)
+        if lote.ndim != 1:
+            raise ValueError("se esperaba una lista de números")
+    except (TypeError, ValueError) as e:
+        return {"error": f"Números inválidos: {str(e)}"}, 400
     pruebas = data.get("pruebasSeleccionadas", {})
     alpha = data.get("alpha", 0.05)
 
-    resultados = ejecutar_pruebas(datos, pruebas, alpha)
-    return jsonify(resultados)
+    if data.get("reiniciar"):
+        # Los números de /set se reemplazan por los del conjunto incremental
+        with modificar_sesion() as estado:
+            estado["nums"] = []
+        reiniciar_incrementales()
+
+    with sesiones_incrementales.modificar(contexto_peticion.id_sesion) as estado:
+        estadisticas = EstadisticasIncrementales.desde_dict(estado["estadisticas"])
+        # Un k nuevo se cuenta una vez sobre los números anteriores; después solo con cada lote
+        estadisticas.preparar(pruebas, datos_previos=numeros_incrementales)
+        with open(ruta_numeros_incrementales(), "ab") as archivo:
+            archivo.write(lote.astype("<f8").tobytes())
+        estadisticas.agregar(lote)
+        estado["estadisticas"] = estadisticas.a_dict()
+
+    if estadisticas.n == 0:
+        return {"error": "No hay números para evaluar"}, 400
+    return jsonify(resultados_a_dict(ejecutar_pruebas(estadisticas, pruebas, alpha)))
 
 @app.route("/resultados")
 def resultados():
@@ -62,23 +303,119 @@ def resultados():
 @app.route("/set", methods=["POST"])
 def set_nums(): 
         data = request.get_json()
-        global nums
-        nums = data
+        with modificar_sesion() as estado:
+            estado["nums"] = data
+        reiniciar_incrementales()
         return Response(status=204)
 
 @app.route("/all", methods=["GET"])
 def get_nums(): 
-    return nums
+    return jsonify(estado_sesion()["nums"] + numeros_incrementales().tolist())
 
 # Página principal
 @app.route("/")
 def index():
     return render_template("index.html")
 
+def limitar_por_periodo(n_int, info_periodo):
+    """
+    Recorta n a la cantidad de valores distintos que produce el generador
+    (su período, o cola + ciclo en cuadrados medios) antes de generar.
+    Devuelve el n a usar y un aviso HTML (vacío si no hubo recorte).
+    """
+    limite = info_periodo["maximo_valores"]
+    if n_int <= limite:
+        return n_int, ""
+
+    if info_periodo.get("degenerada"):
+        detalle = f"la secuencia se degenera después de {limite:,} valores"
+    elif info_periodo.get("cola"):
+        detalle = f"tras una cola de {info_periodo['cola']:,} valores entra en un ciclo de {info_periodo['periodo']:,}"
+    else:
+        detalle = f"el período del generador es {info_periodo['periodo']:,}"
+
+    aviso = f'''
+    <div class="alert alert-warning mb-3">
+        <h5><i class="fas fa-exclamation-triangle"></i> Cantidad limitada por el período</h5>
+        <p>Se pidieron {n_int:,} números pero {detalle}; se generaron solo {limite:,} para no repetir valores.</p>
+    </div>
+    '''
+    return limite, aviso
+
+def parametros_formulario(generador, formulario):
+    """
+    Lee del formulario (o de los argumentos de la URL) los parámetros de un
+    generador. Devuelve los parámetros como diccionario y n recortado al período.
+    """
+    n_pedido = int(float(formulario["iteraciones"]))
+
+    if generador == "cuadrados":
+        semilla = int(formulario["semilla"])
+        n, _ = limitar_por_periodo(n_pedido, periodo_cuadrados(semilla))
+        return {"metodo": "cuadrados", "semilla": semilla}, n
+
+    xo, g = int(formulario["xo"]), int(formulario["g"])
+    if generador == "lineal":
+        k, c = int(formulario["k"]), int(formulario["c"])
+        n, _ = limitar_por_periodo(n_pedido, periodo_lineal(xo, k, c, g))
+        return {"metodo": "lineal", "xo": xo, "k": k, "c": c, "g": g}, n
+    if generador == "multiplicativo":
+        t = int(formulario["t"])
+        n, _ = limitar_por_periodo(n_pedido, periodo_multiplicativo(xo, t, g))
+        return {"metodo": "multiplicativo", "xo": xo, "t": t, "g": g}, n
+
+    raise ValueError("generador no válido")
+
+def bloques_generador(parametros, n):
+    """Generador por bloques que corresponde a los parámetros."""
+    if parametros["metodo"] == "cuadrados":
+        return generar_mc_por_bloques(parametros["semilla"], n)
+    if parametros["metodo"] == "lineal":
+        return generar_cl_por_bloques(parametros["xo"], parametros["k"], parametros["c"], parametros["g"], n)
+    return generar_cm_por_bloques(parametros["xo"], parametros["t"], parametros["g"], n)
+
+def obtener_secuencia(parametros, n):
+    """
+    Secuencia de los parámetros y n dados. Se busca primero en el caché LRU
+    (clave: método, parámetros y n); si no está, se genera por bloques a una
+    corrida en disco, o se reutiliza la corrida si ya existía, y se abre mapeada.
+    Las corridas congruenciales de UMBRAL_PARALELO filas o más se generan entre
+    varios procesos (generar_por_bloques elige con procesos_sugeridos).
+    """
+    clave = (parametros["metodo"], tuple(sorted(parametros.items())), n)
+    return cache_secuencias.obtener(
+        clave, lambda: abrir_corrida(guardar_corrida(bloques_generador(parametros, n), n, parametros)))
+
+def tabla_secuencia(secuencia, clases):
+    """
+    HTML de la tabla de resultados. El DataFrame se arma solo con las filas
+    que se muestran: todas si son pocas, o una muestra (primeros 500, 500 del
+    medio y últimos 500) para conjuntos grandes.
+    """
+    n_total = len(secuencia)
+    tabla_mensaje = ""
+    if n_total > 10000:
+        df = secuencia.a_dataframe(secuencia.filas_muestra())
+        tabla_mensaje = f'''
+            <div class="alert alert-info mb-3">
+                <h5><i class="fas fa-info-circle"></i> Conjunto grande detectado</h5>
+                <p><strong>Total generado:</strong> {n_total:,} números</p>
+                <p><strong>Mostrando:</strong> {len(df):,} valores de muestra (primeros 500 + algunos del medio + últimos 500)</p>
+                <p><small>Los {n_total:,} números completos están disponibles para exportar y se usaron para las pruebas estadísticas.</small></p>
+            </div>
+            '''
+    else:
+        # Para conjuntos pequeños, mostrar todo
+        df = secuencia.a_dataframe()
+
+    # Formatear la columna Ri para eliminar ceros innecesarios
+    df['Ri'] = df['Ri'].apply(lambda x: f"{x:g}")
+
+    return tabla_mensaje + df.to_html(classes=clases, index=False)
+
 # Cuadrados medios
 @app.route("/cuadrados", methods=["GET", "POST"])
 def cuadrados():
-    global semilla_seleccionada_cuadrados
     data = None
     semilla = ""
     n = ""
@@ -87,77 +424,40 @@ def cuadrados():
     resultados_pruebas = None
 
     # Si hay una semilla pre-cargada y es GET, usar esa semilla
-    if request.method == "GET" and semilla_seleccionada_cuadrados:
-        semilla = str(semilla_seleccionada_cuadrados)
-        # Limpiar la semilla después de usarla
-        semilla_seleccionada_cuadrados = None
+    if request.method == "GET":
+        # La semilla se limpia de la sesión al tomarla
+        semilla_cargada = tomar_semilla("cuadrados")
+        if semilla_cargada:
+            semilla = str(semilla_cargada)
 
     if request.method == "POST":
         semilla = request.form["semilla"]
         n = request.form["iteraciones"]
         n_int = int(float(n))
-        df = generar_mc(int(semilla), n_int)
+        n_int, aviso_periodo = limitar_por_periodo(n_int, periodo_cuadrados(int(semilla)))
+        # Se toma del caché o se genera por bloques a una corrida en disco (leída mapeada)
+        parametros = {"metodo": "cuadrados", "semilla": int(semilla)}
+        secuencia = obtener_secuencia(parametros, n_int)
         
-        # Verificar si el DataFrame tiene datos y la columna Ri existe
-        if df.empty or 'Ri' not in df.columns:
+        # Verificar si la secuencia tiene datos
+        if len(secuencia) == 0:
             return render_template("cuadrados.html", 
                                  error=f"Error: No se pudieron generar números con la semilla {semilla}. La secuencia se degeneró. Intenta con una semilla diferente.",
                                  xo=semilla, 
                                  n=n)
         
-        # Mapear los valores Ri a variable global
-        global ri_cuadrados, ultimo_metodo_generacion
-        ri_cuadrados = df['Ri'].tolist()
-        ultimo_metodo_generacion = "cuadrados"
+        # Anotar la corrida en la sesión del usuario (los Ri quedan mapeados desde su corrida)
+        registrar_corrida("cuadrados", parametros, n_int)
+        ri_cuadrados = secuencia.ri
         
-        # Formatear la columna Ri para eliminar ceros innecesarios
-        df['Ri'] = df['Ri'].apply(lambda x: f"{x:g}")
-        
-        tabla_mensaje = ""
-        if n_int > 10000:
-            # Mostrar solo los primeros 500, algunos del medio y los últimos 500
-            df_muestra = df.head(500).copy()
-            
-            # Agregar algunos del medio
-            if n_int > 2000:
-                medio_inicio = n_int // 2 - 250
-                medio_fin = n_int // 2 + 250
-                df_medio = df.iloc[medio_inicio:medio_fin].copy()
-                df_muestra = pd.concat([df_muestra, df_medio])
-            
-            # Agregar los últimos
-            df_final = df.tail(500).copy()
-            df_muestra = pd.concat([df_muestra, df_final])
-            
-            # Remover duplicados y ordenar
-            df_muestra = df_muestra.drop_duplicates().sort_values('i')
-            
-            data = df_muestra.to_html(classes="table table-bordered table-striped", index=False)
-            tabla_mensaje = f'''
-            <div class="alert alert-info mb-3">
-                <h5><i class="fas fa-info-circle"></i> Conjunto grande detectado</h5>
-                <p><strong>Total generado:</strong> {n_int:,} números</p>
-                <p><strong>Mostrando:</strong> {len(df_muestra):,} valores de muestra (primeros 500 + algunos del medio + últimos 500)</p>
-                <p><small>Los {n_int:,} números completos están disponibles para exportar y se usaron para las pruebas estadísticas.</small></p>
-            </div>
-            '''
-        else:
-            # Para conjuntos pequeños, mostrar todo
-            data = df.to_html(classes="table table-bordered table-striped", index=False)
-        
-        # Agregar el mensaje antes de la tabla
-        if tabla_mensaje:
-            data = tabla_mensaje + data
+        data = tabla_secuencia(secuencia, "table table-bordered table-striped")
+        if aviso_periodo:
+            data = aviso_periodo + data
         
         # Si hay datos, ejecutar pruebas automáticamente para mantener consistencia
-        if ri_cuadrados:
-            global ultimos_resultados_pruebas_raw, ultimos_resultados_pruebas_procesados
+        if len(ri_cuadrados) > 0:
             resultados_pruebas_raw = ejecutar_pruebas_internas(ri_cuadrados)
             resultados_pruebas = procesar_resultados_para_template(resultados_pruebas_raw)
-            
-            # Guardar en cache para uso posterior en distribuciones
-            ultimos_resultados_pruebas_raw = resultados_pruebas_raw
-            ultimos_resultados_pruebas_procesados = resultados_pruebas
 
     return render_template("cuadrados.html", 
                            table=data, 
@@ -169,7 +469,6 @@ def cuadrados():
 
 @app.route("/lineal", methods=["GET", "POST"])
 def lineal():
-    global semilla_seleccionada_lineal
     data = None
     xo = ""
     k = ""
@@ -178,10 +477,11 @@ def lineal():
     n = ""
     resultados_pruebas = None
     
-    if request.method == "GET" and semilla_seleccionada_lineal:
-        xo = str(semilla_seleccionada_lineal)
-        # Limpiar la semilla después de usarla
-        semilla_seleccionada_lineal = None
+    if request.method == "GET":
+        # La semilla se limpia de la sesión al tomarla
+        semilla_cargada = tomar_semilla("lineal")
+        if semilla_cargada:
+            xo = str(semilla_cargada)
 
     if request.method == "POST":
         xo = request.form["xo"]
@@ -191,64 +491,24 @@ def lineal():
         n = request.form["iteraciones"]
 
         n_int = int(float(n))
+        n_int, aviso_periodo = limitar_por_periodo(n_int, periodo_lineal(int(xo), int(k), int(c), int(g)))
         
-        # Aquí llamamos al generador de congruencia lineal
-        df = generar_cl(int(xo), int(k), int(c), int(g), n_int)
+        # Aquí llamamos al generador de congruencia lineal (a través del caché de secuencias)
+        parametros = {"metodo": "lineal", "xo": int(xo), "k": int(k), "c": int(c), "g": int(g)}
+        secuencia = obtener_secuencia(parametros, n_int)
         
-        # Mapear los valores Ri a variable global
-        global ri_lineal, ultimo_metodo_generacion
-        ri_lineal = df['Ri'].tolist()
-        ultimo_metodo_generacion = "lineal"
-        
-        # Formatear la columna Ri para eliminar ceros innecesarios
-        df['Ri'] = df['Ri'].apply(lambda x: f"{x:g}")
-
-        # OPTIMIZACIÓN: Para conjuntos grandes, mostrar solo una muestra
-        tabla_mensaje = ""
-        if n_int > 10000:
-            # Mostrar solo los primeros 500, algunos del medio y los últimos 500
-            df_muestra = df.head(500).copy()
-            
-            # Agregar algunos del medio
-            if n_int > 2000:
-                medio_inicio = n_int // 2 - 250
-                medio_fin = n_int // 2 + 250
-                df_medio = df.iloc[medio_inicio:medio_fin].copy()
-                df_muestra = pd.concat([df_muestra, df_medio])
-            
-            # Agregar los últimos
-            df_final = df.tail(500).copy()
-            df_muestra = pd.concat([df_muestra, df_final])
-            
-            # Remover duplicados y ordenar
-            df_muestra = df_muestra.drop_duplicates().sort_values('i')
-            
-            data = df_muestra.to_html(classes="table table-bordered table-striped text-center", index=False)
-            tabla_mensaje = f'''
-            <div class="alert alert-info mb-3">
-                <h5><i class="fas fa-info-circle"></i> Conjunto grande detectado</h5>
-                <p><strong>Total generado:</strong> {n_int:,} números</p>
-                <p><strong>Mostrando:</strong> {len(df_muestra):,} valores de muestra (primeros 500 + algunos del medio + últimos 500)</p>
-                <p><small>Los {n_int:,} números completos están disponibles para exportar y se usaron para las pruebas estadísticas.</small></p>
-            </div>
-            '''
-        else:
-            # Para conjuntos pequeños, mostrar todo
-            data = df.to_html(classes="table table-bordered table-striped text-center", index=False)
+        # Anotar la corrida en la sesión del usuario (los Ri quedan mapeados desde su corrida)
+        registrar_corrida("lineal", parametros, n_int)
+        ri_lineal = secuencia.ri
         
-        # Agregar el mensaje antes de la tabla
-        if tabla_mensaje:
-            data = tabla_mensaje + data
+        data = tabla_secuencia(secuencia, "table table-bordered table-striped text-center")
+        if aviso_periodo:
+            data = aviso_periodo + data
         
         # Si hay datos, ejecutar pruebas automáticamente para mantener consistencia
-        if ri_lineal:
-            global ultimos_resultados_pruebas_raw, ultimos_resultados_pruebas_procesados
+        if len(ri_lineal) > 0:
             resultados_pruebas_raw = ejecutar_pruebas_internas(ri_lineal)
             resultados_pruebas = procesar_resultados_para_template(resultados_pruebas_raw)
-            
-            # Guardar en cache para uso posterior en distribuciones
-            ultimos_resultados_pruebas_raw = resultados_pruebas_raw
-            ultimos_resultados_pruebas_procesados = resultados_pruebas
 
     return render_template("lineal.html", 
                            table=data, 
@@ -261,7 +521,6 @@ def lineal():
 
 @app.route("/multiplicativo", methods=["GET", "POST"])
 def multiplicativo():
-    global semilla_seleccionada_multiplicativo
     data = None
     xo = ""
     k = ""
@@ -271,10 +530,11 @@ def multiplicativo():
     resultados_pruebas = None
 
     # Si hay una semilla pre-cargada y es GET, usar esa semilla
-    if request.method == "GET" and semilla_seleccionada_multiplicativo:
-        xo = str(semilla_seleccionada_multiplicativo)
-        # Limpiar la semilla después de usarla
-        semilla_seleccionada_multiplicativo = None
+    if request.method == "GET":
+        # La semilla se limpia de la sesión al tomarla
+        semilla_cargada = tomar_semilla("multiplicativo")
+        if semilla_cargada:
+            xo = str(semilla_cargada)
 
     if request.method == "POST":
         xo = request.form["xo"]
@@ -283,63 +543,23 @@ def multiplicativo():
         n = request.form["iteraciones"]
 
         n_int = int(float(n))
+        n_int, aviso_periodo = limitar_por_periodo(n_int, periodo_multiplicativo(int(xo), int(t), int(g)))
         
-        # Llamamos al generador de congruencia multiplicativa
-        df = generar_cm(int(xo), int(t), int(g), n_int)
-        # Mapear los valores Ri a variable global
-        global ri_multiplicativo, ultimo_metodo_generacion
-        ri_multiplicativo = df['Ri'].tolist()
-        ultimo_metodo_generacion = "multiplicativo"
-        
-        # Formatear la columna Ri para eliminar ceros innecesarios
-        df['Ri'] = df['Ri'].apply(lambda x: f"{x:g}")
-        
-        # ⚡ OPTIMIZACIÓN: Para conjuntos grandes, mostrar solo una muestra
-        tabla_mensaje = ""
-        if n_int > 10000:
-            # Mostrar solo los primeros 500, algunos del medio y los últimos 500
-            df_muestra = df.head(500).copy()
-            
-            # Agregar algunos del medio
-            if n_int > 2000:
-                medio_inicio = n_int // 2 - 250
-                medio_fin = n_int // 2 + 250
-                df_medio = df.iloc[medio_inicio:medio_fin].copy()
-                df_muestra = pd.concat([df_muestra, df_medio])
-            
-            # Agregar los últimos
-            df_final = df.tail(500).copy()
-            df_muestra = pd.concat([df_muestra, df_final])
-            
-            # Remover duplicados y ordenar
-            df_muestra = df_muestra.drop_duplicates().sort_values('i')
-            
-            data = df_muestra.to_html(classes="table table-bordered table-striped text-center", index=False)
-            tabla_mensaje = f'''
-            <div class="alert alert-info mb-3">
-                <h5><i class="fas fa-info-circle"></i> Conjunto grande detectado</h5>
-                <p><strong>Total generado:</strong> {n_int:,} números</p>
-                <p><strong>Mostrando:</strong> {len(df_muestra):,} valores de muestra (primeros 500 + algunos del medio + últimos 500)</p>
-                <p><small>Los {n_int:,} números completos están disponibles para exportar y se usaron para las pruebas estadísticas.</small></p>
-            </div>
-            '''
-        else:
-            # Para conjuntos pequeños, mostrar todo
-            data = df.to_html(classes="table table-bordered table-striped text-center", index=False)
+        # Llamamos al generador de congruencia multiplicativa (a través del caché de secuencias)
+        parametros = {"metodo": "multiplicativo", "xo": int(xo), "t": int(t), "g": int(g)}
+        secuencia = obtener_secuencia(parametros, n_int)
+        # Anotar la corrida en la sesión del usuario (los Ri quedan mapeados desde su corrida)
+        registrar_corrida("multiplicativo", parametros, n_int)
+        ri_multiplicativo = secuencia.ri
         
-        # Agregar el mensaje antes de la tabla
-        if tabla_mensaje:
-            data = tabla_mensaje + data
+        data = tabla_secuencia(secuencia, "table table-bordered table-striped text-center")
+        if aviso_periodo:
+            data = aviso_periodo + data
         
         # Si hay datos, ejecutar pruebas automáticamente para mantener consistencia
-        if ri_multiplicativo:
-            global ultimos_resultados_pruebas_raw, ultimos_resultados_pruebas_procesados
+        if len(ri_multiplicativo) > 0:
             resultados_pruebas_raw = ejecutar_pruebas_internas(ri_multiplicativo)
             resultados_pruebas = procesar_resultados_para_template(resultados_pruebas_raw)
-            
-            # Guardar en cache para uso posterior en distribuciones
-            ultimos_resultados_pruebas_raw = resultados_pruebas_raw
-            ultimos_resultados_pruebas_procesados = resultados_pruebas
 
     return render_template("multiplicativo.html",
                            table=data,
@@ -351,141 +571,225 @@ def multiplicativo():
                            resultados_pruebas=resultados_pruebas)
 
 
+def respuesta_csv(bloques, nombre_archivo):
+    """
+    Envía como CSV una serie de Secuencias a medida que se generan: cada
+    bloque se convierte y se escribe por separado (el encabezado solo en el
+    primero), así que la memoria no depende de la cantidad de filas.
+    """
+    def filas():
+        encabezado = True
+        for bloque in bloques:
+            yield bloque.a_dataframe().to_csv(index=False, header=encabezado)
+            encabezado = False
+
+    return Response(filas(),
+                    mimetype="text/csv",
+                    headers={"Content-Disposition": f"attachment; filename={nombre_archivo}"})
+
+def exportar_secuencia_csv(generador, nombre_archivo):
+    """CSV completo de la secuencia del formulario, leído por bloques desde el caché."""
+    parametros, n = parametros_formulario(generador, request.form)
+    secuencia = obtener_secuencia(parametros, n)
+    return respuesta_csv(secuencia.bloques(FILAS_POR_BLOQUE_CSV), nombre_archivo)
+
 # Exportar CSV
 @app.route("/export_cuadrados_csv", methods=["POST"])
 def exportar_csv():
-    semilla = int(request.form["semilla"])
-    n = int(request.form["iteraciones"])
-
-    df = generar_mc(semilla, n)
-
-    buffer = io.StringIO()
-    df.to_csv(buffer, index=False)
-    buffer.seek(0)
-
-    return send_file(io.BytesIO(buffer.getvalue().encode()),
-                     mimetype="text/csv",
-                     as_attachment=True,
-                     download_name="cuadrados_medios.csv")
+    return exportar_secuencia_csv("cuadrados", "cuadrados_medios.csv")
 
 @app.route("/export_lineal_csv", methods=["POST"])
 def exportar_csv_congruencial_lineal():
-    xo = request.form["xo"]
-    k = request.form["k"]
-    c = request.form["c"]
-    g = request.form["g"]
-    n = request.form["iteraciones"]
-
-        # Aquí llamamos al generador de congruencia lineal
-    df = generar_cl(int(xo), int(k), int(c), int(g), int(float(n)))
-
-    buffer = io.StringIO()
-    df.to_csv(buffer, index=False)
-    buffer.seek(0)
-
-    return send_file(io.BytesIO(buffer.getvalue().encode()),
-                     mimetype="text/csv",
-                     as_attachment=True,
-                     download_name="congruencial_lineal.csv")
+    return exportar_secuencia_csv("lineal", "congruencial_lineal.csv")
 
 @app.route("/export_multiplicativa_csv", methods=["POST"])
 def exportar_csv_congruencial_multiplicativa():
-    xo = request.form["xo"]
-    t = request.form["t"]
-    g = request.form["g"]
-    n = request.form["iteraciones"]
-
-    df = generar_cm(int(xo), int(t), int(g), int(float(n)))
-    buffer = io.StringIO()
-    df.to_csv(buffer, index=False)
-    buffer.seek(0)
-
-    return send_file(io.BytesIO(buffer.getvalue().encode()),
-                     mimetype="text/csv",
-                     as_attachment=True,
-                     download_name="congruencial_multiplicativa.csv")
+    return exportar_secuencia_csv("multiplicativo", "congruencial_multiplicativa.csv")
 
 # Métodos para exportar únicamente los Ri generados
 @app.route("/export_ri_cuadrados", methods=["POST"])
 def exportar_ri_cuadrados():
     """Exportar solo los valores Ri de cuadrados medios previamente generados"""
-    global ri_cuadrados
+    ri_cuadrados = ri_de("cuadrados")
     
-    if not ri_cuadrados:
+    if len(ri_cuadrados) == 0:
         # Si no hay datos, mostrar mensaje de error
         return render_template("cuadrados.html", 
                              error="No hay datos de cuadrados medios disponibles para exportar.")
     
-    # Crear DataFrame solo con los Ri
-    df_ri = pd.DataFrame({'Ri': ri_cuadrados})
-    
-    buffer = io.StringIO()
-    df_ri.to_csv(buffer, index=False)
-    buffer.seek(0)
-
-    return send_file(io.BytesIO(buffer.getvalue().encode()),
-                     mimetype="text/csv",
-                     as_attachment=True,
-                     download_name="ri_cuadrados_medios.csv")
+    return respuesta_csv(Secuencia({"Ri": ri_cuadrados}).bloques(FILAS_POR_BLOQUE_CSV), "ri_cuadrados_medios.csv")
 
 @app.route("/export_ri_lineal", methods=["POST"])
 def exportar_ri_lineal():
     """Exportar solo los valores Ri de congruencia lineal previamente generados"""
-    global ri_lineal
+    ri_lineal = ri_de("lineal")
     
-    if not ri_lineal:
+    if len(ri_lineal) == 0:
         # Si no hay datos, mostrar mensaje de error
         return render_template("lineal.html", 
                              error="No hay datos de congruencia lineal disponibles para exportar.")
     
-    # Crear DataFrame solo con los Ri
-    df_ri = pd.DataFrame({'Ri': ri_lineal})
-    
-    buffer = io.StringIO()
-    df_ri.to_csv(buffer, index=False)
-    buffer.seek(0)
-
-    return send_file(io.BytesIO(buffer.getvalue().encode()),
-                     mimetype="text/csv",
-                     as_attachment=True,
-                     download_name="ri_congruencia_lineal.csv")
+    return respuesta_csv(Secuencia({"Ri": ri_lineal}).bloques(FILAS_POR_BLOQUE_CSV), "ri_congruencia_lineal.csv")
 
 @app.route("/export_ri_multiplicativo", methods=["POST"])
 def exportar_ri_multiplicativo():
     """Exportar solo los valores Ri de congruencia multiplicativa previamente generados"""
-    global ri_multiplicativo
+    ri_multiplicativo = ri_de("multiplicativo")
     
-    if not ri_multiplicativo:
+    if len(ri_multiplicativo) == 0:
         # Si no hay datos, mostrar mensaje de error
         return render_template("multiplicativo.html", 
                              error="No hay datos de congruencia multiplicativa disponibles para exportar.")
     
-    # Crear DataFrame solo con los Ri
-    df_ri = pd.DataFrame({'Ri': ri_multiplicativo})
-    
-    buffer = io.StringIO()
-    df_ri.to_csv(buffer, index=False)
-    buffer.seek(0)
+    return respuesta_csv(Secuencia({"Ri": ri_multiplicativo}).bloques(FILAS_POR_BLOQUE_CSV), "ri_congruencia_multiplicativa.csv")
+
+# Nombre base de los archivos exportados de cada generador
+NOMBRES_EXPORTACION = {
+    "cuadrados": "cuadrados_medios",
+    "lineal": "congruencial_lineal",
+    "multiplicativo": "congruencial_multiplicativa"
+}
 
-    return send_file(io.BytesIO(buffer.getvalue().encode()),
-                     mimetype="text/csv",
-                     as_attachment=True,
-                     download_name="ri_congruencia_multiplicativa.csv")
+def bloques_para_exportar(generador, formulario, formato):
+    """
+    Lee los parámetros del formulario de un generador y prepara su exportación.
+
+    Returns:
+        Tupla (crear_bloques, n, parametros, nombre_archivo): crear_bloques
+        devuelve un iterador nuevo de Secuencias en cada llamada
+    """
+    parametros, n = parametros_formulario(generador, formulario)
+
+    if generador == "cuadrados":
+        if formato == "crudo" and not 0 <= parametros["semilla"] < 2 ** 32:
+            raise ValueError("el formato crudo guarda Xi en uint32 y la semilla no cabe")
+    elif formato == "crudo" and parametros["g"] > 32:
+        raise ValueError("el formato crudo guarda Xi en uint32, así que g debe ser como máximo 32")
+    elif formato == "parquet" and parametros["g"] > 64:
+        raise ValueError("Parquet guarda Xi en 64 bits, así que g debe ser como máximo 64")
+
+    secuencia = obtener_secuencia(parametros, n)
+    return secuencia.bloques, n, parametros, NOMBRES_EXPORTACION[generador]
+
+# Exportaciones binarias: .npy (Ri en float64), Parquet (Xi y Ri) y crudo (encabezado JSON + uint32/float32)
+@app.route("/export_binario/<generador>/<formato>", methods=["POST"])
+def exportar_binario(generador, formato):
+    if formato not in EXTENSIONES:
+        return {"error": "Formato no válido"}, 400
+
+    try:
+        crear_bloques, n, parametros, nombre = bloques_para_exportar(generador, request.form, formato)
+    except KeyError as e:
+        return {"error": f"Falta el parámetro '{e.args[0]}'"}, 400
+    except ValueError as e:
+        return {"error": f"Parámetros inválidos: {str(e)}"}, 400
+
+    encabezados = {"Content-Disposition": f"attachment; filename={nombre}.{EXTENSIONES[formato]}"}
+
+    if formato == "npy":
+        flujo = flujo_npy(crear_bloques(), n)
+        encabezados["Content-Length"] = str(len(encabezado_npy(n)) + 8 * n)
+    elif formato == "crudo":
+        flujo = flujo_crudo(crear_bloques, n, parametros)
+        encabezados["Content-Length"] = str(len(encabezado_crudo(n, parametros)) + 8 * n)
+    else:
+        try:
+            flujo = flujo_parquet(crear_bloques())
+        except ImportError:
+            return {"error": "La exportación a Parquet requiere instalar pyarrow"}, 501
+
+    return Response(flujo, mimetype="application/octet-stream", headers=encabezados)
 
 @app.route("/obtener_ri/<generador>")
 def obtener_ri_endpoint(generador):
-    if generador == "cuadrados":
-        return {"ri": ri_cuadrados}
-    elif generador == "lineal":
-        return {"ri": ri_lineal}
-    elif generador == "multiplicativo":
-        return {"ri": ri_multiplicativo}
+    # Con los parámetros en la URL (?xo=...&iteraciones=...) se consulta el caché de secuencias
+    if "iteraciones" in request.args:
+        try:
+            parametros, n = parametros_formulario(generador, request.args)
+        except KeyError as e:
+            return {"error": f"Falta el parámetro '{e.args[0]}'"}, 400
+        except ValueError as e:
+            return {"error": f"Parámetros inválidos: {str(e)}"}, 400
+        return {"ri": obtener_secuencia(parametros, n).ri.tolist()}
+
+    if generador in ("cuadrados", "lineal", "multiplicativo"):
+        return {"ri": ri_de(generador).tolist()}
     else:
         return {"error": "Generador no válido"}
 
+@app.route("/cache")
+def estadisticas_cache():
+    """Contadores del caché de secuencias (aciertos, fallos, desalojos y bytes ocupados)"""
+    return jsonify(cache_secuencias.estadisticas())
+
+@app.route("/cache/pruebas")
+def estadisticas_cache_pruebas():
+    """Contadores del caché de resultados de pruebas ("bytes" cuenta baterías guardadas)"""
+    return jsonify(cache_resultados.estadisticas())
+
+# Máximo de filas que devuelve una ventana de la secuencia
+MAX_VENTANA = 100000
+# Módulos m = 2^g admitidos por /ventana: hasta 64 bits la ventana usa el motor uint64
+MAX_G_VENTANA = 64
+
+@app.route("/ventana/<generador>")
+def ventana_endpoint(generador):
+    """
+    Devuelve una ventana de la secuencia sin generar los valores anteriores.
+    Ej: /ventana/lineal?xo=17&k=5&c=3&g=31&inicio=50000000&cantidad=1000
+    """
+    try:
+        inicio = int(request.args.get("inicio", 1))
+        cantidad = int(request.args.get("cantidad", 1000))
+        xo = int(request.args["xo"])
+        g = int(request.args["g"])
+
+        if inicio < 1 or cantidad < 0 or cantidad > MAX_VENTANA:
+            return {"error": f"La ventana debe iniciar en 1 o más y tener como máximo {MAX_VENTANA} valores"}, 400
+        if not 1 <= g <= MAX_G_VENTANA:
+            return {"error": f"g debe estar entre 1 y {MAX_G_VENTANA}"}, 400
+
+        if generador == "lineal":
+            parametros = {"xo": xo, "k": int(request.args["k"]), "c": int(request.args["c"])}
+        elif generador == "multiplicativo":
+            parametros = {"xo": xo, "t": int(request.args["t"])}
+        else:
+            return {"error": "Generador no válido"}, 400
+
+        negativos = [nombre for nombre, valor in parametros.items() if valor < 0]
+        if negativos:
+            return {"error": f"Los parámetros no pueden ser negativos: {', '.join(negativos)}"}, 400
+
+        if generador == "lineal":
+            secuencia = ventana_cl(xo, parametros["k"], parametros["c"], g, inicio, cantidad)
+        else:
+            secuencia = ventana_cm(xo, parametros["t"], g, inicio, cantidad)
+    except KeyError as e:
+        return {"error": f"Falta el parámetro '{e.args[0]}'"}, 400
+    except ValueError as e:
+        return {"error": f"Parámetros inválidos: {str(e)}"}, 400
+
+    return {
+        "generador": generador,
+        "inicio": inicio,
+        "cantidad": cantidad,
+        "i": secuencia["i"].tolist(),
+        "Xi": secuencia["Xi"].tolist(),
+        "Ri": secuencia["Ri"].tolist()
+    }
+
+def ejecutar_pruebas_con_cache(datos, pruebas, alpha):
+    """
+    Resultados de ejecutar_pruebas, tomados del caché si ya se calcularon para
+    los mismos datos y configuración. Los errores no se guardan.
+    """
+    return cache_resultados.obtener(clave_resultados(datos, pruebas, alpha),
+                                    lambda: ejecutar_pruebas(datos, pruebas, alpha))
+
 def ejecutar_pruebas_internas(ri_numeros, alpha=0.05):
     """
-    Ejecuta todas las pruebas estadísticas sobre los números Ri
+    Ejecuta todas las pruebas estadísticas sobre los números Ri (o devuelve
+    las ya calculadas para esos mismos números)
     """
     pruebas_seleccionadas = {
         "medias": True,
@@ -497,32 +801,29 @@ def ejecutar_pruebas_internas(ri_numeros, alpha=0.05):
     }
     
     try:
-        resultados = ejecutar_pruebas(ri_numeros, pruebas_seleccionadas, alpha)
-        return resultados
+        return ejecutar_pruebas_con_cache(ri_numeros, pruebas_seleccionadas, alpha)
     except Exception as e:
         return {"error": f"Error ejecutando pruebas: {str(e)}"}
 
 def procesar_resultados_para_template(resultados_pruebas):
     """
-    Procesa los resultados de pruebas (JSON strings) para que sean compatibles con los templates
+    Procesa los resultados de pruebas (objetos de resultado o sus diccionarios
+    guardados en la sesión) para que sean compatibles con los templates
     """
     resultados_procesados = {}
     
-    for nombre_prueba, resultado_json in resultados_pruebas.items():
+    for nombre_prueba, resultado_dict in resultados_a_dict(resultados_pruebas).items():
         if nombre_prueba in ['error', 'mensaje_error']:
-            resultados_procesados[nombre_prueba] = resultado_json
+            resultados_procesados[nombre_prueba] = resultado_dict
             continue
             
         try:
-            # Parsear el JSON string
-            resultado_dict = json.loads(resultado_json)
-            
             # Crear un diccionario compatible con el template
             resultado_procesado = {
-                'pasa': resultado_dict.get('isApproved') == 'True',
+                'pasa': resultado_dict.get('isApproved') is True,
                 'test_name': resultado_dict.get('test_name', nombre_prueba),
                 'decision': resultado_dict.get('decision', ''),
-                'isApproved': resultado_dict.get('isApproved', 'False')
+                'isApproved': resultado_dict.get('isApproved', False)
             }
             
             # Agregar campos específicos según el tipo de prueba
@@ -534,6 +835,8 @@ def procesar_resultados_para_template(resultados_pruebas):
                 resultado_procesado['estadistico'] = float(resultado_dict['statistics']['chi2_total'])
             elif 'Chi2_calculado' in resultado_dict.get('statistics', {}):
                 resultado_procesado['estadistico'] = float(resultado_dict['statistics']['Chi2_calculado'])
+            elif 'D' in resultado_dict.get('statistics', {}):
+                resultado_procesado['estadistico'] = float(resultado_dict['statistics']['D'])
                 
             if 'valor_critico' in resultado_dict:
                 resultado_procesado['valor_critico'] = float(resultado_dict['valor_critico'])
@@ -542,34 +845,34 @@ def procesar_resultados_para_template(resultados_pruebas):
             elif 'chi2_critico' in resultado_dict.get('statistics', {}):
                 resultado_procesado['valor_critico'] = float(resultado_dict['statistics']['chi2_critico'])
                 
-            if 'p_value' in resultado_dict:
+            if resultado_dict.get('p_value') is not None:
                 resultado_procesado['p_value'] = float(resultado_dict['p_value'])
                 
             resultados_procesados[nombre_prueba] = resultado_procesado
             
-        except (json.JSONDecodeError, ValueError, KeyError) as e:
+        except (AttributeError, TypeError, ValueError, KeyError) as e:
             # Si hay error al procesar, crear un resultado por defecto
             resultados_procesados[nombre_prueba] = {
                 'pasa': False,
                 'test_name': nombre_prueba,
                 'decision': 'Error al procesar resultado',
-                'isApproved': 'False'
+                'isApproved': False
             }
     
     return resultados_procesados
 
 def obtener_ri():
-    """Función para obtener los Ri del último método de generación usado"""
-    global ultimo_metodo_generacion, ri_cuadrados, ri_lineal, ri_multiplicativo
-    
-    if ultimo_metodo_generacion == "cuadrados":
-        return ri_cuadrados
-    elif ultimo_metodo_generacion == "lineal":
-        return ri_lineal
-    elif ultimo_metodo_generacion == "multiplicativo":
-        return ri_multiplicativo
+    """Función para obtener los Ri del último método de generación usado en la sesión"""
+    estado = estado_sesion()
+    if estado["ultimo_metodo"] in ("cuadrados", "lineal", "multiplicativo"):
+        return ri_de(estado["ultimo_metodo"], estado)
     else:
-        return []
+        return np.empty(0)
+
+def metodo_normal_formulario():
+    """Método de transformación a normal elegido en el formulario (ndtri si no es uno de METODOS_NORMAL)."""
+    metodo = request.form.get("metodo", "ndtri")
+    return metodo if metodo in METODOS_NORMAL else "ndtri"
 
 @app.route("/distribucion_normal", methods=["GET", "POST"])
 def distribucion_normal():
@@ -577,61 +880,49 @@ def distribucion_normal():
     table = None
     media = 0.0
     desviacion = 1.0
-    metodo_usado = ultimo_metodo_generacion
+    metodo_normal = "ndtri"
+    estado = estado_sesion()
+    metodo_usado = estado["ultimo_metodo"]
     resultados_pruebas = None
     
     # Verificar si hay datos disponibles
     ri_disponibles = obtener_ri()
-    if not ri_disponibles:
+    if len(ri_disponibles) == 0:
         mensaje_error = "No hay datos de números aleatorios disponibles. Genera números primero usando algún método."
         return render_template("distribucion_normal.html", 
                              grafico=grafico, 
                              table=table, 
                              media=media, 
                              desviacion=desviacion,
+                             metodo_normal=metodo_normal,
+                             metodos_normal=METODOS_NORMAL,
                              metodo_usado=metodo_usado,
                              error=mensaje_error)
 
     if request.method == "POST" and request.form.get("accion") == "calcular":
         media = float(request.form.get("media", 0.0))
         desviacion = float(request.form.get("desviacion", 1.0))
+        metodo_normal = metodo_normal_formulario()
         
-        # 🚀 OPTIMIZACIÓN: Reutilizar resultados de pruebas si están disponibles
-        global ultimos_resultados_pruebas_raw, ultimos_resultados_pruebas_procesados
-        
-        if ultimos_resultados_pruebas_raw is not None and ultimos_resultados_pruebas_procesados is not None:
-            # Usar resultados cacheados (sin volver a ejecutar pruebas)
-            resultados_pruebas_raw = ultimos_resultados_pruebas_raw
-            resultados_pruebas = ultimos_resultados_pruebas_procesados
-            print("✅ Reutilizando resultados de pruebas cacheados en distribución normal")
-        else:
-            # Fallback: ejecutar pruebas si no hay cache disponible
-            resultados_pruebas_raw = ejecutar_pruebas_internas(ri_disponibles)
-            resultados_pruebas = procesar_resultados_para_template(resultados_pruebas_raw)
-            print("⚠️ Ejecutando pruebas desde cero en distribución normal (no hay cache)")
+        # 🚀 OPTIMIZACIÓN: las pruebas de estos mismos Ri salen del caché de resultados
+        # (solo se calculan si los datos o la configuración cambiaron)
+        resultados_pruebas_raw = resultados_a_dict(ejecutar_pruebas_internas(ri_disponibles))
+        resultados_pruebas = procesar_resultados_para_template(resultados_pruebas_raw)
         
         # Verificar si alguna prueba pasó
         if "error" not in resultados_pruebas_raw:
             # Validar que al menos una prueba haya pasado
             pruebas_pasaron = False
-            for nombre_prueba, resultado_json in resultados_pruebas_raw.items():
-                try:
-                    # Parsear el JSON string para obtener el diccionario
-                    resultado_dict = json.loads(resultado_json)
-                    print("calculado prueba")
-
-                    # Verificar si la prueba fue aprobada
-                    if resultado_dict.get("isApproved") == "True":
-                        print("pruebas pasaron")
-                        pruebas_pasaron = True
-                        break
-                except (json.JSONDecodeError, AttributeError):
-                    # Si hay error al parsear, continuar con la siguiente prueba
-                    continue
+            for nombre_prueba, resultado_dict in resultados_pruebas_raw.items():
+                # Verificar si la prueba fue aprobada
+                if isinstance(resultado_dict, dict) and resultado_dict.get("isApproved") is True:
+                    print("pruebas pasaron")
+                    pruebas_pasaron = True
+                    break
             
             if pruebas_pasaron:
                 # Al menos una prueba pasó, proceder con el cálculo
-                df_normal = distribucion_normal_inversa(ri_disponibles, desviacion, media)
+                df_normal = distribucion_normal_inversa(ri_disponibles, desviacion, media, metodo_normal)
                 print("distribucion calculada")
                 
                 # ⚡ OPTIMIZACIÓN: Para conjuntos grandes, mostrar solo una muestra
@@ -672,8 +963,15 @@ def distribucion_normal():
                 if tabla_mensaje:
                     table = tabla_mensaje + table
                 
+                # Uniformes usados por valor normal (1 en las inversas, ~2.06 en el ziggurat)
+                consumidos = df_normal.attrs.get("uniformes_consumidos", n_total)
+                table = f'''
+                <p class="text-muted mb-2"><small>Uniformes consumidos: {consumidos:,} para {n_total:,} valores
+                ({consumidos / max(n_total, 1):.3f} por valor)</small></p>
+                ''' + table
+                
                 # Generar gráfico
-                grafico = graficar_distribucion_normal(ri_disponibles, desviacion, media)
+                grafico = graficar_distribucion_normal(ri_disponibles, desviacion, media, metodo_normal)
             else:
                 # Ninguna prueba pasó, mostrar mensaje de error
                 resultados_pruebas["mensaje_error"] = "No se puede proceder con la distribución normal porque ninguna prueba estadística fue aprobada. Los números generados no cumplen con los criterios de aleatoriedad."
@@ -683,6 +981,8 @@ def distribucion_normal():
                          table=table, 
                          media=media, 
                          desviacion=desviacion,
+                         metodo_normal=metodo_normal,
+                         metodos_normal=METODOS_NORMAL,
                          metodo_usado=metodo_usado,
                          resultados_pruebas=resultados_pruebas)
 
@@ -694,12 +994,13 @@ def distribucion_uniforme_endpoint():
     table = None
     min_val = 0.0
     max_val = 1.0
-    metodo_usado = ultimo_metodo_generacion
+    estado = estado_sesion()
+    metodo_usado = estado["ultimo_metodo"]
     resultados_pruebas = None
     
     # Verificar si hay datos disponibles
     ri_disponibles = obtener_ri()
-    if not ri_disponibles:
+    if len(ri_disponibles) == 0:
         mensaje_error = "No hay datos de números aleatorios disponibles. Genera números primero usando algún método."
         return render_template("distribucion_uniforme.html", 
                              grafico=grafico, 
@@ -713,35 +1014,20 @@ def distribucion_uniforme_endpoint():
         min_val = float(request.form.get("min_val", 0.0))
         max_val = float(request.form.get("max_val", 1.0))
         
-        # 🚀 OPTIMIZACIÓN: Reutilizar resultados de pruebas si están disponibles
-        global ultimos_resultados_pruebas_raw, ultimos_resultados_pruebas_procesados
-        
-        if ultimos_resultados_pruebas_raw is not None and ultimos_resultados_pruebas_procesados is not None:
-            # Usar resultados cacheados (sin volver a ejecutar pruebas)
-            resultados_pruebas_raw = ultimos_resultados_pruebas_raw
-            resultados_pruebas = ultimos_resultados_pruebas_procesados
-            print("✅ Reutilizando resultados de pruebas cacheados en distribución uniforme")
-        else:
-            # Fallback: ejecutar pruebas si no hay cache disponible
-            resultados_pruebas_raw = ejecutar_pruebas_internas(ri_disponibles)
-            resultados_pruebas = procesar_resultados_para_template(resultados_pruebas_raw)
-            print("⚠️ Ejecutando pruebas desde cero en distribución uniforme (no hay cache)")
+        # 🚀 OPTIMIZACIÓN: las pruebas de estos mismos Ri salen del caché de resultados
+        # (solo se calculan si los datos o la configuración cambiaron)
+        resultados_pruebas_raw = resultados_a_dict(ejecutar_pruebas_internas(ri_disponibles))
+        resultados_pruebas = procesar_resultados_para_template(resultados_pruebas_raw)
         
         # Verificar si alguna prueba pasó
         if "error" not in resultados_pruebas_raw:
             # Validar que al menos una prueba haya pasado
             pruebas_pasaron = False
-            for nombre_prueba, resultado_json in resultados_pruebas_raw.items():
-                try:
-                    # Parsear el JSON string para obtener el diccionario
-                    resultado_dict = json.loads(resultado_json)
-                    # Verificar si la prueba fue aprobada
-                    if resultado_dict.get("isApproved") == "True":
-                        pruebas_pasaron = True
-                        break
-                except (json.JSONDecodeError, AttributeError):
-                    # Si hay error al parsear, continuar con la siguiente prueba
-                    continue
+            for nombre_prueba, resultado_dict in resultados_pruebas_raw.items():
+                # Verificar si la prueba fue aprobada
+                if isinstance(resultado_dict, dict) and resultado_dict.get("isApproved") is True:
+                    pruebas_pasaron = True
+                    break
             
             if pruebas_pasaron:
                 # Al menos una prueba pasó, proceder con el cálculo
@@ -810,10 +1096,10 @@ def cargar_semillas_cuadrados():
 def usar_semilla_cuadrados():
     """Usar semilla seleccionada para cuadrados medios"""
     from flask import redirect
-    global semilla_seleccionada_cuadrados
     semilla = request.form.get('semilla')
     if semilla:
-        semilla_seleccionada_cuadrados = int(semilla)
+        with modificar_sesion() as estado:
+            estado["semillas"]["cuadrados"] = int(semilla)
     return redirect('/cuadrados')
 
 @app.route("/cargar_semillas_lineal", methods=["GET", "POST"])
@@ -825,10 +1111,10 @@ def cargar_semillas_lineal():
 def usar_semilla_lineal():
     """Usar X0 seleccionado para congruencia lineal"""
     from flask import redirect
-    global semilla_seleccionada_lineal
     semilla = request.form.get('semilla')
     if semilla:
-        semilla_seleccionada_lineal = int(semilla)
+        with modificar_sesion() as estado:
+            estado["semillas"]["lineal"] = int(semilla)
     return redirect('/lineal')
 
 @app.route("/cargar_semillas_multiplicativo", methods=["GET", "POST"])
@@ -840,10 +1126,10 @@ def cargar_semillas_multiplicativo():
 def usar_semilla_multiplicativo():
     """Usar X0 seleccionado para congruencia multiplicativa"""
     from flask import redirect
-    global semilla_seleccionada_multiplicativo
     semilla = request.form.get('semilla')
     if semilla:
-        semilla_seleccionada_multiplicativo = int(semilla)
+        with modificar_sesion() as estado:
+            estado["semillas"]["multiplicativo"] = int(semilla)
     return redirect('/multiplicativo')
 
 def cargar_semillas_proceso(metodo, titulo):
@@ -887,10 +1173,15 @@ def cargar_semillas_proceso(metodo, titulo):
         
         # Validar que todas las semillas sean números válidos
         semillas_validas = []
+        semillas_degeneradas = 0
         for semilla in semillas:
             try:
                 semilla_int = int(float(semilla))
                 if semilla_int > 0:
+                    # En cuadrados medios se descartan las semillas cuya secuencia se degenera (consulta al atlas)
+                    if metodo == "cuadrados" and semilla_degenerada(semilla_int):
+                        semillas_degeneradas += 1
+                        continue
                     semillas_validas.append(semilla_int)
             except (ValueError, TypeError):
                 continue
@@ -901,11 +1192,15 @@ def cargar_semillas_proceso(metodo, titulo):
                                  titulo=titulo,
                                  error="No se encontraron semillas válidas en el archivo.")
         
+        mensaje = f"Se cargaron {len(semillas_validas)} semillas exitosamente."
+        if semillas_degeneradas:
+            mensaje += f" Se descartaron {semillas_degeneradas} semillas porque su secuencia se degenera."
+        
         return render_template("cargar_semillas.html", 
                              metodo=metodo,
                              titulo=titulo,
                              semillas=semillas_validas,
-                             success=f"Se cargaron {len(semillas_validas)} semillas exitosamente.")
+                             success=mensaje)
     
     except Exception as e:
         return render_template("cargar_semillas.html", 
@@ -917,9 +1212,9 @@ def cargar_semillas_proceso(metodo, titulo):
 @app.route("/pruebas_cuadrados", methods=["POST"])
 def pruebas_cuadrados():
     """Ejecutar pruebas estadísticas sobre los números Ri de cuadrados medios"""
-    global ri_cuadrados
+    ri_cuadrados = ri_de("cuadrados")
     
-    if not ri_cuadrados:
+    if len(ri_cuadrados) == 0:
         return render_template("cuadrados.html", 
                              error="No hay datos de cuadrados medios disponibles para realizar pruebas.")
     
@@ -940,9 +1235,9 @@ def pruebas_cuadrados():
 @app.route("/pruebas_lineal", methods=["POST"])
 def pruebas_lineal():
     """Ejecutar pruebas estadísticas sobre los números Ri de congruencia lineal"""
-    global ri_lineal
+    ri_lineal = ri_de("lineal")
     
-    if not ri_lineal:
+    if len(ri_lineal) == 0:
         return render_template("lineal.html", 
                              error="No hay datos de congruencia lineal disponibles para realizar pruebas.")
     
@@ -965,9 +1260,9 @@ def pruebas_lineal():
 @app.route("/pruebas_multiplicativo", methods=["POST"])
 def pruebas_multiplicativo():
     """Ejecutar pruebas estadísticas sobre los números Ri de congruencia multiplicativa"""
-    global ri_multiplicativo
+    ri_multiplicativo = ri_de("multiplicativo")
     
-    if not ri_multiplicativo:
+    if len(ri_multiplicativo) == 0:
         return render_template("multiplicativo.html", 
                              error="No hay datos de congruencia multiplicativa disponibles para realizar pruebas.")
     
@@ -992,7 +1287,7 @@ def exportar_normal_csv():
     try:
         # Obtener datos disponibles
         ri_disponibles = obtener_ri()
-        if not ri_disponibles:
+        if len(ri_disponibles) == 0:
             return jsonify({"error": "No hay datos disponibles para exportar"}), 400
         
         # Obtener parámetros del formulario
@@ -1000,7 +1295,7 @@ def exportar_normal_csv():
         desviacion = float(request.form.get("desviacion", 1.0))
         
         # Generar distribución normal
-        df_normal = distribucion_normal_inversa(ri_disponibles, desviacion, media)
+        df_normal = distribucion_normal_inversa(ri_disponibles, desviacion, media, metodo_normal_formulario())
         
         # Crear archivo CSV en memoria
         output = io.StringIO()
@@ -1032,7 +1327,7 @@ def exportar_uniforme_csv():
     try:
         # Obtener datos disponibles
         ri_disponibles = obtener_ri()
-        if not ri_disponibles:
+        if len(ri_disponibles) == 0:
             return jsonify({"error": "No hay datos disponibles para exportar"}), 400
         
         # Obtener parámetros del formulario
@@ -1072,13 +1367,13 @@ def grafico_uniforme():
     try:
         # Obtener datos disponibles
         ri_disponibles = obtener_ri()
-        if not ri_disponibles:
+        if len(ri_disponibles) == 0:
             mensaje_error = "No hay datos de números aleatorios disponibles. Genera números primero usando algún método."
             return render_template("distribucion_uniforme.html", 
                                  error=mensaje_error,
                                  min_val=0.0,
                                  max_val=1.0,
-                                 metodo_usado=ultimo_metodo_generacion)
+                                 metodo_usado=estado_sesion()["ultimo_metodo"])
         
         # Obtener parámetros del formulario
         min_val = float(request.form.get("min_val", 0.0))
@@ -1095,14 +1390,14 @@ def grafico_uniforme():
                              table=None,  # Solo mostrar gráfico
                              min_val=min_val,
                              max_val=max_val,
-                             metodo_usado=ultimo_metodo_generacion)
+                             metodo_usado=estado_sesion()["ultimo_metodo"])
     
     except Exception as e:
         return render_template("distribucion_uniforme.html", 
                              error=f"Error al generar gráfico: {str(e)}",
                              min_val=request.form.get("min_val", 0.0),
                              max_val=request.form.get("max_val", 1.0),
-                             metodo_usado=ultimo_metodo_generacion)
+                             metodo_usado=estado_sesion()["ultimo_metodo"])
 
 
 @app.route("/grafico_serie_cuadrados", methods=["POST"])
@@ -1110,9 +1405,10 @@ def grafico_serie_cuadrados():
     """Generar gráfico de serie temporal para cuadrados medios"""
     try:
         from modules.generadores.minimos_cuadrados import graficar_serie_temporal
+        ri_cuadrados = ri_de("cuadrados")
         
         # Verificar que hay datos disponibles
-        if not ri_cuadrados:
+        if len(ri_cuadrados) == 0:
             return render_template("grafico_serie.html", 
                                  error="No hay datos de cuadrados medios disponibles. Genera números primero.",
                                  metodo="Cuadrados Medios",
@@ -1146,9 +1442,10 @@ def grafico_serie_lineal():
     """Generar gráfico de serie temporal para congruencia lineal"""
     try:
         from modules.generadores.congruencia_lineal import graficar_serie_temporal
+        ri_lineal = ri_de("lineal")
         
         # Verificar que hay datos disponibles
-        if not ri_lineal:
+        if len(ri_lineal) == 0:
             return render_template("grafico_serie.html", 
                                  error="No hay datos de congruencia lineal disponibles. Genera números primero.",
                                  metodo="Congruencia Lineal",
@@ -1186,9 +1483,10 @@ def grafico_serie_multiplicativo():
     """Generar gráfico de serie temporal para congruencia multiplicativa"""
     try:
         from modules.generadores.congruencia_multi import graficar_serie_temporal
+        ri_multiplicativo = ri_de("multiplicativo")
         
         # Verificar que hay datos disponibles
-        if not ri_multiplicativo:
+        if len(ri_multiplicativo) == 0:
             return render_template("grafico_serie.html", 
                                  error="No hay datos de congruencia multiplicativa disponibles. Genera números primero.",
                                  metodo="Congruencia Multiplicativa",
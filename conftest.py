@@ -0,0 +1,20 @@
+# Raíz del proyecto para pytest: así los tests importan `modules...` igual que app.py
+import os
+import shutil
+import tempfile
+
+_carpeta_temporal = None
+
+
+def pytest_configure(config):
+    # Sesiones y corridas de los tests en una carpeta temporal, no en outputs/. Se fija
+    # antes de que los tests importen app.py y corridas.py, que leen estas variables al cargarse
+    global _carpeta_temporal
+    _carpeta_temporal = tempfile.mkdtemp(prefix="pruebas_generadores_")
+    os.environ["RUTA_SESIONES"] = os.path.join(_carpeta_temporal, "sesiones")
+    os.environ["RUTA_CORRIDAS"] = os.path.join(_carpeta_temporal, "corridas")
+
+
+def pytest_unconfigure(config):
+    if _carpeta_temporal:
+        shutil.rmtree(_carpeta_temporal, ignore_errors=True)
@@ -0,0 +1,120 @@
+import os
+import re
+import copy
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl  # Bloqueo entre procesos (gunicorn con varios workers); no existe en Windows
+except ImportError:
+    fcntl = None
+
+# Formato de los ids de sesión (uuid4 en hexadecimal): evita rutas arbitrarias en disco
+PATRON_ID_SESION = re.compile(r"^[0-9a-f]{32}$")
+
+# Las sesiones sin uso durante este tiempo se borran del disco
+DURACION_SESION = 7 * 24 * 3600
+
+# Cantidad de candados entre los que se reparten las sesiones (memoria fija sin importar cuántas haya)
+CANDADOS_SESION = 64
+
+ESTADO_INICIAL = {
+    # Última corrida de cada generador: {"parametros": {...}, "n": n}; los Ri se leen de outputs/corridas
+    "corridas": {"cuadrados": None, "lineal": None, "multiplicativo": None},
+    # Semilla elegida en "Cargar semillas" que se usa una sola vez al abrir el generador
+    "semillas": {"cuadrados": None, "lineal": None, "multiplicativo": None},
+    "ultimo_metodo": None,
+    "nums": []
+}
+
+
+def id_valido(id_sesion):
+    return isinstance(id_sesion, str) and PATRON_ID_SESION.match(id_sesion) is not None
+
+
+class AlmacenSesiones:
+    """
+    Estado de cada sesión guardado como outputs/sesiones/<id>.json.
+
+    Como el estado vive en disco y no en variables del módulo, varios hilos o
+    procesos (workers de gunicorn) pueden atender a la misma sesión. Cada
+    modificación se hace bajo un candado de hilo y, si el sistema lo permite,
+    un flock sobre <id>.lock; la escritura es atómica (archivo temporal +
+    os.replace), así que una lectura nunca ve un JSON a medio escribir.
+
+    `estado_inicial` permite usar otro almacén con un estado distinto (p. ej.
+    las pruebas incrementales), separado del estado principal de la sesión.
+    """
+
+    def __init__(self, carpeta, estado_inicial=ESTADO_INICIAL):
+        self.carpeta = carpeta
+        self.estado_inicial = estado_inicial
+        self._candados = [threading.RLock() for _ in range(CANDADOS_SESION)]
+        os.makedirs(carpeta, exist_ok=True)
+
+    def _ruta(self, id_sesion):
+        if not id_valido(id_sesion):
+            raise ValueError("Id de sesión no válido")
+        return os.path.join(self.carpeta, f"{id_sesion}.json")
+
+    def ruta_archivo(self, id_sesion, extension):
+        """Ruta de otro archivo de la sesión (<id>.<extension>), que se borra junto con ella."""
+        return f"{self._ruta(id_sesion)[:-5]}.{extension}"
+
+    def leer(self, id_sesion):
+        """Copia del estado de la sesión (el estado inicial si todavía no tiene uno)."""
+        try:
+            with open(self._ruta(id_sesion), encoding="utf-8") as archivo:
+                estado = json.load(archivo)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return copy.deepcopy(self.estado_inicial)
+
+        # Completa claves agregadas después de que se creó la sesión
+        for clave, valor in self.estado_inicial.items():
+            estado.setdefault(clave, copy.deepcopy(valor))
+        return estado
+
+    @contextmanager
+    def modificar(self, id_sesion):
+        """
+        Da el estado de la sesión para modificarlo en el bloque `with` y lo
+        guarda al salir, con la sesión bloqueada mientras tanto.
+        """
+        ruta = self._ruta(id_sesion)
+        with self._candados[int(id_sesion[:8], 16) % CANDADOS_SESION]:
+            with open(f"{ruta[:-5]}.lock", "a") as candado:
+                if fcntl is not None:
+                    fcntl.flock(candado, fcntl.LOCK_EX)
+
+                estado = self.leer(id_sesion)
+                yield estado
+
+                temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temporal, "w", encoding="utf-8") as archivo:
+                    json.dump(estado, archivo)
+                os.replace(temporal, ruta)
+                # El flock se libera al cerrar el archivo de candado
+
+    def tomar(self, id_sesion, seccion, clave):
+        """Devuelve estado[seccion][clave] y lo deja en None (valores de un solo uso)."""
+        with self.modificar(id_sesion) as estado:
+            valor = estado[seccion][clave]
+            estado[seccion][clave] = None
+        return valor
+
+    def limpiar(self, duracion=DURACION_SESION):
+        """Borra las sesiones (y sus demás archivos) que no se modificaron en `duracion` segundos."""
+        limite = time.time() - duracion
+        vencidas = set()
+        for entrada in os.scandir(self.carpeta):
+            if entrada.name.endswith(".json") and entrada.stat().st_mtime < limite:
+                vencidas.add(entrada.name[:-5])
+
+        for entrada in os.scandir(self.carpeta):
+            if entrada.is_file() and entrada.name.split(".")[0] in vencidas:
+                try:
+                    os.remove(entrada.path)
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,80 @@
+import threading
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """
+    Caché LRU acotado por bytes. Cada valor debe tener el atributo `nbytes`
+    (arreglos NumPy, Secuencia) y se guarda bajo una clave construida a partir
+    de su contenido, por ejemplo (método, parámetros, n).
+
+    Al pasar el presupuesto se desalojan las entradas usadas hace más tiempo.
+    Un valor más grande que todo el presupuesto se devuelve sin guardarlo.
+
+    `tamano` cambia cómo se mide cada valor: con `lambda valor: 1` el caché
+    queda acotado por cantidad de entradas en lugar de bytes.
+    """
+
+    def __init__(self, max_bytes, tamano=None):
+        self.max_bytes = max_bytes
+        self._tamano = tamano or (lambda valor: valor.nbytes)
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self._entradas = OrderedDict()
+        self._candado = threading.RLock()
+
+    def obtener(self, clave, calcular):
+        """Devuelve el valor de `clave`; si no está, lo calcula con calcular() y lo guarda."""
+        with self._candado:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return self._entradas[clave]
+            self.fallos += 1
+
+        # Se calcula fuera del candado para no bloquear a las demás consultas
+        valor = calcular()
+        self.guardar(clave, valor)
+        return valor
+
+    def guardar(self, clave, valor):
+        tamano = self._tamano(valor)
+        with self._candado:
+            if clave in self._entradas:
+                self.bytes -= self._tamano(self._entradas.pop(clave))
+            if tamano > self.max_bytes:
+                return
+
+            self._entradas[clave] = valor
+            self.bytes += tamano
+            while self.bytes > self.max_bytes:
+                _, desalojado = self._entradas.popitem(last=False)
+                self.bytes -= self._tamano(desalojado)
+                self.desalojos += 1
+
+    def limpiar(self):
+        with self._candado:
+            self._entradas.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, clave):
+        return clave in self._entradas
+
+    def estadisticas(self):
+        """Contadores del caché para exponerlos en la API."""
+        with self._candado:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0
+            }
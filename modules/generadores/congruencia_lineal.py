@@ -1,41 +1,81 @@
 import numpy as np
-import pandas as pd
 
-def generar(x_o, k, c, g, n):
-    registros = []
+from modules.generadores.secuencia import Secuencia, FILAS_POR_BLOQUE, muestra_serie
+from modules.generadores.truncamiento import truncar_decimales_vectorizado
+from modules.generadores.motor_congruencial import (saltar, secuencia_congruencial, columnas_paralelas,
+                                                    columnas_por_bloques, procesos_sugeridos, xi_a_enteros,
+                                                    normalizar)
+
+def generar(x_o, k, c, g, n, procesos=None):
+    """
+    Genera n números con el método de congruencia lineal
+    X_{i+1} = (a * X_i + c) mod m, con a = 1 + 2k y m = 2^g.
+
+    La secuencia se calcula por bloques vectorizados (ver motor_congruencial),
+    con los mismos Xi y Ri que la versión iterativa. Con procesos > 1 se
+    reparte en tramos contiguos entre varios procesos; None elige según n.
+    """
     a = 1 + 2 * k
-    x_a = x_o
     m = 2 ** g
+    if procesos is None:
+        procesos = procesos_sugeridos(n)
+
+    if procesos > 1 and g <= 64:
+        xi, ri = columnas_paralelas(x_o, a, c, g, n, m, procesos)
+    else:
+        xi = secuencia_congruencial(x_o, a, c, g, n)
+        ri = truncar_decimales_vectorizado(normalizar(xi, m))
+
+    secuencia = Secuencia({
+        "i": np.arange(1, n + 1),
+        "Xi": xi_a_enteros(xi, g),
+        "Ri": ri
+    })
+    return secuencia
 
-    for i in range(n):
-        x_i = np.mod(((a * x_a) + c), m)
-        x_a = x_i
-        r_i = truncar_decimales_inteligente(x_i / m)
+def saltar_a(x_o, k, c, g, indice):
+    """
+    Devuelve el Xi de la posición `indice` (la misma numeración de la columna
+    "i" de generar, que empieza en 1) en O(log indice).
+    """
+    return saltar(x_o, 1 + 2 * k, c, g, indice)
+
+def generar_por_bloques(x_o, k, c, g, n, filas_por_bloque=FILAS_POR_BLOQUE, procesos=None):
+    """
+    Versión iterable de generar: entrega la misma secuencia como Secuencias
+    de a lo sumo `filas_por_bloque` filas. Entre bloques solo se conserva el
+    último Xi, así que la memoria no crece con n. Con procesos > 1 (None
+    elige según n) cada tramo de bloques se genera entre varios procesos.
+    """
+    a = 1 + 2 * k
+    m = 2 ** g
 
-        registros.append({
-            "i": i+1,
-            "Xi": int(x_i),
-            "Ri": r_i
+    for inicio, xi, ri in columnas_por_bloques(x_o, a, c, g, n, m, filas_por_bloque, procesos):
+        yield Secuencia({
+            "i": np.arange(inicio + 1, inicio + len(xi) + 1),
+            "Xi": xi_a_enteros(xi, g),
+            "Ri": ri
         })
 
-    df = pd.DataFrame(registros)
-    return df
+def ventana(x_o, k, c, g, inicio, cantidad):
+    """
+    Genera solo las filas i = inicio .. inicio + cantidad - 1 de la secuencia.
+    Salta al valor anterior a la ventana y desde ahí genera por bloques, así
+    que el costo no depende de qué tan lejos esté la ventana.
+    """
+    a = 1 + 2 * k
+    m = 2 ** g
 
-def truncar_decimales_inteligente(numero):
-    
-    # Truncar a 5 decimales máximo usando truncamiento, no redondeo
-    factor = 10.0 ** 5
-    truncado = int(numero * factor) / factor
-    
-    # Convertir a string para eliminar ceros trailing
-    resultado_str = f"{truncado:.5f}".rstrip('0').rstrip('.')
-    
-    # Si queda vacío después del punto, agregar un 0
-    if resultado_str.endswith('.'):
-        resultado_str = resultado_str[:-1]
-    
-    # Convertir de vuelta a float
-    return float(resultado_str)
+    x_anterior = saltar(x_o, a, c, g, inicio - 1)
+    xi = secuencia_congruencial(x_anterior, a, c, g, cantidad)
+    ri = truncar_decimales_vectorizado(normalizar(xi, m))
+
+    secuencia = Secuencia({
+        "i": np.arange(inicio, inicio + cantidad),
+        "Xi": xi_a_enteros(xi, g),
+        "Ri": ri
+    })
+    return secuencia
 
 def graficar_serie_temporal(ri_values, parametros_info="", titulo_adicional=""):
     """
@@ -56,11 +96,11 @@ def graficar_serie_temporal(ri_values, parametros_info="", titulo_adicional=""):
     # Configurar el gráfico
     plt.figure(figsize=(12, 6))
     
-    # Crear índices (1, 2, 3, ...)
-    indices = list(range(1, len(ri_values) + 1))
+    # Crear índices (1, 2, 3, ...); en series largas, una muestra equiespaciada
+    indices, muestra = muestra_serie(ri_values)
     
     # Gráfico de líneas con puntos
-    plt.plot(indices, ri_values, 'g-o', linewidth=1.5, markersize=3, alpha=0.7)
+    plt.plot(indices, muestra, 'g-o', linewidth=1.5, markersize=3, alpha=0.7)
     
     # Personalización
     plt.title(f'Serie Temporal - Congruencia Lineal\n{parametros_info}\n{titulo_adicional}', 
@@ -73,7 +113,7 @@ def graficar_serie_temporal(ri_values, parametros_info="", titulo_adicional=""):
     plt.ylim(0, 1)
     
     # Estadísticas básicas en el gráfico
-    mean_val = sum(ri_values) / len(ri_values)
+    mean_val = float(np.mean(ri_values))
     plt.axhline(y=mean_val, color='red', linestyle='--', alpha=0.7, label=f'Media: {mean_val:.4f}')
     plt.axhline(y=0.5, color='green', linestyle='--', alpha=0.5, label='Valor esperado: 0.5')
     
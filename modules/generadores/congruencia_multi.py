@@ -1,39 +1,81 @@
-import pandas as pd
+import numpy as np
 
-def generar(x0: int, t: int, g: int, n: int):
-   
+from modules.generadores.secuencia import Secuencia, FILAS_POR_BLOQUE, muestra_serie
+from modules.generadores.truncamiento import truncar_decimales_vectorizado
+from modules.generadores.motor_congruencial import (saltar, secuencia_congruencial, columnas_paralelas,
+                                                    columnas_por_bloques, procesos_sugeridos, xi_a_enteros,
+                                                    normalizar)
+
+def generar(x0: int, t: int, g: int, n: int, procesos=None):
+    """
+    Genera n números con el método de congruencia multiplicativa
+    X_{i+1} = (a * X_i) mod m, con a = 8t + 3, m = 2^g y Ri = Xi / (m - 1).
+
+    Usa el mismo motor por bloques que congruencia lineal (con c = 0) y, si
+    procesos > 1, lo reparte entre varios procesos; None elige según n.
+    """
     # Parámetros
     m = 2 ** g
     a = 8 * t + 3
-    xi = x0
+    if procesos is None:
+        procesos = procesos_sugeridos(n)
 
-    # Resultados
-    data = []
+    if procesos > 1 and g <= 64:
+        xi, ri = columnas_paralelas(x0, a, 0, g, n, m - 1, procesos)
+    else:
+        xi = secuencia_congruencial(x0, a, 0, g, n)
+        ri = truncar_decimales_vectorizado(normalizar(xi, m - 1))   # Normalización
 
-    for i in range(n):
-        xi = (a * xi) % m
-        ri = truncar_decimales_inteligente(xi / (m - 1))   # Normalización
-        data.append([i + 1, xi, ri])
+    # Resultado columnar (el DataFrame se arma solo al mostrar o exportar)
+    secuencia = Secuencia({
+        "i": np.arange(1, n + 1),
+        "Xi": xi_a_enteros(xi, g),
+        "Ri": ri
+    })
+    return secuencia
 
-    # Convertir en DataFrame
-    df = pd.DataFrame(data, columns=["i", "Xi", "Ri"])
-    return df
+def saltar_a(x0: int, t: int, g: int, indice: int):
+    """
+    Devuelve el Xi de la posición `indice` (numeración de la columna "i",
+    desde 1) usando a^indice mod m, en O(log indice).
+    """
+    return saltar(x0, 8 * t + 3, 0, g, indice)
 
-def truncar_decimales_inteligente(numero):
-    
-    # Truncar a 5 decimales máximo usando truncamiento, no redondeo
-    factor = 10.0 ** 5
-    truncado = int(numero * factor) / factor
-    
-    # Convertir a string para eliminar ceros trailing
-    resultado_str = f"{truncado:.5f}".rstrip('0').rstrip('.')
-    
-    # Si queda vacío después del punto, agregar un 0
-    if resultado_str.endswith('.'):
-        resultado_str = resultado_str[:-1]
-    
-    # Convertir de vuelta a float
-    return float(resultado_str)
+def generar_por_bloques(x0: int, t: int, g: int, n: int, filas_por_bloque: int = FILAS_POR_BLOQUE,
+                        procesos=None):
+    """
+    Versión iterable de generar: entrega la misma secuencia por bloques de a
+    lo sumo `filas_por_bloque` filas, pasando de uno a otro solo el último Xi.
+    Con procesos > 1 (None elige según n) cada tramo se reparte entre procesos.
+    """
+    m = 2 ** g
+    a = 8 * t + 3
+
+    for inicio, xi, ri in columnas_por_bloques(x0, a, 0, g, n, m - 1, filas_por_bloque, procesos):
+        yield Secuencia({
+            "i": np.arange(inicio + 1, inicio + len(xi) + 1),
+            "Xi": xi_a_enteros(xi, g),
+            "Ri": ri
+        })
+
+def ventana(x0: int, t: int, g: int, inicio: int, cantidad: int):
+    """
+    Genera solo las filas i = inicio .. inicio + cantidad - 1 de la secuencia
+    sin recorrer las anteriores.
+    """
+    m = 2 ** g
+    a = 8 * t + 3
+
+    x_anterior = saltar(x0, a, 0, g, inicio - 1)
+    xi = secuencia_congruencial(x_anterior, a, 0, g, cantidad)
+    ri = truncar_decimales_vectorizado(normalizar(xi, m - 1))
+
+    secuencia = Secuencia({
+        "i": np.arange(inicio, inicio + cantidad),
+        "Xi": xi_a_enteros(xi, g),
+        "Ri": ri
+    })
+    return secuencia
 
 def graficar_serie_temporal(ri_values, parametros_info="", titulo_adicional=""):
     """
@@ -54,11 +96,11 @@ def graficar_serie_temporal(ri_values, parametros_info="", titulo_adicional=""):
     # Configurar el gráfico
     plt.figure(figsize=(12, 6))
     
-    # Crear índices (1, 2, 3, ...)
-    indices = list(range(1, len(ri_values) + 1))
+    # Crear índices (1, 2, 3, ...); en series largas, una muestra equiespaciada
+    indices, muestra = muestra_serie(ri_values)
     
     # Gráfico de líneas con puntos
-    plt.plot(indices, ri_values, 'r-o', linewidth=1.5, markersize=3, alpha=0.7)
+    plt.plot(indices, muestra, 'r-o', linewidth=1.5, markersize=3, alpha=0.7)
     
     # Personalización
     plt.title(f'Serie Temporal - Congruencia Multiplicativa\n{parametros_info}\n{titulo_adicional}', 
@@ -71,7 +113,7 @@ def graficar_serie_temporal(ri_values, parametros_info="", titulo_adicional=""):
     plt.ylim(0, 1)
     
     # Estadísticas básicas en el gráfico
-    mean_val = sum(ri_values) / len(ri_values)
+    mean_val = float(np.mean(ri_values))
     plt.axhline(y=mean_val, color='red', linestyle='--', alpha=0.7, label=f'Media: {mean_val:.4f}')
     plt.axhline(y=0.5, color='green', linestyle='--', alpha=0.5, label='Valor esperado: 0.5')
     
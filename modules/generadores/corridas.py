@@ -0,0 +1,183 @@
+import os
+import json
+import shutil
+import hashlib
+import threading
+
+import numpy as np
+
+from modules.generadores.secuencia import Secuencia
+
+# Cada corrida es una carpeta <RUTA_CORRIDAS>/<id> con un .npy por columna y su corrida.json.
+# Todos los procesos que usan la misma carpeta comparten las corridas: la variable de entorno
+# RUTA_CORRIDAS permite ponerla en memoria (p. ej. /dev/shm/corridas) para varios workers.
+RUTA_CORRIDAS = os.environ.get("RUTA_CORRIDAS") or os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "outputs", "corridas"))
+
+# Espacio en disco para corridas; al pasarlo se borran las usadas hace más tiempo
+MAX_BYTES_CORRIDAS = 8 * 1024 ** 3
+
+_candado_limpieza = threading.Lock()
+
+
+def id_corrida(parametros, n):
+    """Identificador de la corrida: un hash de los parámetros del generador y n, así que repetirla reutiliza el archivo."""
+    texto = json.dumps({"parametros": parametros, "n": n}, sort_keys=True)
+    return hashlib.blake2b(texto.encode(), digest_size=12).hexdigest()
+
+
+def ruta_corrida(id_):
+    return os.path.join(RUTA_CORRIDAS, id_)
+
+
+def existe_corrida(id_):
+    return os.path.exists(os.path.join(ruta_corrida(id_), "corrida.json"))
+
+
+def guardar_corrida(bloques, n, parametros):
+    """
+    Escribe en disco las Secuencias que entrega `bloques` (n filas en total)
+    y devuelve el id de la corrida. Cada columna es un .npy cuyo encabezado
+    (con n) se escribe primero; los datos se agregan bloque a bloque, así que
+    la memoria usada es la de un bloque sin importar n.
+
+    Si la corrida ya existe no se vuelve a generar. La carpeta se arma con
+    otro nombre y se renombra al final, para que nadie lea una a medio escribir.
+    """
+    id_ = id_corrida(parametros, n)
+    carpeta = ruta_corrida(id_)
+    if existe_corrida(id_):
+        os.utime(carpeta)  # Marca la corrida como usada recientemente
+        return id_
+
+    temporal = f"{carpeta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    os.makedirs(temporal)
+    columnas = {}
+    try:
+        escritas = 0
+        for bloque in bloques:
+            if not columnas:
+                columnas = {nombre: _ColumnaEnDisco(temporal, j, columna.dtype, n)
+                            for j, (nombre, columna) in enumerate(bloque.columnas.items())}
+            if escritas + len(bloque) > n:
+                raise ValueError(f"El generador entregó más de las {n} filas anunciadas")
+            for nombre, columna in columnas.items():
+                columna.agregar(bloque[nombre])
+            escritas += len(bloque)
+
+        if escritas != n:
+            raise ValueError(f"El generador entregó {escritas} filas de las {n} anunciadas")
+
+        descripcion = []
+        for nombre, columna in columnas.items():
+            columna.cerrar()
+            descripcion.append({"nombre": nombre, "archivo": os.path.basename(columna.ruta)})
+
+        with open(os.path.join(temporal, "corrida.json"), "w", encoding="utf-8") as archivo:
+            json.dump({"id": id_, "parametros": parametros, "n": n, "columnas": descripcion}, archivo)
+
+        try:
+            os.replace(temporal, carpeta)
+        except OSError:
+            # Otro hilo o proceso terminó la misma corrida primero: se usa la suya
+            shutil.rmtree(temporal, ignore_errors=True)
+    except BaseException:
+        for columna in columnas.values():
+            columna.cerrar()
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+
+    limpiar_corridas(conservar=id_)
+    return id_
+
+
+class _ColumnaEnDisco:
+    """
+    Un .npy que se escribe por partes: el encabezado al crearlo y los datos
+    con write() a medida que llegan. No se mapea para escribir, así que las
+    páginas ya escritas no se acumulan en la memoria del proceso.
+    """
+
+    def __init__(self, carpeta, j, dtype, n):
+        self.ruta = os.path.join(carpeta, f"columna_{j}.npy")
+        self.dtype = dtype
+        self.archivo = None
+        self.valores = None
+
+        if dtype == object:
+            # Columnas de objetos (Xi con g > 64): no se pueden mapear y se guardan completas al cerrar
+            self.valores = []
+            return
+
+        self.archivo = open(self.ruta, "wb")
+        np.lib.format.write_array_header_1_0(self.archivo, {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": (n,)
+        })
+
+    def agregar(self, valores):
+        if self.valores is not None:
+            self.valores.extend(valores)
+        else:
+            self.archivo.write(np.ascontiguousarray(valores, dtype=self.dtype).data)
+
+    def cerrar(self):
+        if self.valores is not None:
+            np.save(self.ruta, np.array(self.valores, dtype=object), allow_pickle=True)
+            self.valores = None
+        elif self.archivo is not None:
+            self.archivo.close()
+
+
+def abrir_corrida(id_):
+    """
+    Secuencia de la corrida con cada columna mapeada en modo solo lectura:
+    los datos se leen del disco a medida que se tocan sus páginas.
+    """
+    carpeta = ruta_corrida(id_)
+    with open(os.path.join(carpeta, "corrida.json"), encoding="utf-8") as archivo:
+        descripcion = json.load(archivo)
+
+    columnas = {}
+    for columna in descripcion["columnas"]:
+        ruta = os.path.join(carpeta, columna["archivo"])
+        try:
+            columnas[columna["nombre"]] = np.load(ruta, mmap_mode="r")
+        except ValueError:
+            columnas[columna["nombre"]] = np.load(ruta, allow_pickle=True)
+    return Secuencia(columnas)
+
+
+def ri_corrida(id_):
+    """Solo la columna Ri de la corrida, mapeada desde el disco."""
+    return abrir_corrida(id_).ri
+
+
+def limpiar_corridas(conservar=None, max_bytes=MAX_BYTES_CORRIDAS):
+    """
+    Borra las corridas usadas hace más tiempo hasta que el total quede bajo
+    `max_bytes`. La corrida `conservar` (la recién escrita) nunca se borra.
+    Borrar una corrida que sigue mapeada es seguro: el sistema mantiene sus
+    datos hasta que se cierra el último mapeo.
+    """
+    with _candado_limpieza:
+        if not os.path.isdir(RUTA_CORRIDAS):
+            return
+
+        corridas = []
+        for nombre in os.listdir(RUTA_CORRIDAS):
+            carpeta = os.path.join(RUTA_CORRIDAS, nombre)
+            if nombre.endswith(".tmp") or not os.path.isdir(carpeta):
+                continue
+            tamano = sum(entrada.stat().st_size for entrada in os.scandir(carpeta))
+            corridas.append((os.stat(carpeta).st_mtime, nombre, tamano))
+
+        total = sum(tamano for _, _, tamano in corridas)
+        for _, nombre, tamano in sorted(corridas):
+            if total <= max_bytes:
+                break
+            if nombre == conservar:
+                continue
+            shutil.rmtree(os.path.join(RUTA_CORRIDAS, nombre), ignore_errors=True)
+            total -= tamano
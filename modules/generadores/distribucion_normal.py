@@ -1,36 +1,130 @@
+import time
 import pandas as pd
 from scipy.stats import norm
+from scipy.special import ndtri
 import matplotlib.pyplot as plt
 import numpy as np
 import io
 import base64
 
+from modules.generadores.ziggurat import muestras_ziggurat
 
-def distribucion_normal_inversa(uniformes, std_dev, mean):
-    # Generar uniformes con tu congruencial lineal
-    # print(uniformes)
-    registros = []
-    for i, u in enumerate(uniformes):
-        # Validar que el valor uniforme esté en un rango válido
-        # Evitar valores exactamente 0 o 1 que causan -inf o +inf
-        u_clamp = max(1e-10, min(1 - 1e-10, u))
-        
-        # Inversa de la CDF de la normal (usa la f.d.p. integrada)
-        x = norm.ppf(u_clamp, loc=mean, scale=std_dev)
-        
-        # Verificar que el resultado sea finito
-        if np.isfinite(x):
-            registros.append({
-                "i": i,
-                "U": u,
-                "Ni": x
-            })
-
-    return pd.DataFrame(registros)
-
-def graficar_distribucion_normal(df_uniformes, std_dev, mean):
+# Los uniformes se recortan a [U_MIN, 1 - U_MIN]: 0 y 1 darían -inf y +inf
+U_MIN = 1e-10
+
+# Coeficientes de la aproximación racional de Acklam para la inversa de la normal estándar
+# (error relativo < 1.15e-9): región central |u - 0.5| <= 0.5 - ACKLAM_CORTE y colas
+ACKLAM_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+            1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+ACKLAM_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+            6.680131188771972e+01, -1.328068155288572e+01)
+ACKLAM_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+            -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+ACKLAM_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+            3.754408661907416e+00)
+ACKLAM_CORTE = 0.02425
+
+
+def _horner(coeficientes, x):
+    """Polinomio con los coeficientes de mayor a menor grado, evaluado sobre el arreglo x."""
+    resultado = np.full_like(x, coeficientes[0])
+    for coeficiente in coeficientes[1:]:
+        resultado *= x
+        resultado += coeficiente
+    return resultado
+
+
+def normal_acklam(u):
+    """Inversa de la normal estándar con la aproximación racional de Acklam, sobre todo el arreglo."""
+    u = np.asarray(u, dtype=np.float64)
+
+    # Región central: racional en q = u - 0.5 (se evalúa en todo el arreglo, sin máscaras)
+    q = u - 0.5
+    r = q * q
+    z = q * _horner(ACKLAM_A, r) / (_horner(ACKLAM_B, r) * r + 1)
+
+    # Colas (~5 % de los datos): racional en sqrt(-2 ln p), con p la probabilidad de la
+    # cola más cercana; el valor es negativo y toma el signo de q
+    cola = np.flatnonzero(np.abs(q) > 0.5 - ACKLAM_CORTE)
+    p = np.minimum(u[cola], 1 - u[cola])
+    t = np.sqrt(-2 * np.log(p))
+    z[cola] = np.copysign(_horner(ACKLAM_C, t) / (_horner(ACKLAM_D, t) * t + 1), q[cola])
+    return z
+
+
+def normal_box_muller(u):
+    """
+    Box-Muller sobre pares consecutivos (u1, u2): sqrt(-2 ln u1) cos(2π u2) y
+    sqrt(-2 ln u1) sin(2π u2). Si la cantidad es impar, el último uniforme no
+    tiene pareja y se descarta.
+    """
+    u = np.asarray(u, dtype=np.float64)
+    u1, u2 = u[0:len(u) - 1:2], u[1::2]
+    radio = np.sqrt(-2 * np.log(u1))
+    angulo = 2 * np.pi * u2
+    z = np.empty(2 * len(u1))
+    z[0::2] = radio * np.cos(angulo)
+    z[1::2] = radio * np.sin(angulo)
+    return z
+
+
+def normal_ziggurat(u):
+    """Normales del ziggurat usando todos los uniformes (no una por uniforme: ~2.06 uniformes por salida)."""
+    return muestras_ziggurat(u)[0]
+
+
+# Método -> función de uniformes (ya recortados) a normales estándar
+METODOS_NORMAL = {
+    "ndtri": ndtri,               # Inversa exacta de scipy
+    "acklam": normal_acklam,      # Aproximación racional, más rápida
+    "box_muller": normal_box_muller,
+    "ziggurat": normal_ziggurat   # Rechazo por capas: no es una transformación uno a uno
+}
+
+
+def distribucion_normal_inversa(uniformes, std_dev, mean, metodo="ndtri"):
+    """
+    Transforma los uniformes en normales N(mean, std_dev) con el método
+    elegido (ver METODOS_NORMAL), en una sola operación sobre el arreglo.
+    Devuelve un DataFrame con i (posición del uniforme), U y Ni; se omiten
+    los resultados no finitos. df.attrs["uniformes_consumidos"] dice cuántos
+    uniformes se usaron.
+
+    El ziggurat consume una cantidad variable de uniformes por normal, así
+    que su i es el número de muestra y no tiene columna U.
+    """
+    if metodo not in METODOS_NORMAL:
+        raise ValueError(f"Método '{metodo}' no soportado (usa {', '.join(METODOS_NORMAL)})")
+
+    u = np.asarray(uniformes, dtype=np.float64)
+    # Igual que norm.ppf: una desviación que no es positiva no da resultados
+    escala = std_dev if std_dev > 0 else np.nan
+
+    if metodo == "ziggurat":
+        z, consumidos = muestras_ziggurat(np.clip(u[np.isfinite(u)], 0.0, 1.0))
+        x = mean + escala * z
+        finitos = np.isfinite(x)
+        df = pd.DataFrame({"i": np.flatnonzero(finitos), "Ni": x[finitos]})
+        df.attrs["uniformes_consumidos"] = consumidos
+        return df
+
+    # Evitar valores exactamente 0 o 1 que causan -inf o +inf
+    z = METODOS_NORMAL[metodo](np.clip(u, U_MIN, 1 - U_MIN))
+    u = u[:len(z)]
+    x = mean + escala * z
+
+    finitos = np.isfinite(x)
+    df = pd.DataFrame({
+        "i": np.flatnonzero(finitos),
+        "U": u[finitos],
+        "Ni": x[finitos]
+    })
+    df.attrs["uniformes_consumidos"] = len(z)
+    return df
+
+def graficar_distribucion_normal(df_uniformes, std_dev, mean, metodo="ndtri"):
     # Generar datos
-    df = distribucion_normal_inversa(df_uniformes, std_dev, mean)
+    df = distribucion_normal_inversa(df_uniformes, std_dev, mean, metodo)
     muestras = df["Ni"].values
     
     # Verificar que tenemos datos válidos
@@ -72,4 +166,35 @@ def graficar_distribucion_normal(df_uniformes, std_dev, mean):
     plt.close()
     buf.seek(0)
     img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-    return img_base64
\ No newline at end of file
+    return img_base64
+
+if __name__ == "__main__":
+    # Rendimiento y error de cada método sobre los mismos uniformes. El error se mide
+    # contra ndtri; Box-Muller y el ziggurat no son inversas, así que se comparan con el estadístico KS
+    from scipy.stats import kstest
+
+    generador = np.random.default_rng()
+    uniformes = np.clip(np.concatenate([
+        generador.random(2_000_000),
+        generador.random(100_000) * 1e-6,           # Cola inferior
+        1 - generador.random(100_000) * 1e-6,       # Cola superior
+    ]), U_MIN, 1 - U_MIN)
+    exactos = ndtri(uniformes)
+
+    print(f"{'método':<12}{'Mvalores/s':>12}{'error máx.':>14}{'KS D':>10}")
+    for nombre, transformar in METODOS_NORMAL.items():
+        inicio = time.perf_counter()
+        for _ in range(5):
+            z = transformar(uniformes)
+        segundos = (time.perf_counter() - inicio) / 5
+
+        error = "—" if nombre in ("box_muller", "ziggurat") else f"{np.max(np.abs(z - exactos[:len(z)])):.2e}"
+        d = kstest(transformar(uniformes[:2_000_000]), "norm").statistic  # Solo los uniformes sin cargar a las colas
+        print(f"{nombre:<12}{len(z) / segundos / 1e6:>12.1f}{error:>14}{d:>10.5f}")
+
+    # La versión anterior (norm.ppf por elemento) sobre una muestra, como referencia
+    muestra = uniformes[:20_000]
+    inicio = time.perf_counter()
+    [norm.ppf(u) for u in muestra]
+    segundos = time.perf_counter() - inicio
+    print(f"{'norm.ppf (1 a 1)':<12}{len(muestra) / segundos / 1e6:>12.3f}")
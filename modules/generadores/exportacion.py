@@ -0,0 +1,129 @@
+import io
+import json
+
+import numpy as np
+
+# Formatos binarios disponibles y la extensión de su archivo
+EXTENSIONES = {
+    "npy": "npy",
+    "parquet": "parquet",
+    "crudo": "bin"
+}
+
+# El encabezado JSON del formato crudo se rellena hasta un múltiplo de 64 bytes
+# para que los datos queden alineados y se puedan mapear con np.memmap
+ALINEACION_CRUDO = 64
+
+
+def encabezado_npy(n, dtype="<f8"):
+    """Bytes del encabezado .npy de un arreglo 1-D de n valores, escrito antes de conocer los datos."""
+    buffer = io.BytesIO()
+    np.lib.format.write_array_header_1_0(buffer, {
+        "descr": np.dtype(dtype).str,
+        "fortran_order": False,
+        "shape": (n,)
+    })
+    return buffer.getvalue()
+
+
+def flujo_npy(bloques, n):
+    """
+    Ri de todos los bloques como un archivo .npy de float64 (los valores
+    exactos, sin pérdida). Se carga con np.load(archivo, mmap_mode="r").
+    """
+    yield encabezado_npy(n)
+    for bloque in bloques:
+        yield bloque.ri.astype("<f8", copy=False).tobytes()
+
+
+def encabezado_crudo(n, parametros):
+    """
+    Línea JSON con los parámetros del generador y la ubicación de cada
+    columna, rellenada con espacios hasta un múltiplo de ALINEACION_CRUDO.
+    Le siguen n valores Xi en uint32 y n valores Ri en float32 (little-endian).
+    """
+    def armar(largo):
+        return json.dumps({
+            "formato": "crudo",
+            "parametros": parametros,
+            "n": n,
+            "columnas": [
+                {"nombre": "Xi", "dtype": "<u4", "offset": largo},
+                {"nombre": "Ri", "dtype": "<f4", "offset": largo + 4 * n}
+            ]
+        }).encode()
+
+    # Los offsets forman parte del encabezado: se recalcula hasta que su largo sea estable
+    largo = 0
+    while True:
+        texto = armar(largo)
+        necesario = -(-(len(texto) + 1) // ALINEACION_CRUDO) * ALINEACION_CRUDO
+        if necesario == largo:
+            return texto.ljust(largo - 1) + b"\n"
+        largo = necesario
+
+
+def flujo_crudo(crear_bloques, n, parametros):
+    """
+    Encabezado JSON y luego las columnas Xi (uint32) y Ri (float32), cada una
+    en un tramo contiguo. Como todos los Xi van antes que los Ri, la secuencia
+    se recorre dos veces: `crear_bloques` debe devolver un iterador nuevo en
+    cada llamada (regenerar es más barato que guardar la secuencia).
+    """
+    yield encabezado_crudo(n, parametros)
+    for bloque in crear_bloques():
+        yield bloque["Xi"].astype("<u4").tobytes()
+    for bloque in crear_bloques():
+        yield bloque.ri.astype("<f4").tobytes()
+
+
+class _Tramos:
+    """Destino de escritura para pyarrow que guarda los bytes hasta que se entregan al cliente."""
+
+    def __init__(self):
+        self.partes = []
+        self.posicion = 0
+        self.closed = False
+
+    def write(self, datos):
+        self.partes.append(bytes(datos))
+        self.posicion += len(datos)
+        return len(datos)
+
+    def tell(self):
+        return self.posicion
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def vaciar(self):
+        datos = b"".join(self.partes)
+        self.partes = []
+        return datos
+
+
+def flujo_parquet(bloques):
+    """
+    Columnas Xi y Ri como Parquet, un grupo de filas por bloque. Requiere
+    pyarrow, que es opcional: sin él se lanza ImportError antes de escribir nada.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    def escribir():
+        destino = _Tramos()
+        escritor = None
+        for bloque in bloques:
+            tabla = pa.table({"Xi": bloque["Xi"], "Ri": bloque.ri})
+            if escritor is None:
+                escritor = pq.ParquetWriter(destino, tabla.schema)
+            escritor.write_table(tabla)
+            yield destino.vaciar()
+        if escritor is not None:
+            escritor.close()
+        yield destino.vaciar()
+
+    return escribir()
@@ -1,30 +1,224 @@
+import os
 import math
-import pandas as pd
+from functools import lru_cache
+
+import numpy as np
+
+from modules.generadores.secuencia import Secuencia, FILAS_POR_BLOQUE, muestra_serie
+from modules.generadores.truncamiento import truncar_decimales_vectorizado
+
+# Después del primer paso todo estado tiene a lo sumo 4 dígitos: el atlas cubre 0..9999
+TAMANO_ATLAS = 10 ** 4
+RUTA_ATLAS = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                           "..", "..", "outputs", "atlas_cuadrados_v1.npz"))
+
+# 10^1 .. 10^12: la cantidad de potencias <= x^2 da sus dígitos (los cuadrados válidos tienen hasta 12)
+POTENCIAS_10 = 10 ** np.arange(1, 13, dtype=np.int64)
 
 def generar(seed, amount, a=0, b=10):
-    registros = []
-    x_i = seed
-    for i in range(amount):
-        x_cuadrado = x_i ** 2
-        ext = extraer_numero(x_cuadrado, int(math.log10(abs(x_cuadrado))) + 1)
-        if ext is None:
-            break  # No se puede extraer, termina la secuencia
-        
-        ri = truncar_decimales_inteligente(ext / 10000)
-        
-        registros.append({
-            "i": i,
-            "Xi": x_i,
-            "Xi^2": x_cuadrado,
-            "Extension": int(math.log10(abs(x_cuadrado))) + 1,
-            "Extraccion": ext,
-            "Ri": ri
-            # "Ni": ni
-        })
-        x_i = ext
-
-    df = pd.DataFrame(registros)
-    return df
+    """
+    Genera hasta `amount` números con cuadrados medios. La secuencia se arma
+    indexando el atlas de estados: se recorre una sola vez la cola y el ciclo
+    de la semilla y, si se piden más valores, se repite el ciclo.
+
+    Returns:
+        Secuencia con las columnas i, Xi, Xi^2, Extension, Extraccion y Ri
+        (vacía si la semilla se degenera de inmediato)
+    """
+    return filas_de_estados(recorrido(seed, amount), 0)
+
+def generar_por_bloques(seed, amount, filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    Versión iterable de generar: entrega las mismas filas como Secuencias de
+    a lo sumo `filas_por_bloque` filas. Solo se guarda el camino de la
+    semilla (cola más un ciclo, a lo sumo 10^4 + 1 estados); cada bloque se
+    obtiene indexándolo, así que la memoria no crece con `amount`.
+    """
+    camino, ciclo = camino_semilla(seed, amount)
+    total = amount if ciclo else len(camino)
+
+    # Si no hay filas se entrega un único bloque vacío, igual que generar
+    for inicio in range(0, max(total, 1), filas_por_bloque):
+        fin = min(inicio + filas_por_bloque, total)
+        yield filas_de_estados(estados_en(camino, ciclo, inicio, fin), inicio)
+
+def filas_de_estados(xi, inicio):
+    """Arma las columnas de cuadrados medios para los estados `xi`, numerando desde `inicio`."""
+    atlas = cargar_atlas()
+
+    cuadrados = xi ** 2
+    extension = np.searchsorted(POTENCIAS_10, cuadrados, side="right") + 1
+    en_atlas = (xi >= 0) & (xi < TAMANO_ATLAS)
+    indices = np.where(en_atlas, xi, 0)
+    extraccion = atlas["siguiente"][indices].astype(np.int64)
+    ri = atlas["ri"][indices]
+
+    # Solo la semilla puede quedar fuera del atlas (más de 4 dígitos): su fila se calcula aparte
+    for j in np.flatnonzero(~en_atlas):
+        extraccion[j] = extraer_numero(int(cuadrados[j]), int(extension[j]))
+        ri[j] = truncar_decimales_vectorizado(extraccion[j] / 10000)
+
+    secuencia = Secuencia({
+        "i": np.arange(inicio, inicio + len(xi)),
+        "Xi": xi,
+        "Xi^2": cuadrados,
+        "Extension": extension.astype(np.int64),
+        "Extraccion": extraccion,
+        "Ri": ri
+        # "Ni": ni
+    })
+    return secuencia
+
+def siguiente_estado(x):
+    """Un paso de cuadrados medios sobre enteros de Python; None si no se puede extraer."""
+    cuadrado = x ** 2
+    if cuadrado == 0:
+        return None  # log10(0) no está definido: la secuencia termina
+    return extraer_numero(cuadrado, int(math.log10(abs(cuadrado))) + 1)
+
+def construir_atlas():
+    """
+    Precalcula para cada estado x de 0..9999:
+    - siguiente: el número extraído de x^2 (-1 si la secuencia se degenera ahí)
+    - ri: el Ri que produce x
+    - cola / ciclo: pasos hasta entrar al ciclo y su longitud (ciclo 0 si se degenera)
+    - degenera: si la secuencia termina en lugar de ciclar
+    - valores: cuántos valores distintos produce x antes de repetir o degenerar
+    """
+    siguiente = np.full(TAMANO_ATLAS, -1, dtype=np.int32)
+    for x in range(TAMANO_ATLAS):
+        ext = siguiente_estado(x)
+        if ext is not None:
+            siguiente[x] = ext
+    ri = np.where(siguiente >= 0, truncar_decimales_vectorizado(siguiente / 10000), 0.0)
+
+    cola = np.zeros(TAMANO_ATLAS, dtype=np.int32)
+    ciclo = np.zeros(TAMANO_ATLAS, dtype=np.int32)
+    degenera = np.zeros(TAMANO_ATLAS, dtype=bool)
+    visitado = np.zeros(TAMANO_ATLAS, dtype=np.int8)  # 0 = nuevo, 1 = en el camino actual, 2 = resuelto
+
+    for inicio in range(TAMANO_ATLAS):
+        camino = []
+        x = inicio
+        while x != -1 and visitado[x] == 0:
+            visitado[x] = 1
+            camino.append(x)
+            x = siguiente[x]
+
+        # Si el camino se cerró sobre sí mismo, sus últimos nodos forman un ciclo nuevo
+        if x != -1 and visitado[x] == 1:
+            posicion = camino.index(x)
+            for nodo in camino[posicion:]:
+                ciclo[nodo] = len(camino) - posicion
+                visitado[nodo] = 2
+            camino = camino[:posicion]
+
+        # El resto hereda del sucesor: un paso más de cola, mismo ciclo o degeneración
+        for nodo in reversed(camino):
+            sucesor = siguiente[nodo]
+            if sucesor == -1:
+                degenera[nodo] = True
+            else:
+                cola[nodo] = cola[sucesor] + 1
+                ciclo[nodo] = ciclo[sucesor]
+                degenera[nodo] = degenera[sucesor]
+            visitado[nodo] = 2
+
+    # Si se degenera, la cola cuenta justo los valores que alcanza a producir
+    valores = cola + ciclo
+
+    return {
+        "siguiente": siguiente,
+        "ri": ri,
+        "cola": cola,
+        "ciclo": ciclo,
+        "degenera": degenera,
+        "valores": valores.astype(np.int32)
+    }
+
+@lru_cache(maxsize=1)
+def cargar_atlas():
+    """Carga el atlas desde outputs/ o lo construye y lo guarda la primera vez."""
+    if os.path.exists(RUTA_ATLAS):
+        with np.load(RUTA_ATLAS) as archivo:
+            return {nombre: archivo[nombre] for nombre in archivo.files}
+
+    atlas = construir_atlas()
+    os.makedirs(os.path.dirname(RUTA_ATLAS), exist_ok=True)
+    # Escritura atómica: otro proceso nunca ve un archivo a medio escribir
+    temporal = f"{RUTA_ATLAS}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as archivo:
+        np.savez(archivo, **atlas)
+    os.replace(temporal, RUTA_ATLAS)
+    return atlas
+
+def recorrido(semilla, cantidad):
+    """
+    Estados Xi de las filas que produce la semilla, hasta `cantidad`.
+    Solo la cola y un ciclo se recorren paso a paso (a lo sumo 10^4 estados);
+    el resto de la secuencia es el ciclo repetido por indexación.
+    """
+    camino, ciclo = camino_semilla(semilla, cantidad)
+    return estados_en(camino, ciclo, 0, cantidad)
+
+def camino_semilla(semilla, cantidad):
+    """
+    Recorre paso a paso los estados de la semilla hasta completar la cola y un
+    ciclo (o hasta `cantidad`, si es menor).
+
+    Returns:
+        Tupla (camino, ciclo): los estados recorridos y la longitud del ciclo
+        con que continúa la secuencia (0 si termina al final del camino)
+    """
+    atlas = cargar_atlas()
+    prefijo = []
+    x = semilla
+
+    if cantidad <= 0:
+        return np.empty(0, dtype=np.int64), 0
+
+    if not 0 <= x < TAMANO_ATLAS:
+        siguiente = siguiente_estado(x)
+        if siguiente is None:
+            return np.empty(0, dtype=np.int64), 0
+        prefijo = [x]
+        x = siguiente
+
+    primer_estado = x
+    valores = int(atlas["valores"][x])
+    camino = np.empty(len(prefijo) + min(valores, cantidad - len(prefijo)), dtype=np.int64)
+    camino[:len(prefijo)] = prefijo
+    for j in range(len(prefijo), len(camino)):
+        camino[j] = x
+        x = atlas["siguiente"][x]
+
+    if len(camino) >= cantidad or atlas["degenera"][primer_estado]:
+        return camino, 0
+    return camino, int(atlas["ciclo"][primer_estado])
+
+def estados_en(camino, ciclo, inicio, fin):
+    """
+    Estados de las filas inicio..fin-1: las posiciones que pasan del camino
+    se reducen módulo la longitud del ciclo, que ocupa su final.
+    """
+    if ciclo == 0:
+        return camino[inicio:min(fin, len(camino))]
+
+    posiciones = np.arange(inicio, fin)
+    fuera = posiciones >= len(camino)
+    inicio_ciclo = len(camino) - ciclo
+    posiciones[fuera] = inicio_ciclo + (posiciones[fuera] - inicio_ciclo) % ciclo
+    return camino[posiciones]
+
+def semilla_degenerada(semilla):
+    """True si la secuencia de la semilla termina por degeneración (consulta O(1) al atlas)."""
+    atlas = cargar_atlas()
+    if not 0 <= semilla < TAMANO_ATLAS:
+        siguiente = siguiente_estado(semilla)
+        if siguiente is None:
+            return True
+        semilla = siguiente
+    return bool(atlas["degenera"][semilla])
 
 def extraer_numero(valor_c, valor_d):
     c_str = str(valor_c)
@@ -66,28 +260,6 @@ def truncar(n, decimales=0):
     factor = 10.0 ** decimales
     return int(n * factor) / factor
 
-def truncar_decimales_inteligente(numero):
-    """
-    Trunca a máximo 5 decimales, pero elimina ceros innecesarios al final.
-    Ejemplos:
-    - 0.51100 -> 0.511
-    - 0.50000 -> 0.5
-    - 0.12345 -> 0.12345
-    """
-    # Truncar a 5 decimales máximo usando truncamiento, no redondeo
-    factor = 10.0 ** 5
-    truncado = int(numero * factor) / factor
-    
-    # Convertir a string para eliminar ceros trailing
-    resultado_str = f"{truncado:.5f}".rstrip('0').rstrip('.')
-    
-    # Si queda vacío después del punto, agregar un 0
-    if resultado_str.endswith('.'):
-        resultado_str = resultado_str[:-1]
-    
-    # Convertir de vuelta a float
-    return float(resultado_str)
-
 def graficar_serie_temporal(ri_values, metodo="Cuadrados Medios", titulo_adicional=""):
     """
     Genera un gráfico de serie temporal de los valores Ri generados.
@@ -107,11 +279,11 @@ def graficar_serie_temporal(ri_values, metodo="Cuadrados Medios", titulo_adicion
     # Configurar el gráfico
     plt.figure(figsize=(12, 6))
     
-    # Crear índices (1, 2, 3, ...)
-    indices = list(range(1, len(ri_values) + 1))
+    # Crear índices (1, 2, 3, ...); en series largas, una muestra equiespaciada
+    indices, muestra = muestra_serie(ri_values)
     
     # Gráfico de líneas con puntos
-    plt.plot(indices, ri_values, 'b-o', linewidth=1.5, markersize=3, alpha=0.7)
+    plt.plot(indices, muestra, 'b-o', linewidth=1.5, markersize=3, alpha=0.7)
     
     # Personalización
     plt.title(f'Serie Temporal - {metodo}\n{titulo_adicional}', fontsize=14, fontweight='bold')
@@ -123,7 +295,7 @@ def graficar_serie_temporal(ri_values, metodo="Cuadrados Medios", titulo_adicion
     plt.ylim(0, 1)
     
     # Estadísticas básicas en el gráfico
-    mean_val = sum(ri_values) / len(ri_values)
+    mean_val = float(np.mean(ri_values))
     plt.axhline(y=mean_val, color='red', linestyle='--', alpha=0.7, label=f'Media: {mean_val:.4f}')
     plt.axhline(y=0.5, color='green', linestyle='--', alpha=0.5, label='Valor esperado: 0.5')
     
@@ -0,0 +1,288 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from modules.generadores.truncamiento import truncar_decimales_vectorizado
+
+# Cantidad de carriles que se llenan en cada bloque del motor vectorizado.
+# 2^16 valores uint64 (512 KB) caben en caché y amortizan el costo de Python.
+TAMANO_BLOQUE = 1 << 16
+
+MODULO_64 = 1 << 64
+
+# A partir de cuántos valores vale la pena repartir la generación entre procesos
+UMBRAL_PARALELO = 5_000_000
+
+# Procesos del pool de generación, que también es lo que usa procesos_sugeridos para n grande.
+# Por defecto todos los núcleos; con varios workers del servidor en la misma máquina conviene
+# repartirlos con la variable de entorno PROCESOS_GENERACION (p. ej. núcleos / workers)
+PROCESOS_GENERACION = max(int(os.environ.get("PROCESOS_GENERACION") or os.cpu_count() or 1), 1)
+
+# Pool de procesos único y reutilizable entre llamadas (crearlo cuesta más que generar).
+# Nunca se reemplaza, así que ningún hilo puede quedarse con un pool ya cerrado
+_ejecutor = None
+_candado_ejecutor = threading.Lock()
+
+
+def tablas_bloque(a, c, carriles):
+    """
+    Construye las tablas de salto de un bloque para la recurrencia
+    X_{i+1} = (a * X_i + c) mod 2^64.
+
+    Para j = 1..carriles se cumple X_{i+j} = (A[j-1] * X_i + C[j-1]) mod 2^64,
+    es decir A_j = a^j y C_j = c * (a^j - 1) / (a - 1). C_j se arma por
+    duplicación (C_{s+t} = A_t * C_s + C_t) en lugar de dividir entre (a - 1),
+    que no es invertible módulo una potencia de 2.
+
+    Args:
+        a: Multiplicador (entero de Python)
+        c: Incremento (entero de Python)
+        carriles: Tamaño del bloque
+
+    Returns:
+        Tupla (A, C) de arreglos uint64 de longitud `carriles`
+    """
+    a %= MODULO_64
+    c %= MODULO_64
+
+    A = np.empty(carriles + 1, dtype=np.uint64)
+    C = np.empty(carriles + 1, dtype=np.uint64)
+    A[0], C[0] = 1, 0
+
+    # El rango [0, s) ya está lleno; se duplica usando el paso s como ancla
+    s = 1
+    while s <= carriles:
+        A_s = (int(A[s - 1]) * a) % MODULO_64
+        C_s = (int(C[s - 1]) * a + c) % MODULO_64
+        e = min(s, carriles + 1 - s)
+
+        # La aritmética uint64 de NumPy envuelve módulo 2^64 sin avisos en arreglos
+        np.multiply(A[:e], np.uint64(A_s), out=A[s:s + e])
+        np.multiply(A[:e], np.uint64(C_s), out=C[s:s + e])
+        np.add(C[s:s + e], C[:e], out=C[s:s + e])
+        s += e
+
+    return A[1:], C[1:]
+
+
+def coeficientes_salto(a, c, m, pasos):
+    """
+    Coeficientes (A, C) tales que X_{i+pasos} = (A * X_i + C) mod m.
+
+    Se obtienen por exponenciación binaria de la recurrencia afín
+    x -> a*x + c, así que cualquier posición se alcanza en O(log pasos).
+    """
+    A, C = 1, 0
+    base_a, base_c = a % m, c % m
+
+    while pasos > 0:
+        if pasos & 1:
+            A, C = (A * base_a) % m, (A * base_c + C) % m
+        base_a, base_c = (base_a * base_a) % m, (base_a * base_c + base_c) % m
+        pasos >>= 1
+
+    return A, C
+
+
+def saltar(x_inicial, a, c, g, pasos):
+    """Devuelve X_pasos de la recurrencia partiendo de X_0 = x_inicial, sin generar los intermedios."""
+    m = 2 ** g
+    A, C = coeficientes_salto(a, c, m, pasos)
+    return (A * x_inicial + C) % m
+
+
+def secuencia_congruencial(x_inicial, a, c, g, n):
+    """
+    Calcula X_1..X_n de X_{i+1} = (a * X_i + c) mod 2^g con X_0 = x_inicial.
+
+    Para g <= 64 trabaja por bloques de uint64: cada bloque parte de un único
+    ancla (el último valor del bloque anterior) y se llena con una
+    multiplicación, una suma y una máscara vectorizadas. Para g > 64 recurre
+    a enteros de Python, que son exactos pero lentos.
+
+    Returns:
+        Arreglo uint64 (o de objetos si g > 64) con los n valores Xi
+    """
+    m = 2 ** g
+
+    if g > 64:
+        xi = np.empty(n, dtype=object)
+        x = x_inicial % m
+        for i in range(n):
+            x = (a * x + c) % m
+            xi[i] = x
+        return xi
+
+    xi = np.empty(n, dtype=np.uint64)
+    if n == 0:
+        return xi
+
+    carriles = min(n, TAMANO_BLOQUE)
+    A, C = tablas_bloque(a, c, carriles)
+    mascara = np.uint64(m - 1)
+    ancla = np.uint64(x_inicial % m)
+
+    for inicio in range(0, n, carriles):
+        bloque = xi[inicio:inicio + carriles]
+        largo = len(bloque)
+        np.multiply(A[:largo], ancla, out=bloque)
+        np.add(bloque, C[:largo], out=bloque)
+        np.bitwise_and(bloque, mascara, out=bloque)
+        ancla = bloque[-1]
+
+    return xi
+
+
+def xi_a_enteros(xi, g):
+    """
+    Convierte el arreglo de Xi al tipo que se expone en los resultados:
+    int64 cuando cabe (vista sin copia), uint64 para g = 64 y objetos para g > 64.
+    """
+    if xi.dtype == np.uint64 and g < 64:
+        return xi.view(np.int64)
+    return xi
+
+
+def normalizar(xi, divisor):
+    """
+    Divide los Xi entre `divisor` en float64 con el mismo resultado que
+    `x_i / divisor` sobre enteros de Python.
+
+    La división en float64 es exacta cuando el divisor es potencia de 2 o
+    cuando ambos operandos caben en 53 bits; fuera de eso se usa Python.
+    """
+    exacto_en_float = (divisor & (divisor - 1)) == 0 or divisor <= 2 ** 53
+    if xi.dtype == object or not exacto_en_float:
+        return np.array([int(x) / divisor for x in xi], dtype=np.float64)
+    return xi.astype(np.float64) / float(divisor)
+
+
+def procesos_sugeridos(n):
+    """Cantidad de procesos a usar por defecto: PROCESOS_GENERACION para n grande, uno si no."""
+    if n < UMBRAL_PARALELO:
+        return 1
+    return PROCESOS_GENERACION
+
+
+def _obtener_ejecutor():
+    """El pool de PROCESOS_GENERACION procesos, creado la primera vez que se usa."""
+    global _ejecutor
+    with _candado_ejecutor:
+        if _ejecutor is None:
+            # "spawn" evita hacer fork de un servidor con hilos activos
+            _ejecutor = ProcessPoolExecutor(max_workers=PROCESOS_GENERACION,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return _ejecutor
+
+
+def _llenar_tramo(nombre_xi, nombre_ri, n, x_inicial, a, c, g, divisor, inicio, fin):
+    """Trabajo de cada proceso: salta a `inicio` y escribe Xi y Ri de su tramo en la memoria compartida."""
+    memoria_xi = shared_memory.SharedMemory(name=nombre_xi)
+    memoria_ri = shared_memory.SharedMemory(name=nombre_ri)
+    try:
+        xi = np.ndarray((n,), dtype=np.uint64, buffer=memoria_xi.buf)
+        ri = np.ndarray((n,), dtype=np.float64, buffer=memoria_ri.buf)
+
+        x_anterior = saltar(x_inicial, a, c, g, inicio)
+        xi[inicio:fin] = secuencia_congruencial(x_anterior, a, c, g, fin - inicio)
+        ri[inicio:fin] = truncar_decimales_vectorizado(normalizar(xi[inicio:fin], divisor))
+        del xi, ri
+    finally:
+        memoria_xi.close()
+        memoria_ri.close()
+
+
+def columnas_paralelas(x_inicial, a, c, g, n, divisor, procesos):
+    """
+    Genera Xi y Ri repartiendo n en tramos contiguos, uno por proceso.
+
+    Cada proceso salta a su posición de inicio con saltar() y escribe su tramo
+    directamente en dos bloques de memoria compartida, así que el resultado es
+    idéntico al de la generación secuencial y no se serializan los datos.
+    Todas las llamadas comparten un pool: `procesos` es la cantidad de tramos
+    y a lo sumo PROCESOS_GENERACION se generan a la vez.
+
+    Returns:
+        Tupla (xi, ri) de arreglos uint64 y float64
+    """
+    memoria_xi = shared_memory.SharedMemory(create=True, size=max(n, 1) * 8)
+    memoria_ri = shared_memory.SharedMemory(create=True, size=max(n, 1) * 8)
+    try:
+        limites = np.linspace(0, n, procesos + 1).astype(np.int64)
+        ejecutor = _obtener_ejecutor()
+        futuros = [
+            ejecutor.submit(_llenar_tramo, memoria_xi.name, memoria_ri.name, n,
+                            x_inicial, a, c, g, divisor, int(inicio), int(fin))
+            for inicio, fin in zip(limites[:-1], limites[1:]) if fin > inicio
+        ]
+        for futuro in futuros:
+            futuro.result()
+
+        xi = np.ndarray((n,), dtype=np.uint64, buffer=memoria_xi.buf).copy()
+        ri = np.ndarray((n,), dtype=np.float64, buffer=memoria_ri.buf).copy()
+    finally:
+        memoria_xi.close()
+        memoria_ri.close()
+        memoria_xi.unlink()
+        memoria_ri.unlink()
+
+    return xi, ri
+
+
+def columnas_por_bloques(x_inicial, a, c, g, n, divisor, filas_por_bloque, procesos=None):
+    """
+    Xi y Ri de la secuencia en tuplas (inicio, xi, ri) de a lo sumo
+    `filas_por_bloque` filas, con inicio contado desde 0. Entre tramos solo
+    se conserva el último Xi, así que la memoria no crece con n.
+
+    Con procesos > 1 (None elige según n, como generar) cada tramo de
+    `procesos` bloques se reparte con columnas_paralelas; la memoria es la
+    de esos bloques y el resultado es el mismo que el secuencial.
+    """
+    if procesos is None:
+        procesos = procesos_sugeridos(n)
+    if g > 64:
+        procesos = 1  # Los Xi de más de 64 bits no caben en la memoria compartida uint64
+
+    filas_por_tramo = filas_por_bloque * procesos
+    x_anterior = x_inicial
+
+    # Con n = 0 se entrega un único bloque vacío, igual que generar
+    for inicio_tramo in range(0, max(n, 1), filas_por_tramo):
+        cantidad = min(filas_por_tramo, n - inicio_tramo)
+        if procesos > 1:
+            xi, ri = columnas_paralelas(x_anterior, a, c, g, cantidad, divisor, procesos)
+        else:
+            xi = secuencia_congruencial(x_anterior, a, c, g, cantidad)
+            ri = truncar_decimales_vectorizado(normalizar(xi, divisor))
+        if cantidad:
+            x_anterior = int(xi[-1])
+
+        for inicio in range(0, max(cantidad, 1), filas_por_bloque):
+            yield (inicio_tramo + inicio, xi[inicio:inicio + filas_por_bloque],
+                   ri[inicio:inicio + filas_por_bloque])
+
+
+# Benchmark de escalamiento: python -m modules.generadores.motor_congruencial
+if __name__ == "__main__":
+    import time
+
+    n = 40_000_000
+    a, c, g = 1 + 2 * 5, 3, 31
+    maximo = PROCESOS_GENERACION
+
+    procesos = 1
+    base = None
+    while procesos <= maximo:
+        # Arranque de los procesos fuera de la medición
+        list(_obtener_ejecutor().map(int, range(PROCESOS_GENERACION)))
+        inicio = time.perf_counter()
+        columnas_paralelas(17, a, c, g, n, 2 ** g, procesos)
+        duracion = time.perf_counter() - inicio
+        base = base or duracion
+        print(f"procesos={procesos:3d}  {duracion:7.3f} s  {n / duracion / 1e6:8.1f} M valores/s  aceleración x{base / duracion:.2f}")
+        procesos *= 2
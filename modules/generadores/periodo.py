@@ -0,0 +1,153 @@
+from functools import lru_cache
+
+from modules.generadores.minimos_cuadrados import TAMANO_ATLAS, cargar_atlas, siguiente_estado
+
+
+def _valuacion_2(valor, tope):
+    """Exponente de la mayor potencia de 2 que divide a `valor` (tope si valor es 0)."""
+    if valor == 0:
+        return tope
+    return (valor & -valor).bit_length() - 1
+
+
+@lru_cache(maxsize=1024)
+def periodo_lineal(x_o, k, c, g):
+    """
+    Período de la secuencia de congruencia lineal X_{i+1} = (a*X_i + c) mod 2^g
+    con a = 1 + 2k, a partir de la semilla x_o.
+
+    Hull-Dobell: el período es completo (m = 2^g) si y solo si c es impar y
+    a ≡ 1 (mod 4). En otro caso se calcula exacto: X_n = X_0 equivale a
+    S_n * ((a-1)*X_0 + c) ≡ 0 (mod 2^g), con S_n = 1 + a + ... + a^(n-1), y
+    como el período es una potencia de 2 basta duplicar n hasta cumplirlo.
+
+    Returns:
+        Diccionario con el período, si es completo, si cumple Hull-Dobell y
+        cuántos valores distintos se pueden pedir (maximo_valores)
+    """
+    m = 2 ** g
+    a = (1 + 2 * k) % m
+    hull_dobell = c % 2 == 1 and a % 4 == 1
+
+    if hull_dobell:
+        periodo = m
+    else:
+        y = ((a - 1) * x_o + c) % m
+        faltante = g - _valuacion_2(y, g)  # Potencia de 2 que debe aportar S_n
+
+        periodo, suma, potencia = 1, 1, a  # S_1 = 1, a^1
+        while _valuacion_2(suma, g) < faltante:
+            # S_2n = S_n * (1 + a^n)
+            suma = (suma * (1 + potencia)) % m
+            potencia = (potencia * potencia) % m
+            periodo *= 2
+
+    return {
+        "metodo": "lineal",
+        "periodo": periodo,
+        "periodo_completo": periodo == m,
+        "hull_dobell": hull_dobell,
+        "cola": 0,
+        "maximo_valores": periodo
+    }
+
+
+@lru_cache(maxsize=1024)
+def periodo_multiplicativo(x0, t, g):
+    """
+    Período de la secuencia multiplicativa X_{i+1} = (a*X_i) mod 2^g con
+    a = 8t + 3, a partir de la semilla x0.
+
+    Si X_0 = 2^v * impar, X_n = X_0 equivale a a^n ≡ 1 (mod 2^(g-v)), así que
+    el período es el orden de a módulo 2^(g-v). Para a ≡ 3 (mod 8) ese orden
+    es 2^(g-v-2), el máximo posible (m/4 con semilla impar).
+
+    Returns:
+        Diccionario con el período y el período máximo teórico
+    """
+    m = 2 ** g
+    a = (8 * t + 3) % m
+    x0 %= m
+
+    modulo_efectivo = m >> _valuacion_2(x0, g)
+
+    # El orden de un impar módulo 2^h es potencia de 2: se eleva al cuadrado hasta llegar a 1
+    periodo, potencia = 1, a % modulo_efectivo
+    while potencia != 1 % modulo_efectivo:
+        potencia = (potencia * potencia) % modulo_efectivo
+        periodo *= 2
+
+    return {
+        "metodo": "multiplicativo",
+        "periodo": periodo,
+        "periodo_maximo": max(m // 4, 1),
+        "periodo_completo": periodo == max(m // 4, 1),
+        "cola": 0,
+        "maximo_valores": periodo
+    }
+
+
+def _siguiente_cuadrado(x):
+    """Un paso de cuadrados medios (consulta al atlas si x tiene hasta 4 dígitos); None si se degenera."""
+    if 0 <= x < TAMANO_ATLAS:
+        siguiente = int(cargar_atlas()["siguiente"][x])
+        return None if siguiente == -1 else siguiente
+    return siguiente_estado(x)
+
+
+@lru_cache(maxsize=4096)
+def periodo_cuadrados(semilla):
+    """
+    Cola y ciclo de cuadrados medios con el algoritmo de Brent, ya que aquí el
+    período no se puede deducir analíticamente.
+
+    La secuencia también puede degenerarse (no hay dígitos que extraer); en
+    ese caso no hay ciclo y se informa cuántos valores alcanza a producir.
+
+    Returns:
+        Diccionario con cola (mu), período (lambda) y la cantidad máxima de
+        valores distintos que produce la semilla
+    """
+    f = _siguiente_cuadrado
+
+    # PASO 1: Recorrer con Brent buscando una repetición (o la degeneración)
+    potencia = longitud = 1
+    tortuga = semilla
+    liebre = f(semilla)
+    pasos = 1
+    while liebre is not None and tortuga != liebre:
+        if potencia == longitud:
+            tortuga = liebre
+            potencia *= 2
+            longitud = 0
+        liebre = f(liebre)
+        longitud += 1
+        pasos += 1
+
+    if liebre is None:
+        # Se degeneró en el estado `pasos`: solo los anteriores producen un valor
+        return {
+            "metodo": "cuadrados",
+            "periodo": 0,
+            "cola": pasos - 1,
+            "degenerada": True,
+            "maximo_valores": pasos - 1
+        }
+
+    # PASO 2: Ubicar el inicio del ciclo (cola mu) con dos punteros a distancia lambda
+    tortuga = liebre = semilla
+    for _ in range(longitud):
+        liebre = f(liebre)
+    cola = 0
+    while tortuga != liebre:
+        tortuga = f(tortuga)
+        liebre = f(liebre)
+        cola += 1
+
+    return {
+        "metodo": "cuadrados",
+        "periodo": longitud,
+        "cola": cola,
+        "degenerada": False,
+        "maximo_valores": cola + longitud
+    }
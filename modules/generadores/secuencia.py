@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+# Filas por bloque en los generadores por bloques: 2^20 filas de i, Xi y Ri ocupan unos 24 MB
+FILAS_POR_BLOQUE = 1 << 20
+
+# Puntos que se dibujan como máximo en las series temporales
+MAX_PUNTOS_SERIE = 20_000
+
+
+class Secuencia:
+    """
+    Resultado columnar de un generador: un arreglo NumPy por columna
+    (i, Xi, Ri, ...) en el orden en que se muestran.
+
+    Evita tener cada valor a la vez en una lista de diccionarios, en un
+    DataFrame y en una lista de Ri: el DataFrame solo se arma cuando una ruta
+    lo necesita, y solo con las filas que va a mostrar o exportar.
+    """
+
+    __slots__ = ("columnas",)
+
+    def __init__(self, columnas):
+        self.columnas = dict(columnas)
+
+    def __len__(self):
+        if not self.columnas:
+            return 0
+        return len(next(iter(self.columnas.values())))
+
+    def __getitem__(self, nombre):
+        return self.columnas[nombre]
+
+    def __contains__(self, nombre):
+        return nombre in self.columnas
+
+    @property
+    def ri(self):
+        return self.columnas["Ri"]
+
+    @property
+    def nbytes(self):
+        return sum(columna.nbytes for columna in self.columnas.values())
+
+    def bloques(self, filas_por_bloque=FILAS_POR_BLOQUE):
+        """
+        Recorre la secuencia en Secuencias de a lo sumo `filas_por_bloque`
+        filas (vistas de las columnas, sin copiarlas). Si no hay filas entrega
+        un único bloque vacío, como los generadores por bloques.
+        """
+        for inicio in range(0, max(len(self), 1), filas_por_bloque):
+            yield Secuencia({nombre: columna[inicio:inicio + filas_por_bloque]
+                             for nombre, columna in self.columnas.items()})
+
+    def a_dataframe(self, filas=None):
+        """
+        Construye el DataFrame con todas las filas o solo con `filas`
+        (un slice o un arreglo de posiciones).
+        """
+        if filas is None:
+            return pd.DataFrame(self.columnas)
+        return pd.DataFrame({nombre: columna[filas] for nombre, columna in self.columnas.items()})
+
+    def filas_muestra(self, extremos=500, medio=500):
+        """
+        Posiciones a mostrar para conjuntos grandes: las primeras `extremos`,
+        `medio` alrededor de la mitad y las últimas `extremos`, sin repetir.
+        """
+        n = len(self)
+        mitad = n // 2
+        partes = [
+            np.arange(0, min(extremos, n)),
+            np.arange(max(mitad - medio // 2, 0), min(mitad + medio // 2, n)),
+            np.arange(max(n - extremos, 0), n)
+        ]
+        return np.unique(np.concatenate(partes))
+
+
+def muestra_serie(valores, maximo=MAX_PUNTOS_SERIE):
+    """
+    Índices (desde 1) y valores a dibujar en una serie temporal: todos si son
+    a lo sumo `maximo`, o uno cada tanto si no. Con un arreglo mapeado solo se
+    leen del disco las páginas de los valores elegidos.
+    """
+    paso = max(1, -(-len(valores) // maximo))
+    return np.arange(1, len(valores) + 1, paso), np.asarray(valores[::paso])
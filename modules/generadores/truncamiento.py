@@ -0,0 +1,62 @@
+import numpy as np
+
+# Cantidad de decimales que conservan los Ri de todos los generadores
+DECIMALES = 5
+
+
+def truncar_decimales_inteligente(numero):
+    """
+    Trunca a máximo 5 decimales, pero elimina ceros innecesarios al final.
+    Ejemplos:
+    - 0.51100 -> 0.511
+    - 0.50000 -> 0.5
+    - 0.12345 -> 0.12345
+    """
+    # Truncar a 5 decimales máximo usando truncamiento, no redondeo
+    factor = 10.0 ** DECIMALES
+    truncado = int(numero * factor) / factor
+
+    # Convertir a string para eliminar ceros trailing
+    resultado_str = f"{truncado:.5f}".rstrip('0').rstrip('.')
+
+    # Si queda vacío después del punto, agregar un 0
+    if resultado_str.endswith('.'):
+        resultado_str = resultado_str[:-1]
+
+    # Convertir de vuelta a float
+    return float(resultado_str)
+
+
+def truncar_decimales_vectorizado(valores):
+    """
+    Equivalente exacto de truncar_decimales_inteligente sobre un arreglo completo.
+
+    Quitar los ceros finales y volver a float no cambia el valor: el float de
+    "0.511" es el mismo que 51100 / 10^5. Basta entonces con trunc(x * 10^5) / 10^5;
+    sumar 0.0 convierte el -0.0 de np.trunc en 0.0, como hace int().
+    """
+    factor = 10.0 ** DECIMALES
+    return np.trunc(np.asarray(valores, dtype=np.float64) * factor) / factor + 0.0
+
+
+# Verificación de equivalencia con valores aleatorios: python -m modules.generadores.truncamiento
+if __name__ == "__main__":
+    generador = np.random.default_rng()
+    muestras = np.concatenate([
+        generador.random(200_000),                               # Ri típicos en [0, 1)
+        generador.integers(0, 2 ** 31, 200_000) / 2.0 ** 31,     # Xi / m de congruencia
+        generador.integers(0, 10_000, 10_000) / 10_000,          # Extracciones de cuadrados medios
+        generador.uniform(-1e6, 1e6, 100_000),                   # Magnitudes y signos arbitrarios
+        generador.random(100_000) * 1e-5,                        # Valores que truncan a 0
+        [0.0, -0.0, 1.0, 0.99999999, 1e-05, 5e-324, 0.1 + 0.2]
+    ])
+
+    esperado = np.array([truncar_decimales_inteligente(x) for x in muestras])
+    obtenido = truncar_decimales_vectorizado(muestras)
+
+    # Comparación bit a bit (distingue 0.0 de -0.0)
+    diferentes = np.flatnonzero(esperado.view(np.int64) != obtenido.view(np.int64))
+    if len(diferentes):
+        print(f"{len(diferentes)} diferencias, por ejemplo: {muestras[diferentes[:5]]}")
+    else:
+        print(f"Equivalencia verificada en {len(muestras):,} valores")
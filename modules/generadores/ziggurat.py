@@ -0,0 +1,206 @@
+import time
+from functools import lru_cache
+
+import numpy as np
+
+# Parámetros del ziggurat de Marsaglia y Tsang (2000): cantidad de capas, inicio de
+# la cola R y área V de cada capa (densidades sin normalizar)
+ZIGGURAT = {
+    "normal": {"capas": 128, "r": 3.442619855899, "v": 9.91256303526217e-3},
+    "exponencial": {"capas": 256, "r": 7.697117470131487, "v": 3.949659822581572e-3}
+}
+
+# Intentos por lote: acota la memoria sin importar cuántas muestras se pidan
+INTENTOS_POR_LOTE = 1 << 18
+
+# Menor uniforme que se pasa a log (0 daría infinito)
+U_MIN = 1e-300
+
+
+def densidad(distribucion, x):
+    """Densidad sin normalizar: exp(-x²/2) para la normal y exp(-x) para la exponencial."""
+    return np.exp(-0.5 * x * x) if distribucion == "normal" else np.exp(-x)
+
+
+def densidad_inversa(distribucion, y):
+    """El x >= 0 con densidad y."""
+    return np.sqrt(-2 * np.log(y)) if distribucion == "normal" else -np.log(y)
+
+
+@lru_cache(maxsize=None)
+def tabla_ziggurat(distribucion="normal"):
+    """
+    Bordes x[0..N] de las N capas del ziggurat y la densidad en cada borde.
+    La capa i >= 1 es el rectángulo de ancho x[i] entre f(x[i]) y f(x[i+1]);
+    la capa 0 es la base, de ancho V / f(R), que incluye la cola x > R. Todas
+    tienen área V, así que se elige una capa al azar con un solo uniforme.
+    """
+    parametros = ZIGGURAT[distribucion]
+    capas, r, v = parametros["capas"], parametros["r"], parametros["v"]
+
+    x = np.empty(capas + 1)
+    x[0] = v / densidad(distribucion, r)
+    x[1] = r
+    for i in range(1, capas - 1):
+        x[i + 1] = densidad_inversa(distribucion, v / x[i] + densidad(distribucion, x[i]))
+    x[capas] = 0.0
+    return x, densidad(distribucion, x)
+
+
+class FuenteUniformes:
+    """
+    Uniformes que se consumen en orden desde un arreglo de Ri o desde un
+    iterable de bloques (arreglos o Secuencias con columna Ri, como los que
+    entregan generar_por_bloques de congruencia lineal y multiplicativa).
+    `consumidos` cuenta los uniformes entregados.
+    """
+
+    def __init__(self, origen):
+        if isinstance(origen, (np.ndarray, list, tuple)):
+            origen = [origen]
+        self._bloques = iter(origen)
+        self._actual = np.empty(0)
+        self.consumidos = 0
+
+    def tomar(self, cantidad):
+        """Hasta `cantidad` uniformes (menos si el origen se terminó)."""
+        partes = []
+        faltan = cantidad
+        while faltan > 0:
+            if len(self._actual) == 0:
+                bloque = next(self._bloques, None)
+                if bloque is None:
+                    break
+                self._actual = np.asarray(getattr(bloque, "ri", bloque), dtype=np.float64)
+                continue
+            partes.append(self._actual[:faltan])
+            self._actual = self._actual[faltan:]
+            faltan -= len(partes[-1])
+
+        if len(partes) == 1:
+            uniformes = partes[0]
+        else:
+            uniformes = np.concatenate(partes) if partes else np.empty(0)
+        self.consumidos += len(uniformes)
+        return uniformes
+
+
+def _cola(fuente, cantidad, r, distribucion):
+    """
+    Hasta `cantidad` muestras de la cola x > R. Normal: método de Marsaglia
+    (a = -ln(u1)/R, b = -ln(u2), se acepta si 2b > a²) con los carriles
+    rechazados repetidos en lote. Exponencial: R - ln(u), sin rechazos.
+    """
+    if distribucion != "normal":
+        return r - np.log(np.maximum(fuente.tomar(cantidad), U_MIN))
+
+    aceptadas = []
+    faltan = cantidad
+    while faltan > 0:
+        pedidos = faltan
+        u = np.maximum(fuente.tomar(2 * pedidos), U_MIN)
+        m = len(u) // 2
+        a = -np.log(u[:m]) / r
+        b = -np.log(u[m:2 * m])
+        aceptadas.append(r + a[2 * b > a * a])
+        faltan -= len(aceptadas[-1])
+        if m < pedidos:
+            break  # Se terminaron los uniformes
+    return np.concatenate(aceptadas) if aceptadas else np.empty(0)
+
+
+def muestras_ziggurat(origen, n=None, distribucion="normal"):
+    """
+    Muestras normales estándar (o exponenciales de media 1) por el método del
+    ziggurat, consumiendo los uniformes de `origen` (arreglo, iterable de
+    bloques o FuenteUniformes). Devuelve (muestras, uniformes consumidos).
+
+    Cada lote de intentos usa dos uniformes por carril: uno elige la capa (y
+    el signo en la normal) y otro la posición. La mayoría cae en el
+    rectángulo interior y se acepta sin calcular la densidad; las cuñas usan
+    un uniforme más y la base va a la cola. Los carriles rechazados se
+    rellenan en el lote siguiente. Con n=None se usan todos los uniformes.
+    """
+    fuente = origen if isinstance(origen, FuenteUniformes) else FuenteUniformes(origen)
+    x, fx = tabla_ziggurat(distribucion)
+    capas = len(x) - 1
+    simetrica = distribucion == "normal"
+    celdas = 2 * capas if simetrica else capas
+
+    lotes = []
+    total = 0
+    while n is None or total < n:
+        # Un poco más de intentos que los que faltan: se rechaza ~1-2 %
+        intentos = INTENTOS_POR_LOTE if n is None else min(INTENTOS_POR_LOTE, int((n - total) * 1.03) + 8)
+        u = fuente.tomar(2 * intentos)
+        m = len(u) // 2
+        if m == 0:
+            break
+
+        celda = np.minimum((u[:m] * celdas).astype(np.int64), celdas - 1)
+        capa = celda >> 1 if simetrica else celda
+        valores = u[m:2 * m] * x[capa]
+
+        # Rectángulo interior de la capa: siempre bajo la curva
+        acepta = valores < x[capa + 1]
+
+        # Cuñas (capas >= 1): y uniforme entre f(x[i]) y f(x[i+1]), se acepta si y < f(valor)
+        cunas = np.flatnonzero(~acepta & (capa > 0))
+        if len(cunas):
+            u_cunas = fuente.tomar(len(cunas))
+            cunas = cunas[:len(u_cunas)]
+            capa_cuna = capa[cunas]
+            y = fx[capa_cuna] + u_cunas * (fx[capa_cuna + 1] - fx[capa_cuna])
+            acepta[cunas] = y < densidad(distribucion, valores[cunas])
+
+        # Base fuera del rectángulo interior: una muestra de la cola
+        colas = np.flatnonzero(~acepta & (capa == 0))
+        if len(colas):
+            muestras_cola = _cola(fuente, len(colas), x[1], distribucion)
+            colas = colas[:len(muestras_cola)]
+            valores[colas] = muestras_cola
+            acepta[colas] = True
+
+        if simetrica:
+            valores[celda & 1 == 1] *= -1
+        lotes.append(valores[acepta])
+        total += len(lotes[-1])
+
+        if m < intentos:
+            break  # Se terminaron los uniformes
+
+    muestras = np.concatenate(lotes) if lotes else np.empty(0)
+    return (muestras if n is None else muestras[:n]), fuente.consumidos
+
+
+if __name__ == "__main__":
+    # Muestras, velocidad y uniformes consumidos por salida con uniformes de los
+    # generadores del proyecto, comparadas con la normal y la exponencial por KS
+    from scipy.special import ndtri
+    from scipy.stats import kstest
+    from modules.generadores.congruencia_lineal import generar_por_bloques as generar_cl_por_bloques
+    from modules.generadores.congruencia_multi import generar_por_bloques as generar_cm_por_bloques
+
+    n = 2_000_000
+    # Los Ri se generan antes de medir, para que el tiempo sea solo el del ziggurat
+    origenes = {
+        "lineal": np.concatenate([bloque.ri for bloque in generar_cl_por_bloques(17, 5, 3, 40, 3 * n)]),
+        "multiplicativo": np.concatenate([bloque.ri for bloque in generar_cm_por_bloques(17, 5, 40, 3 * n)]),
+        "numpy": np.random.default_rng().random(3 * n)
+    }
+
+    print(f"{'uniformes':<16}{'distribución':<14}{'Mmuestras/s':>12}{'U por salida':>14}{'KS D':>10}")
+    for nombre, uniformes in origenes.items():
+        for distribucion, referencia in (("normal", "norm"), ("exponencial", "expon")):
+            inicio = time.perf_counter()
+            muestras, consumidos = muestras_ziggurat(uniformes, n, distribucion)
+            segundos = time.perf_counter() - inicio
+            d = kstest(muestras, referencia).statistic
+            print(f"{nombre:<16}{distribucion:<14}{len(muestras) / segundos / 1e6:>12.1f}"
+                  f"{consumidos / len(muestras):>14.3f}{d:>10.5f}")
+
+    # Referencia: inversa exacta, un uniforme por salida
+    uniformes = np.clip(np.random.default_rng().random(n), 1e-10, 1 - 1e-10)
+    inicio = time.perf_counter()
+    ndtri(uniformes)
+    print(f"{'numpy':<16}{'ndtri':<14}{n / (time.perf_counter() - inicio) / 1e6:>12.1f}{1:>14.3f}")
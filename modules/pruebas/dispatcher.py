@@ -1,10 +1,19 @@
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
 # Importa las diferentes funciones de pruebas estadísticas desde sus módulos
 from modules.pruebas.prueba_de_medias import prueba_de_medias
 from modules.pruebas.prueba_de_varianza import prueba_de_varianza
 from modules.pruebas.prueba_chi2_2 import prueba_chi_cuadrado
 from modules.pruebas.ks import kolmogorov_smirnov_test
 from modules.pruebas.poker import poker_test_json
-from modules.pruebas.rachas import prueba_rachas
+from modules.pruebas.rachas import prueba_rachas, prueba_rachas_arriba_abajo, prueba_longitud_rachas
+from modules.pruebas.estadisticas import Estadisticas
+from modules.pruebas.resultados import Resultado
 ##from modules.pruebas.prueba_rachas import prueba_rachas  # Línea duplicada comentada
 
 # Diccionario que mapea nombres cortos con las funciones de prueba
@@ -15,10 +24,16 @@ PRUEBAS_DISPONIBLES = {
     "chi": prueba_chi_cuadrado,      # Prueba chi-cuadrado
     "kolmogorov": kolmogorov_smirnov_test,  # Test Kolmogorov-Smirnov
     "poker": poker_test_json,        # Test de poker
-    "rachas": prueba_rachas          # Prueba de rachas
+    "rachas": prueba_rachas,         # Prueba de rachas
+    "arriba_abajo": prueba_rachas_arriba_abajo,  # Rachas ascendentes y descendentes
+    "longitud_rachas": prueba_longitud_rachas    # Longitud de rachas ascendentes y descendentes
 }
 
-def ejecutar_pruebas(datos, pruebas, alpha):
+# Pruebas que se ejecutan a la vez por defecto. Se usan hilos y no procesos para
+# compartir los datos sin copiarlos; el trabajo pesado de NumPy libera el GIL
+HILOS_PRUEBAS = os.cpu_count() or 1
+
+def ejecutar_pruebas(datos, pruebas, alpha, hilos=None):
     """
     Ejecuta múltiples pruebas estadísticas según la configuración proporcionada
     
@@ -26,34 +41,76 @@ def ejecutar_pruebas(datos, pruebas, alpha):
     - datos: los números a analizar
     - pruebas: diccionario con configuración de qué pruebas ejecutar
     - alpha: nivel de significancia (ej: 0.05)
+    - hilos: cuántas pruebas corren a la vez (None = HILOS_PRUEBAS, 1 = una tras otra)
     """
-    resultados = {}
+    # Arma la lista de pruebas a ejecutar con sus argumentos
+    tareas = []
     
     # Itera sobre cada prueba solicitada
     for nombre, info in pruebas.items():
         
         # Casos especiales: Kolmogorov y Chi-cuadrado necesitan parámetro 'k'
         if nombre == "kolmogorov" and info != False and nombre in PRUEBAS_DISPONIBLES:
-            # Extrae el parámetro 'k' de la configuración y ejecuta la prueba
-            resultados[nombre] = PRUEBAS_DISPONIBLES[nombre](datos, k=info.get("k"), alpha=alpha)
+            # Extrae el parámetro 'k' de la configuración ('tabla': false omite la tabla por intervalos)
+            tareas.append((nombre, {"k": info.get("k"), "alpha": alpha, "tabla": info.get("tabla", True)}))
             
         elif nombre == "chi" and info != False and nombre in PRUEBAS_DISPONIBLES:
             # Mismo proceso para chi-cuadrado
-            resultados[nombre] = PRUEBAS_DISPONIBLES[nombre](datos, k=info.get("k"), alpha=alpha)
+            tareas.append((nombre, {"k": info.get("k"), "alpha": alpha}))
+            
+        elif nombre == "poker" and isinstance(info, dict) and nombre in PRUEBAS_DISPONIBLES:
+            # Poker acepta {"d": 3, 4 o 5} para elegir los dígitos por mano (True = 5)
+            tareas.append((nombre, {"alpha": alpha, "d": info.get("d", 5)}))
             
         # Caso general: otras pruebas que solo necesitan datos y alpha
         elif info and nombre in PRUEBAS_DISPONIBLES:
-            resultados[nombre] = PRUEBAS_DISPONIBLES[nombre](datos, alpha=alpha)
+            tareas.append((nombre, {"alpha": alpha}))
+    
+    # Los datos se convierten una sola vez y cada estadístico (suma, vista ordenada,
+    # rachas, ...) se calcula la primera vez que una prueba lo pide y se comparte
+    datos = Estadisticas.de(datos)
+    
+    hilos = HILOS_PRUEBAS if hilos is None else hilos
+    if hilos <= 1 or len(tareas) <= 1:
+        return {nombre: PRUEBAS_DISPONIBLES[nombre](datos, **argumentos) for nombre, argumentos in tareas}
     
-    return resultados
+    # Las pruebas corren en hilos que comparten `datos` sin copiarlo; el diccionario
+    # de resultados conserva el orden en que se pidieron
+    with ThreadPoolExecutor(max_workers=min(hilos, len(tareas))) as ejecutor:
+        futuros = [(nombre, ejecutor.submit(PRUEBAS_DISPONIBLES[nombre], datos, **argumentos))
+                   for nombre, argumentos in tareas]
+        return {nombre: futuro.result() for nombre, futuro in futuros}
+
+def clave_resultados(datos, pruebas, alpha):
+    """
+    Clave de caché de una batería de pruebas: huella blake2b de los datos
+    (como float64) junto con las pruebas seleccionadas, sus k y alpha. Los
+    mismos números dan la misma clave sin importar de qué generador o
+    petición vengan; cualquier cambio en los datos cambia la huella.
+    """
+    datos = np.ascontiguousarray(datos, dtype=np.float64)
+    huella = hashlib.blake2b(datos.data, digest_size=16).hexdigest()
+    return huella, len(datos), json.dumps(pruebas, sort_keys=True), float(alpha)
+
+def resultados_a_dict(resultados):
+    """
+    Resultados de ejecutar_pruebas como diccionarios, para responder con
+    jsonify o guardarlos en la sesión. Los que ya son diccionarios (leídos de
+    la sesión) o mensajes de error se dejan igual.
+    """
+    return {nombre: resultado.a_dict() if isinstance(resultado, Resultado) else resultado
+            for nombre, resultado in resultados.items()}
 
 """
 FUNCIONAMIENTO:
 1. Define un catálogo de pruebas estadísticas disponibles
 2. La función principal recibe datos y configuración de pruebas
 3. Para cada prueba activa, verifica si necesita parámetros especiales
-4. Ejecuta la prueba correspondiente y guarda el resultado
-5. Retorna un diccionario con todos los resultados
+   (todas reciben las mismas Estadisticas de los datos)
+4. Ejecuta las pruebas (en paralelo en un pool de hilos si hilos > 1)
+5. Retorna un diccionario con todos los resultados, en el orden solicitado
+   (un objeto de modules/pruebas/resultados.py por prueba; resultados_a_dict
+   los convierte para la respuesta HTTP)
 
 EJEMPLO DE USO:
 datos = [0.1, 0.2, 0.3, ...]
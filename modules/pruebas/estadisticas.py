@@ -0,0 +1,237 @@
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+# Elementos por bloque en la pasada de momentos: 512 KiB de float64, para que
+# el bloque siga en caché al recorrerlo por segunda vez (desvíos respecto a su media)
+ELEMENTOS_POR_BLOQUE = 1 << 16
+
+# Manos de la prueba de poker según cuántos decimales (d) se toman de cada número:
+# letra de la categoría -> multiplicidades de sus dígitos, en el orden en que se muestran
+MANOS_POKER = {
+    3: {"D": (1, 1, 1), "O": (2, 1), "K": (3,)},
+    4: {"D": (1, 1, 1, 1), "O": (2, 1, 1), "T": (2, 2), "K": (3, 1), "P": (4,)},
+    5: {"D": (1, 1, 1, 1, 1), "O": (2, 1, 1, 1), "T": (2, 2, 1), "K": (3, 1, 1),
+        "F": (3, 2), "P": (4, 1), "Q": (5,)}
+}
+
+
+@lru_cache(maxsize=None)
+def tabla_poker(d):
+    """
+    Categoría (índice en MANOS_POKER[d]) de cada entero de 0 a 10^d - 1
+    leído como d dígitos con ceros a la izquierda. Se arma una sola vez por d.
+    """
+    escala = 10 ** d
+    enteros = np.arange(escala)
+
+    # Cuántas veces aparece cada dígito (0-9) en cada número
+    conteos = np.zeros((escala, 10), dtype=np.int8)
+    for j in range(d):
+        conteos[enteros, (enteros // 10 ** j) % 10] += 1
+
+    # Multiplicidades ordenadas de mayor a menor, codificadas en base d + 1
+    multiplicidades = -np.sort(-conteos, axis=1)[:, :d].astype(np.int64)
+    codigos = multiplicidades @ (d + 1) ** np.arange(d - 1, -1, -1)
+
+    tabla = np.empty(escala, dtype=np.int8)
+    for indice, multiplicidad in enumerate(MANOS_POKER[d].values()):
+        codigo = sum(m * (d + 1) ** (d - 1 - i) for i, m in enumerate(multiplicidad))
+        tabla[codigos == codigo] = indice
+    return tabla
+
+
+def manos_poker(datos, d=5):
+    """
+    Cantidad de números de cada categoría de poker (en el orden de
+    MANOS_POKER[d]) según sus primeros d decimales, floor(x * 10^d) mod 10^d.
+
+    El pequeño margen antes del floor corrige los productos que quedan un ulp
+    por debajo del entero (0.29 * 10^5 = 28999.999...), así los dígitos son
+    los del número decimal escrito.
+    """
+    escala = 10 ** d
+    enteros = np.floor(np.asarray(datos, dtype=np.float64) * escala + 1e-9).astype(np.int64) % escala
+    return np.bincount(tabla_poker(d)[enteros], minlength=len(MANOS_POKER[d]))
+
+
+class Estadisticas:
+    """
+    Estadísticos suficientes de un conjunto de datos, compartidos por todas
+    las pruebas de uniformidad e independencia.
+
+    Los datos se convierten a un arreglo float64 una sola vez y cada
+    estadístico se calcula la primera vez que una prueba lo pide y se
+    reutiliza en las demás. Suma, media y varianza salen de una misma pasada
+    por bloques (momentos); la vista ordenada (mínimo, máximo, mediana,
+    conteos por intervalo y D de KS), las rachas y los patrones de poker son
+    recorridos propios, cada uno hecho una sola vez por conjunto de datos y
+    no una vez por prueba.
+
+    Es seguro usarlo desde varios hilos (ejecutar_pruebas con hilos > 1):
+    cada estadístico tiene su candado y se calcula una sola vez.
+    """
+
+    # Si se guardan los datos (y con ellos la vista ordenada, la mediana y D sobre todos los puntos)
+    tiene_datos = True
+
+    def __init__(self, datos):
+        self.datos = np.asarray(datos, dtype=np.float64)
+        self.n = len(self.datos)
+        self._valores = {}
+        self._candados = {}
+        self._candado = threading.Lock()
+
+    @classmethod
+    def de(cls, datos):
+        """Devuelve `datos` si ya son Estadisticas; si no, las construye."""
+        return datos if isinstance(datos, cls) else cls(datos)
+
+    def _calcular(self, clave, calcular):
+        """Valor de `clave`, calculado con calcular() solo la primera vez."""
+        if clave in self._valores:
+            return self._valores[clave]
+        with self._candado:
+            candado = self._candados.setdefault(clave, threading.Lock())
+        with candado:
+            if clave not in self._valores:
+                self._valores[clave] = calcular()
+        return self._valores[clave]
+
+    def momentos(self):
+        """
+        Tupla (suma, M2) en una sola pasada, donde M2 es la suma de cuadrados de
+        las desviaciones respecto a la media. Cada bloque (que cabe en caché) da
+        su suma y su M2 y se combinan con la fórmula de Chan, así que la
+        varianza no pierde precisión como con suma_cuadrados - suma²/n.
+        """
+        def calcular():
+            sumas = []
+            n = media = m2 = 0.0
+            for inicio in range(0, self.n, ELEMENTOS_POR_BLOQUE):
+                bloque = self.datos[inicio:inicio + ELEMENTOS_POR_BLOQUE]
+                suma_bloque = np.add.reduce(bloque)
+                media_bloque = suma_bloque / len(bloque)
+                desvios = bloque - media_bloque
+                m2_bloque = np.dot(desvios, desvios)
+
+                total = n + len(bloque)
+                delta = media_bloque - media
+                media += delta * len(bloque) / total
+                m2 += m2_bloque + delta * delta * n * len(bloque) / total
+                n = total
+                sumas.append(suma_bloque)
+            return float(np.add.reduce(np.array(sumas))) if sumas else 0.0, float(m2)
+
+        return self._calcular("momentos", calcular)
+
+    @property
+    def suma(self):
+        return self.momentos()[0]
+
+    @property
+    def suma_cuadrados(self):
+        suma, m2 = self.momentos()
+        return m2 + suma * suma / self.n
+
+    @property
+    def media(self):
+        return self.suma / self.n
+
+    @property
+    def varianza(self):
+        """Varianza muestral insesgada (denominador n - 1), de los mismos momentos que la media."""
+        return self.momentos()[1] / (self.n - 1) if self.n > 1 else float("nan")
+
+    @property
+    def ordenados(self):
+        """Copia ordenada de los datos, compartida por las pruebas que cuentan por intervalos."""
+        return self._calcular("ordenados", lambda: np.sort(self.datos))
+
+    @property
+    def minimo(self):
+        return self.ordenados[0]
+
+    @property
+    def maximo(self):
+        return self.ordenados[-1]
+
+    @property
+    def mediana(self):
+        ordenados = self.ordenados
+        mitad = self.n // 2
+        if self.n % 2:
+            return ordenados[mitad]
+        return (ordenados[mitad - 1] + ordenados[mitad]) / 2
+
+    def d_kolmogorov(self, minimo=0.0, maximo=1.0):
+        """
+        Estadístico D = sup |F_n(x) - F(x)| de Kolmogorov-Smirnov contra la
+        uniforme en [minimo, maximo], evaluado en todos los datos: en el dato
+        i-ésimo (ordenado) la ECDF salta de (i-1)/n a i/n.
+        """
+        def calcular():
+            cdf = np.clip((self.ordenados - minimo) / (maximo - minimo), 0.0, 1.0)
+            i = np.arange(1, self.n + 1, dtype=np.float64)
+            d_mas = np.max(i / self.n - cdf)
+            d_menos = np.max(cdf - (i - 1) / self.n)
+            return float(max(d_mas, d_menos))
+
+        return self._calcular(("d_kolmogorov", minimo, maximo), calcular)
+
+    def hasta(self, limites, incluir_limite=True):
+        """
+        Cantidad de datos <= cada límite (o < si incluir_limite es False),
+        con búsqueda binaria sobre la vista ordenada.
+        """
+        lado = "right" if incluir_limite else "left"
+        return np.searchsorted(self.ordenados, limites, side=lado)
+
+    def histograma(self, bordes):
+        """
+        Frecuencias en los intervalos [b0, b1), [b1, b2), ..., [bk-1, bk],
+        iguales a las de np.histogram(datos, bins=bordes).
+        """
+        bordes = np.asarray(bordes)
+        acumuladas = np.concatenate((self.hasta(bordes[:-1], incluir_limite=False),
+                                     self.hasta(bordes[-1:])))
+        return np.diff(acumuladas)
+
+    def rachas(self, umbral):
+        """
+        Tupla (datos >= umbral, datos < umbral, rachas), donde una racha es
+        una serie de datos consecutivos del mismo lado del umbral.
+        """
+        def contar():
+            arriba = self.datos >= umbral
+            n_arriba = int(np.count_nonzero(arriba))
+            cambios = int(np.count_nonzero(arriba[1:] != arriba[:-1]))
+            return n_arriba, self.n - n_arriba, 1 + cambios
+
+        return self._calcular(("rachas", umbral), contar)
+
+    def rachas_arriba_abajo(self):
+        """
+        Tupla (m, longitudes) de las rachas ascendentes y descendentes: m es la
+        cantidad de diferencias no nulas entre datos consecutivos (los empates
+        se descartan) y longitudes[k] cuántas rachas tienen largo k.
+        """
+        def contar():
+            diferencias = np.diff(self.datos)
+            sube = diferencias[diferencias != 0] > 0
+            m = len(sube)
+            if m == 0:
+                return 0, np.zeros(1, dtype=np.int64)
+            # Una racha termina donde cambia el signo de la diferencia
+            bordes = np.concatenate(([-1], np.flatnonzero(sube[1:] != sube[:-1]), [m - 1]))
+            return m, np.bincount(np.diff(bordes))
+
+        return self._calcular("rachas_arriba_abajo", contar)
+
+    def patrones_poker(self, d=5):
+        """Cantidad de datos de cada categoría de poker según sus primeros d decimales."""
+        def contar():
+            return dict(zip(MANOS_POKER[d], manos_poker(self.datos, d).tolist()))
+
+        return self._calcular(("patrones_poker", d), contar)
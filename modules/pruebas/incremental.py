@@ -0,0 +1,250 @@
+import numpy as np
+
+from modules.pruebas.estadisticas import Estadisticas, MANOS_POKER, manos_poker
+from modules.pruebas.ks import intervalos_ks
+from modules.pruebas.prueba_chi2_2 import bordes_chi
+
+# En modo incremental los intervalos de chi-cuadrado y KS se fijan en el rango
+# teórico de Ri: con el mínimo y máximo de los datos cambiarían en cada lote
+# y habría que volver a contar todos los números anteriores
+RANGO_INCREMENTAL = (0.0, 1.0)
+
+# Umbral de la prueba de rachas (su mediana teórica por defecto)
+UMBRAL_RACHAS = 0.5
+
+# Estado guardado por sesión en el almacén de pruebas incrementales
+ESTADO_INCREMENTAL = {"estadisticas": None}
+
+
+class EstadisticasIncrementales(Estadisticas):
+    """
+    Las mismas Estadisticas que reciben las pruebas, pero acumuladas lote a
+    lote: agregar() cuesta lo proporcional al tamaño del lote, no al total.
+
+    - Media y varianza: actualización de Welford (combinando el lote completo)
+    - Chi-cuadrado y KS: contadores sobre límites fijos en RANGO_INCREMENTAL
+    - Rachas: totales por encima/debajo del umbral, cambios y el último signo
+    - Rachas ascendentes y descendentes: longitudes de las rachas cerradas, el
+      largo y el sentido de la racha abierta y el último dato
+    - Poker: cantidad de números de cada categoría, por cada tamaño de mano usado
+
+    No guarda los números, así que la mediana muestral no está disponible
+    (es None). Todo el estado es serializable con a_dict() / desde_dict().
+    """
+
+    tiene_datos = False
+
+    def __init__(self):
+        self.datos = None
+        self.n = 0
+        self._media = 0.0
+        self._m2 = 0.0  # Suma de cuadrados de las desviaciones respecto a la media
+        self._conteos = {}  # (límites, incluir_limite) -> cantidad de datos hasta cada límite
+        self._rachas = {UMBRAL_RACHAS: [0, 0, None]}  # umbral -> [arriba, cambios, último signo]
+        self._poker = {5: [0] * len(MANOS_POKER[5])}  # dígitos por mano -> cantidad por categoría
+        # Rachas ascendentes/descendentes: diferencias no nulas, longitudes de las rachas cerradas,
+        # largo y sentido (sube o no) de la racha abierta y último dato recibido
+        self._arriba_abajo = {"m": 0, "longitudes": [0], "largo": 0, "sube": None, "ultimo": None}
+
+    # --- Interfaz de Estadisticas -------------------------------------------
+
+    def momentos(self):
+        return self.suma, self._m2
+
+    @property
+    def suma(self):
+        return self._media * self.n
+
+    @property
+    def media(self):
+        return self._media
+
+    @property
+    def varianza(self):
+        """Varianza muestral insesgada (denominador n - 1)."""
+        return self._m2 / (self.n - 1) if self.n > 1 else float("nan")
+
+    @property
+    def minimo(self):
+        return RANGO_INCREMENTAL[0]
+
+    @property
+    def maximo(self):
+        return RANGO_INCREMENTAL[1]
+
+    @property
+    def mediana(self):
+        return None
+
+    @property
+    def ordenados(self):
+        raise ValueError("Las estadísticas incrementales no guardan los datos ordenados")
+
+    def d_kolmogorov(self, minimo=0.0, maximo=1.0):
+        raise ValueError("D sobre todos los datos necesita los datos ordenados")
+
+    def hasta(self, limites, incluir_limite=True):
+        clave = (tuple(float(limite) for limite in limites), incluir_limite)
+        if clave not in self._conteos:
+            raise ValueError("Límites no registrados en las estadísticas incrementales")
+        return np.array(self._conteos[clave], dtype=np.int64)
+
+    def rachas(self, umbral):
+        if umbral not in self._rachas:
+            raise ValueError(f"Umbral de rachas no registrado: {umbral}")
+        arriba, cambios, _ = self._rachas[umbral]
+        return arriba, self.n - arriba, 1 + cambios
+
+    def rachas_arriba_abajo(self):
+        estado = self._arriba_abajo
+        longitudes = np.array(estado["longitudes"], dtype=np.int64)
+        if estado["largo"]:
+            # La racha abierta cuenta como terminada en el último dato
+            longitudes = np.pad(longitudes, (0, max(estado["largo"] + 1 - len(longitudes), 0)))
+            longitudes[estado["largo"]] += 1
+        return estado["m"], longitudes
+
+    def patrones_poker(self, d=5):
+        if d not in self._poker:
+            raise ValueError(f"Manos de poker de {d} dígitos no registradas")
+        return dict(zip(MANOS_POKER[d], self._poker[d]))
+
+    # --- Actualización ------------------------------------------------------
+
+    def registrar(self, limites, incluir_limite=True, datos_previos=None):
+        """
+        Empieza a contar los datos <= cada límite (o < si incluir_limite es
+        False). Si ya hay datos, `datos_previos()` debe devolverlos para contarlos
+        una vez; los lotes siguientes solo cuentan sus propios números.
+        """
+        clave = (tuple(float(limite) for limite in limites), incluir_limite)
+        if clave in self._conteos:
+            return
+        conteos = np.zeros(len(clave[0]), dtype=np.int64)
+        if self.n:
+            if datos_previos is None:
+                raise ValueError("Hacen falta los datos anteriores para registrar nuevos límites")
+            conteos += self._contar(np.sort(datos_previos()), clave)
+        self._conteos[clave] = conteos.tolist()
+
+    def registrar_histograma(self, bordes, datos_previos=None):
+        """Registra los contadores que usa histograma(bordes)."""
+        bordes = np.asarray(bordes)
+        self.registrar(bordes[:-1], False, datos_previos)
+        self.registrar(bordes[-1:], True, datos_previos)
+
+    def registrar_poker(self, d, datos_previos=None):
+        """Empieza a contar las manos de poker de d dígitos (con los datos anteriores, si los hay)."""
+        if d in self._poker:
+            return
+        conteos = [0] * len(MANOS_POKER[d])
+        if self.n:
+            if datos_previos is None:
+                raise ValueError("Hacen falta los datos anteriores para registrar otro tamaño de mano")
+            conteos = manos_poker(datos_previos(), d).tolist()
+        self._poker[d] = conteos
+
+    def preparar(self, pruebas, datos_previos=None):
+        """Registra los contadores que necesitan las pruebas seleccionadas (mismo formato que ejecutar_pruebas)."""
+        chi, kolmogorov, poker = pruebas.get("chi"), pruebas.get("kolmogorov"), pruebas.get("poker")
+        if isinstance(poker, dict):
+            self.registrar_poker(poker.get("d", 5), datos_previos)
+        if chi:
+            self.registrar_histograma(bordes_chi(*RANGO_INCREMENTAL, chi.get("k")), datos_previos)
+        if kolmogorov:
+            intervalos = intervalos_ks(*RANGO_INCREMENTAL, kolmogorov.get("k"))
+            self.registrar([fin for _, fin in intervalos], True, datos_previos)
+
+    @staticmethod
+    def _contar(ordenados, clave):
+        limites, incluir_limite = clave
+        return np.searchsorted(ordenados, limites, side="right" if incluir_limite else "left")
+
+    def agregar(self, lote):
+        """Suma un lote de números a todas las estadísticas."""
+        lote = np.asarray(lote, dtype=np.float64)
+        b = len(lote)
+        if b == 0:
+            return
+
+        # Welford por lotes: se combinan media y M2 del lote con las acumuladas
+        media_lote = float(np.mean(lote))
+        m2_lote = float(np.sum((lote - media_lote) ** 2))
+        total = self.n + b
+        delta = media_lote - self._media
+        self._media += delta * b / total
+        self._m2 += m2_lote + delta * delta * self.n * b / total
+
+        ordenados = np.sort(lote)
+        for clave, conteos in self._conteos.items():
+            self._conteos[clave] = (np.array(conteos) + self._contar(ordenados, clave)).tolist()
+
+        for umbral, (arriba, cambios, ultimo) in self._rachas.items():
+            signos = lote >= umbral
+            cambios += int(np.count_nonzero(signos[1:] != signos[:-1]))
+            if ultimo is not None and bool(signos[0]) != ultimo:
+                cambios += 1
+            self._rachas[umbral] = [arriba + int(np.count_nonzero(signos)), cambios, bool(signos[-1])]
+
+        for d, conteos in self._poker.items():
+            self._poker[d] = (np.array(conteos) + manos_poker(lote, d)).tolist()
+
+        self._agregar_arriba_abajo(lote)
+
+        self.n = total
+
+    def _agregar_arriba_abajo(self, lote):
+        estado = self._arriba_abajo
+        valores = lote if estado["ultimo"] is None else np.concatenate(([estado["ultimo"]], lote))
+        estado["ultimo"] = float(lote[-1])
+
+        diferencias = np.diff(valores)
+        sube = diferencias[diferencias != 0] > 0
+        if len(sube) == 0:
+            return
+
+        # Largo de cada racha del lote; la primera continúa la racha abierta si va en el mismo sentido
+        bordes = np.concatenate(([-1], np.flatnonzero(sube[1:] != sube[:-1]), [len(sube) - 1]))
+        largos = np.diff(bordes)
+        if estado["sube"] is not None:
+            if bool(sube[0]) == estado["sube"]:
+                largos[0] += estado["largo"]
+            else:
+                largos = np.concatenate(([estado["largo"]], largos))
+
+        # Todas menos la última quedan cerradas
+        cerradas = np.bincount(largos[:-1], minlength=len(estado["longitudes"]))
+        cerradas[:len(estado["longitudes"])] += estado["longitudes"]
+        estado["longitudes"] = cerradas.tolist()
+        estado["largo"] = int(largos[-1])
+        estado["sube"] = bool(sube[-1])
+        estado["m"] += len(sube)
+
+    # --- Serialización ------------------------------------------------------
+
+    def a_dict(self):
+        return {
+            "n": self.n,
+            "media": self._media,
+            "m2": self._m2,
+            "conteos": [{"limites": list(limites), "incluir_limite": incluir_limite, "conteos": conteos}
+                        for (limites, incluir_limite), conteos in self._conteos.items()],
+            "rachas": [[umbral] + valores for umbral, valores in self._rachas.items()],
+            "poker": [[d, conteos] for d, conteos in self._poker.items()],
+            "arriba_abajo": self._arriba_abajo
+        }
+
+    @classmethod
+    def desde_dict(cls, estado):
+        estadisticas = cls()
+        if not estado:
+            return estadisticas
+        estadisticas.n = estado["n"]
+        estadisticas._media = estado["media"]
+        estadisticas._m2 = estado["m2"]
+        estadisticas._conteos = {(tuple(c["limites"]), c["incluir_limite"]): c["conteos"]
+                                 for c in estado["conteos"]}
+        estadisticas._rachas = {umbral: valores for umbral, *valores in estado["rachas"]}
+        estadisticas._poker = {d: conteos for d, conteos in estado["poker"]}
+        estadisticas._arriba_abajo = estado.get("arriba_abajo", estadisticas._arriba_abajo)
+        return estadisticas
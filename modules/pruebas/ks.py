@@ -1,5 +1,8 @@
-import json
 import numpy as np
+from scipy.stats import kstwo
+
+from modules.pruebas.estadisticas import Estadisticas
+from modules.pruebas.resultados import ResultadoKS
 
 def ks_critical_classic_table(n, alpha):
     """
@@ -30,48 +33,51 @@ def ks_critical_classic_table(n, alpha):
     # El valor crítico final se ajusta por el tamaño de muestra
     return c_alpha / np.sqrt(n)
 
-def kolmogorov_smirnov_test(data, k=10, alpha=0.05):
+# Distribución de referencia de D: la uniforme en [0, 1] que deberían seguir los Ri. La tabla
+# por intervalos, en cambio, divide el rango observado [mínimo, máximo] de los datos
+RANGO_REFERENCIA = (0.0, 1.0)
+
+def intervalos_ks(minimo, maximo, k):
+    """Los k intervalos iguales (inicio, fin) en que la prueba KS divide [minimo, maximo]"""
+    amplitud = (maximo - minimo) / k  # Ancho de cada intervalo
+    return [(minimo + i * amplitud, minimo + (i+1) * amplitud) for i in range(k)]
+
+def kolmogorov_smirnov_test(data, k=10, alpha=0.05, tabla=True):
     """
     Prueba de Kolmogorov-Smirnov para verificar si los datos siguen
     una distribución uniforme (común en pruebas de aleatoriedad)
     
     Parámetros:
-    - data: lista de números a analizar
-    - k: número de intervalos para dividir los datos
+    - data: lista de números a analizar (o sus Estadisticas ya calculadas)
+    - k: número de intervalos de la tabla
     - alpha: nivel de significancia
+    - tabla: si es False no se arma la tabla por intervalos (solo D y p-value)
     """
-    n = len(data)
-    
-    # PASO 1: Ordenar los datos (crucial para el análisis correcto)
-    data_sorted = sorted(data)
+    estadisticas = Estadisticas.de(data)  # Estadísticos compartidos con las demás pruebas
+    n = estadisticas.n
     
-    # PASO 2: Calcular el rango y dividir en k intervalos iguales
-    minimo, maximo = data_sorted[0], data_sorted[-1]
+    # PASO 1-2: Rango de los datos (de su vista ordenada) y k intervalos iguales
+    minimo, maximo = estadisticas.minimo, estadisticas.maximo
     amplitud = (maximo - minimo) / k  # Ancho de cada intervalo
     
     # PASO 3: Obtener valor crítico de las tablas KS
     critical_value = ks_critical_classic_table(n, alpha)
-    print(f"Valor crítico KS para n={n}, alpha={alpha}: {critical_value}")
     
-    # PASO 4: Crear los k intervalos
-    intervalos = [(minimo + i * amplitud, minimo + (i+1) * amplitud) for i in range(k)]
+    # PASO 4: Crear los k intervalos (la tabla es opcional: la decisión usa D sobre todos los datos)
+    intervalos = intervalos_ks(minimo, maximo, k) if tabla else []
     
     # PASO 5: Analizar cada intervalo
     intervalos_data = []
-    frec_acum = 0  # Frecuencia acumulada observada
     max_diferencia = 0
     diferencias = []
     
+    # Datos <= cada límite superior, con búsqueda binaria sobre la vista ordenada. El primer
+    # intervalo incluye ambos límites [ini, fin] y los demás excluyen el inferior (ini, fin]
+    hasta_fin = estadisticas.hasta([fin for _, fin in intervalos]).tolist() if intervalos else []
+    
     for i, (ini, fin) in enumerate(intervalos, start=1):
-        # Contar datos en este intervalo
-        if i == 1:
-            # Primer intervalo incluye ambos límites [ini, fin]
-            frec = sum(ini <= x <= fin for x in data_sorted)
-        else:
-            # Otros intervalos excluyen límite inferior (ini, fin]
-            frec = sum(ini < x <= fin for x in data_sorted)
-        
-        frec_acum += frec
+        frec_acum = hasta_fin[i - 1]  # Frecuencia acumulada observada
+        frec = frec_acum - (hasta_fin[i - 2] if i > 1 else 0)  # Datos en este intervalo
         
         # Probabilidad observada acumulada
         p_obt = frec_acum / n
@@ -100,39 +106,62 @@ def kolmogorov_smirnov_test(data, k=10, alpha=0.05):
             "Dif": dif                        # |Observado - Esperado|
         })
     
-    # PASO 6: Decisión estadística
-    # Si max_diferencia <= critical_value, los datos siguen distribución uniforme
-    pasa_prueba = max_diferencia <= critical_value
+    # PASO 6: Estadístico D sobre todos los datos contra la uniforme en RANGO_REFERENCIA y su p-value.
+    # Las estadísticas incrementales no guardan los datos: ahí D se toma en los bordes de la tabla,
+    # que en ese modo ya es el rango de referencia (RANGO_INCREMENTAL)
+    d_todos_los_datos = estadisticas.tiene_datos
+    if d_todos_los_datos:
+        d = estadisticas.d_kolmogorov(*RANGO_REFERENCIA)
+        rango_d = RANGO_REFERENCIA
+    else:
+        d = max_diferencia
+        rango_d = (minimo, maximo)
+        if not tabla:
+            # Sin tabla no hay diferencias calculadas: D se evalúa igual en los bordes de los intervalos
+            bordes = [fin for _, fin in intervalos_ks(minimo, maximo, k)]
+            d = float(np.max(np.abs(estadisticas.hasta(bordes) / n - np.arange(1, k + 1) / k)))
+    # Distribución exacta de D para n datos (scipy usa la asintótica cuando n es grande)
+    p_value = float(kstwo.sf(d, n))
     
-    # PASO 7: Estructurar resultado como JSON
-    resultado = {
-        "test_name": "Prueba KS",
-        "sample_size": n,
-        "intervals": k,
-        "range": {
-            "minimum": minimo,
-            "maximum": maximo,
-            "amplitude": amplitud,
+    # PASO 7: Decisión estadística
+    # Si D <= critical_value, los datos siguen distribución uniforme
+    pasa_prueba = d <= critical_value
+    
+    # PASO 8: Estructurar resultado
+    return ResultadoKS(
+        test_name="Prueba KS",
+        sample_size=n,
+        intervals=k,
+        range={
+            "minimum": float(minimo),
+            "maximum": float(maximo),
+            "amplitude": float(amplitud),
         },
-        "intervals_data": intervalos_data,  # Detalles de cada intervalo
-        "statistics": {
-            "max_difference": max_diferencia,   # Estadístico KS
-            "critical_value": critical_value    # Valor de la tabla
+        intervals_data=intervalos_data,  # Detalles de cada intervalo
+        statistics={
+            "max_difference": float(max_diferencia),  # Máxima diferencia en los bordes de la tabla
+            "D": float(d),                            # Estadístico KS
+            "D_all_points": d_todos_los_datos,        # False si D solo se evaluó en los bordes
+            # Uniforme contra la que se mide D; puede no coincidir con `range`, que es el de la tabla
+            "D_reference": {"minimum": float(rango_d[0]), "maximum": float(rango_d[1])},
+            "p_value": p_value,
+            "critical_value": float(critical_value)   # Valor de la tabla
         },
-        "decision": "Pasa la prueba de ks." if pasa_prueba else "No pasa la prueba de ks.",
-        "isApproved": str(pasa_prueba)
-    }
-    
-    return json.dumps(resultado, indent=4, ensure_ascii=False)
+        p_value=p_value,
+        decision="Pasa la prueba de ks." if pasa_prueba else "No pasa la prueba de ks.",
+        isApproved=bool(pasa_prueba)
+    )
 
 """
 RESUMEN DEL FUNCIONAMIENTO:
 1. Ordena los datos y los divide en k intervalos iguales
-2. Para cada intervalo, cuenta cuántos datos caen en él
+2. Para cada intervalo, cuenta cuántos datos caen en él (búsqueda binaria)
 3. Compara la distribución observada vs la esperada (uniforme)
-4. Calcula la máxima diferencia entre ambas distribuciones
-5. Si esta diferencia es menor al valor crítico, los datos pasan la prueba
-6. Retorna un JSON con todos los detalles del análisis
+4. Calcula D, la máxima diferencia entre la ECDF y la uniforme en [0, 1] en todos los datos, y su
+   p-value. La tabla usa el rango observado [mínimo, máximo], así que su DMAX puede diferir de D;
+   statistics["D_reference"] indica el rango contra el que se midió D
+5. Si D es menor al valor crítico, los datos pasan la prueba
+6. Retorna un ResultadoKS con todos los detalles del análisis (a_dict() lo convierte para JSON)
 
 PROPÓSITO: Verificar si un conjunto de números sigue una distribución uniforme
 (útil para validar generadores de números aleatorios)
@@ -1,65 +1,53 @@
-import json
+import math
 from collections import Counter
 import scipy.stats as stats
 
-def poker_test_json(datos, alpha=0.05):
+from modules.pruebas.estadisticas import Estadisticas, MANOS_POKER
+from modules.pruebas.resultados import ResultadoPoker
+
+def probabilidades_poker(d=5):
+    """
+    Probabilidad de cada mano de d dígitos (basada en teoría combinatoria):
+    formas de elegir los dígitos distintos de cada grupo (sin importar el orden
+    entre grupos del mismo tamaño) por formas de ubicarlos en las d posiciones,
+    entre las 10^d manos posibles. Para d=5: D=0.3024, O=0.504, T=0.108,
+    K=0.072, F=0.009, P=0.0045, Q=0.0001.
+    """
+    probs = {}
+    for cat, multiplicidades in MANOS_POKER[d].items():
+        digitos = math.perm(10, len(multiplicidades))
+        for grupos_iguales in Counter(multiplicidades).values():
+            digitos //= math.factorial(grupos_iguales)
+        posiciones = math.factorial(d)
+        for m in multiplicidades:
+            posiciones //= math.factorial(m)
+        probs[cat] = digitos * posiciones / 10 ** d
+    return probs
+
+def poker_test_json(datos, alpha=0.05, d=5):
     """
     Test de Poker: verifica aleatoriedad analizando patrones de dígitos
     en números pseudoaleatorios (como patrones de cartas en poker)
     
     Parámetros:
-    - datos: lista de números pseudoaleatorios a analizar
+    - datos: lista de números pseudoaleatorios a analizar (o sus Estadisticas ya calculadas)
     - alpha: nivel de significancia (default: 0.05)
+    - d: dígitos por mano, 3, 4 o 5 (default: 5)
     
-    Retorna: JSON string con los resultados del test
+    Retorna: ResultadoPoker con los resultados del test (a_dict() lo convierte para JSON)
     """
-    n = len(datos)
+    if d not in MANOS_POKER:
+        raise ValueError(f"La prueba de poker admite manos de {sorted(MANOS_POKER)} dígitos")
+    estadisticas = Estadisticas.de(datos)  # Estadísticos compartidos con las demás pruebas
+    n = estadisticas.n
 
-    # Probabilidades teóricas para cada patrón (basadas en teoría combinatoria)
-    probs = {
-        "D": 0.3024,   # Todos diferentes (ej: 12345)
-        "O": 0.504,    # Un par (ej: 11234)
-        "T": 0.108,    # Dos pares (ej: 11223)
-        "K": 0.072,    # Tercia (ej: 11123)
-        "F": 0.009,    # Full - tercia + par (ej: 11122)
-        "P": 0.0045,   # Poker - cuádrupla (ej: 11112)
-        "Q": 0.0001    # Quintilla - todos iguales (ej: 11111)
-    }
+    # Probabilidades teóricas para cada patrón (ej. con d=5: D=12345, O=11234, T=11223,
+    # K=11123, F=11122, P=11112, Q=11111)
+    probs = probabilidades_poker(d)
 
-    def extract_digits(num):
-        """Extrae exactamente 5 dígitos después del punto decimal"""
-        str_num = str(num)
-        if '.' in str_num:
-            decimal_part = str_num.split('.')[1]
-        else:
-            decimal_part = ""
-        
-        # Asegurar exactamente 5 dígitos
-        if len(decimal_part) < 5:
-            decimal_part = decimal_part.ljust(5, '0')
-        else:
-            decimal_part = decimal_part[:5]
-            
-        return list(decimal_part)
-
-    def classify(num):
-        """Clasifica un número según el patrón de sus dígitos"""
-        digits = extract_digits(num)
-        counts = sorted(Counter(digits).values(), reverse=True)
-        
-        if counts == [5]:           return "Q"  # Quintilla
-        elif counts == [4, 1]:      return "P"  # Poker
-        elif counts == [3, 2]:      return "F"  # Full
-        elif counts == [3, 1, 1]:   return "K"  # Tercia
-        elif counts == [2, 2, 1]:   return "T"  # Dos pares
-        elif counts == [2, 1, 1, 1]: return "O"  # Un par
-        else:                       return "D"  # Todos diferentes
-
-    # Clasificar cada número según su patrón
-    observed = {cat: 0 for cat in probs}
-    for num in datos:
-        cat = classify(num)
-        observed[cat] += 1
+    # Clasificar cada número según el patrón de sus primeros d dígitos, con una tabla
+    # de 10^d categorías (se cuenta una sola vez por conjunto de datos)
+    observed = estadisticas.patrones_poker(d)
 
     # Calcular frecuencias esperadas
     expected = {cat: n * p for cat, p in probs.items()}
@@ -74,7 +62,7 @@ def poker_test_json(datos, alpha=0.05):
         "K": "Tercia", "F": "Full House", "P": "Poker", "Q": "Quintilla"
     }
     
-    for cat in ["D", "O", "T", "K", "F", "P", "Q"]:
+    for cat in probs:
         oi = observed[cat]
         prob = probs[cat]
         ei = expected[cat]
@@ -95,23 +83,23 @@ def poker_test_json(datos, alpha=0.05):
     # Obtener valor crítico y p-value
     gl = len(probs) - 1
     chi2_critical = stats.chi2.ppf(1 - alpha, gl)
+    p_value = stats.chi2.sf(suma_chi2, gl)
     pasa_prueba = suma_chi2 <= chi2_critical
 
     # Estructurar resultado
-    result = {
-        "test_name": "Prueba de Poker",
-  
-        "intervals_data": categories_data,
-        "statistics": {
+    return ResultadoPoker(
+        test_name="Prueba de Poker",
+        d=d,
+        intervals_data=categories_data,
+        statistics={
             "Suma_Oi": suma_oi,
             "Chi2_calculado": suma_chi2,
-            "critical_value": chi2_critical 
-        },      
-        "decision": "Pasa la prueba de poker" if pasa_prueba else "No pasa la prueba de poker", 
-        "isApproved": str(pasa_prueba)
-    }
-
-    return json.dumps(result, indent=4, ensure_ascii=False)
+            "critical_value": float(chi2_critical)
+        },
+        p_value=float(p_value),
+        decision="Pasa la prueba de poker" if pasa_prueba else "No pasa la prueba de poker",
+        isApproved=bool(pasa_prueba)
+    )
 
 """
 ¿QUÉ HACE ESTE TEST?
@@ -120,8 +108,8 @@ El test de Poker analiza si los dígitos de números pseudoaleatorios
 aparecen con patrones similares a las manos de poker.
 
 LÓGICA:
-1. Toma los primeros 5 dígitos de cada número
-2. Clasifica cada número según el patrón de repetición de dígitos
+1. Toma los primeros d dígitos de cada número (d = 3, 4 o 5) como el entero floor(x * 10^d)
+2. Clasifica cada número según el patrón de repetición de dígitos (tabla de 10^d entradas + np.bincount)
 3. Compara las frecuencias observadas vs las esperadas teóricamente
 4. Usa chi-cuadrado para determinar si las diferencias son significativas
 
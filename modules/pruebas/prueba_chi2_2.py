@@ -1,28 +1,34 @@
 import numpy as np
 import scipy.stats as stats
-import json
 from scipy.stats import chi2
 
+from modules.pruebas.estadisticas import Estadisticas
+from modules.pruebas.resultados import ResultadoChiCuadrado
+
+def bordes_chi(minimo, maximo, k):
+    """Los k+1 bordes de los k intervalos iguales en que la prueba divide [minimo, maximo]"""
+    return np.linspace(minimo, maximo, k+1)
+
 def prueba_chi_cuadrado(datos, k=8, alpha=0.05):
     """
     Test Chi-cuadrado para verificar si los datos siguen una distribución uniforme
     
     Parámetros:
-    - datos: lista o array de números pseudoaleatorios
+    - datos: lista o array de números pseudoaleatorios (o sus Estadisticas ya calculadas)
     - k: número de intervalos para dividir los datos
     - alpha: nivel de significancia (default: 0.05)
     """
-    n = len(datos)
-    datos = np.array(datos)  # Convierte a array de NumPy para facilitar cálculos
+    estadisticas = Estadisticas.de(datos)  # Estadísticos compartidos con las demás pruebas
+    n = estadisticas.n
 
     # PASO 1: Definir el rango y crear intervalos
-    minimo, maximo = np.min(datos), np.max(datos)
+    minimo, maximo = estadisticas.minimo, estadisticas.maximo
     # Crea k+1 puntos para definir k intervalos iguales
-    intervalos = np.linspace(minimo, maximo, k+1)
+    intervalos = bordes_chi(minimo, maximo, k)
     
     # PASO 2: Contar frecuencias observadas en cada intervalo
-    # np.histogram cuenta cuántos datos caen en cada intervalo
-    frecuencias_obs, _ = np.histogram(datos, bins=intervalos)
+    # Mismo conteo que np.histogram, con búsqueda binaria sobre los datos ya ordenados
+    frecuencias_obs = estadisticas.histograma(intervalos)
     
     # PASO 3: Calcular frecuencia esperada
     # Si los datos son uniformes, cada intervalo debería tener n/k datos
@@ -36,36 +42,20 @@ def prueba_chi_cuadrado(datos, k=8, alpha=0.05):
     chi2_total = np.sum(chi2_vals)
     
     # PASO 6: Obtener valor crítico de la tabla chi-cuadrado
-    # Grados de libertad = k - 1, pero aquí usa 7 (¿debería ser k-1?)
-    chi2_critico = chi2.ppf(1 - alpha, 7)  # POSIBLE ERROR: debería ser k-1
+    # Grados de libertad = k - 1 (los k conteos suman n, así que solo k-1 son libres)
+    grados_libertad = k - 1
+    chi2_critico = chi2.ppf(1 - alpha, grados_libertad)
     
     # PASO 7: Decisión estadística
     # Si chi2_total <= chi2_crítico, los datos siguen distribución uniforme
     pasa_prueba = chi2_total <= chi2_critico
     
-    # PASO 8: Estructurar resultado como JSON
-    resultado = {
-        "test_name": "Prueba Chi-Cuadrado",
-        "intervals": k,
-        "n": n,
-        "range": {
-            "minimum": minimo,
-            "maximum": maximo
-        },
-        "intervals_data": [],  # Se llenará con detalles de cada intervalo
-        "statistics": {
-            "frecuencia_obt_total": int(np.sum(frecuencias_obs)),  # Suma de observados (= n)
-            "frecuencia_esp_total": int(freq_esp * k),             # Suma de esperados (= n)
-            "chi2_total": chi2_total,                              # Estadístico chi-cuadrado
-            "chi2_critico": chi2_critico,                          # Valor crítico de tabla
-        },
-        "decision": "Pasa la prueba chi-cuadrado." if pasa_prueba else "No pasa la prueba chi-cuadrado.",
-        "isApproved": str(pasa_prueba)
-    }
-
-    # PASO 9: Llenar detalles de cada intervalo
+    p_value = chi2.sf(chi2_total, grados_libertad)  # Con los mismos grados de libertad que el valor crítico
+    
+    # PASO 8: Detalles de cada intervalo
+    intervals_data = []
     for i in range(k):
-        resultado["intervals_data"].append({
+        intervals_data.append({
             "no": i+1,                                    # Número del intervalo
             "inicio": float(intervalos[i]),     # Límite inferior
             "fin": float(intervalos[i+1]),      # Límite superior
@@ -74,7 +64,27 @@ def prueba_chi_cuadrado(datos, k=8, alpha=0.05):
             "chi2": float(chi2_vals[i])         # Contribución chi² de este intervalo
         })
 
-    return json.dumps(resultado, ensure_ascii=False, indent=2)
+    # PASO 9: Estructurar resultado
+    return ResultadoChiCuadrado(
+        test_name="Prueba Chi-Cuadrado",
+        intervals=k,
+        n=n,
+        range={
+            "minimum": float(minimo),
+            "maximum": float(maximo)
+        },
+        intervals_data=intervals_data,
+        statistics={
+            "frecuencia_obt_total": int(np.sum(frecuencias_obs)),  # Suma de observados (= n)
+            "frecuencia_esp_total": int(freq_esp * k),             # Suma de esperados (= n)
+            "chi2_total": float(chi2_total),                       # Estadístico chi-cuadrado
+            "chi2_critico": float(chi2_critico),                   # Valor crítico de tabla
+            "grados_libertad": grados_libertad,                    # k - 1
+        },
+        p_value=float(p_value),
+        decision="Pasa la prueba chi-cuadrado." if pasa_prueba else "No pasa la prueba chi-cuadrado.",
+        isApproved=bool(pasa_prueba)
+    )
 
 """
 ¿QUÉ HACE ESTE TEST?
@@ -88,7 +98,7 @@ FUNCIONAMIENTO:
 3. Calcula cuántos datos deberían caer en cada intervalo si fueran uniformes (frecuencia esperada = n/k)
 4. Para cada intervalo, calcula: (Observado - Esperado)² / Esperado
 5. Suma todos estos valores para obtener el estadístico chi-cuadrado
-6. Compara con el valor crítico de la tabla
+6. Compara con el valor crítico de la tabla, con k-1 grados de libertad
 
 EJEMPLO:
 - Si tienes 100 datos y 10 intervalos, cada intervalo debería tener ~10 datos
@@ -96,9 +106,8 @@ EJEMPLO:
 - Si otro tiene 5 datos: chi² = (5-10)²/10 = 2.5
 - Si las diferencias son grandes, chi² total será alto → rechaza uniformidad
 
-¡POSIBLE BUG!: 
-La línea "chi2.ppf(1 - alpha, 7)" usa 7 grados de libertad fijos,
-pero debería usar (k-1) grados de libertad.
+NOTA: Antes se usaban 7 grados de libertad fijos (correcto solo con k=8);
+el valor crítico y el p-value ahora usan k-1.
 
 PROPÓSITO: Verificar si un generador de números aleatorios produce
 una distribución uniforme (todos los valores tienen igual probabilidad).
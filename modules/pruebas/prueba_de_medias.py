@@ -1,7 +1,8 @@
-import numpy as np
 import math
 from scipy.stats import norm
-import json
+
+from modules.pruebas.estadisticas import Estadisticas
+from modules.pruebas.resultados import ResultadoMedias
 
 def prueba_de_medias(datos, alpha=0.05, mu_esperada=0.5):
     """
@@ -9,17 +10,17 @@ def prueba_de_medias(datos, alpha=0.05, mu_esperada=0.5):
     igual a la media esperada de una distribución uniforme (0.5)
     
     Parámetros:
-    - datos: lista de números pseudoaleatorios
+    - datos: lista de números pseudoaleatorios (o sus Estadisticas ya calculadas)
     - alpha: nivel de significancia (default: 0.05)
     - mu_esperada: media esperada para distribución uniforme [0,1] (default: 0.5)
     """
     
     # PASO 1: Preparar los datos
-    datos = np.array(datos).tolist()  # Convierte a lista para serialización JSON
-    n = len(datos)
+    estadisticas = Estadisticas.de(datos)  # Estadísticos compartidos con las demás pruebas
+    n = estadisticas.n
 
     # PASO 2: Calcular estadísticos básicos
-    media_muestra = np.mean(datos)  # Media observada de los datos
+    media_muestra = estadisticas.media  # Media observada de los datos
 
     # PASO 3: Obtener valor crítico Z para test bilateral
     # alpha/2 porque es prueba bilateral (media puede ser mayor O menor)
@@ -44,22 +45,25 @@ def prueba_de_medias(datos, alpha=0.05, mu_esperada=0.5):
         decision = "No pasa la prueba de medias."
         pasa_prueba = False
 
-    # PASO 7: Estructurar resultado
-    resultado = {
-        "test_name": "Prueba de Medias",
-        "n": n,                                    # Tamaño de muestra
-        "alpha": alpha,                            # Nivel de significancia
-        "mu_esperada": mu_esperada,                # Media esperada (0.5)
-        "media_muestra": media_muestra,            # Media observada
-        "z": z,                                    # Valor crítico Z
-        "error": error,                            # Margen de error
-        "limite_inferior": limite_inferior,        # Límite inferior del intervalo
-        "limite_superior": limite_superior,        # Límite superior del intervalo
-        "decision": decision,                      # Texto de la decisión
-        "isApproved": str(pasa_prueba)            # Boolean como string
-    }
+    # PASO 7: p-value bilateral del estadístico Z observado
+    z_observado = (media_muestra - mu_esperada) * math.sqrt(12 * n)
+    p_value = 2 * norm.sf(abs(z_observado))
 
-    return json.dumps(resultado, indent=4)
+    # PASO 8: Estructurar resultado
+    return ResultadoMedias(
+        test_name="Prueba de Medias",
+        n=n,                                    # Tamaño de muestra
+        alpha=alpha,                            # Nivel de significancia
+        mu_esperada=mu_esperada,                # Media esperada (0.5)
+        media_muestra=float(media_muestra),     # Media observada
+        z=float(z),                             # Valor crítico Z
+        error=error,                            # Margen de error
+        limite_inferior=limite_inferior,        # Límite inferior del intervalo
+        limite_superior=limite_superior,        # Límite superior del intervalo
+        p_value=float(p_value),                 # P(|Z| >= |z observado|)
+        decision=decision,                      # Texto de la decisión
+        isApproved=pasa_prueba
+    )
 
 """
 ¿QUÉ HACE ESTE TEST?
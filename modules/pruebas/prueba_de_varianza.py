@@ -1,37 +1,35 @@
-import numpy as np
 import math
-import json
 from scipy import stats
 
+from modules.pruebas.estadisticas import Estadisticas
+from modules.pruebas.resultados import ResultadoVarianza
+
 def prueba_de_varianza(datos, alpha=0.05, mu_esperada=0.5):
     """
     Test de Varianza: verifica si la varianza de los datos es consistente
     con la varianza esperada de una distribución uniforme (1/12 ≈ 0.0833)
     
     Parámetros:
-    - datos: lista de números pseudoaleatorios
+    - datos: lista de números pseudoaleatorios (o sus Estadisticas ya calculadas)
     - alpha: nivel de significancia (default: 0.05)
     - mu_esperada: media esperada (no se usa realmente en el cálculo)
     """
     
     # PASO 1: Preparar datos
-    datos = np.array(datos).tolist()  # Para serialización JSON
+    estadisticas = Estadisticas.de(datos)  # Estadísticos compartidos con las demás pruebas
     
-    # Cálculo manual de la media (podría usar np.mean directamente)
-    sum = 0.0
-    for num in datos:
-        sum += num
-    mu_muestral = sum / len(datos)
+    # Media a partir de la suma ya calculada
+    mu_muestral = estadisticas.media
 
     # Variables auxiliares para el cálculo
     alphaDiv2 = alpha / 2
     alpha_2 = 1 - alphaDiv2  # Nivel de confianza
         
-    n = len(datos)
+    n = estadisticas.n
 
     # PASO 2: Calcular varianza muestral
     # ddof=1 usa denominador (n-1) en lugar de n (varianza insesgada)
-    varianza = np.var(datos, ddof=1) 
+    varianza = estadisticas.varianza
 
     # PASO 3: Obtener valores críticos de Chi-cuadrado
     # Para test bilateral de varianza, se usan dos puntos críticos
@@ -58,26 +56,28 @@ def prueba_de_varianza(datos, alpha=0.05, mu_esperada=0.5):
         decision = "No pasa la prueba de varianza."
         pasa_prueba = False
 
-    # PASO 7: Estructurar resultado
-    resultado = {
-        "test_name": "Prueba de Varianza",
-        "n": n,                              # Tamaño de muestra
-        "alpha": alpha,                      # Nivel de significancia
-        "media_muestral": mu_muestral,       # Media observada (calculada manualmente)
-        "mu_esperada": mu_esperada,          # Media esperada (no se usa en cálculos)
-        "alphaDiv2": alphaDiv2,              # α/2
-        "z": alpha_2,                        # Nivel de confianza (1-α/2)
-        "varianza_muestral": varianza,       # Varianza observada
-        "Xi1": Xi1,                          # Chi² crítico inferior
-        "Xi2": Xi2,                          # Chi² crítico superior
-        "limite_inferior": li,               # Límite inferior para varianza
-        "limite_superior": ls,               # Límite superior para varianza
-        "chi2": chi2,                        # Estadístico Chi² calculado
-        "decision": decision,                # Texto de la decisión
-        "isApproved": str(pasa_prueba)      # Boolean como string
-    }
-
-    return json.dumps(resultado, indent=4)
+    # PASO 7: p-value bilateral del estadístico Chi² con n-1 grados de libertad
+    p_value = min(1.0, 2 * min(stats.chi2.cdf(chi2, n - 1), stats.chi2.sf(chi2, n - 1)))
+
+    # PASO 8: Estructurar resultado
+    return ResultadoVarianza(
+        test_name="Prueba de Varianza",
+        n=n,                                 # Tamaño de muestra
+        alpha=alpha,                         # Nivel de significancia
+        media_muestral=float(mu_muestral),   # Media observada
+        mu_esperada=mu_esperada,             # Media esperada (no se usa en cálculos)
+        alphaDiv2=alphaDiv2,                 # α/2
+        z=alpha_2,                           # Nivel de confianza (1-α/2)
+        varianza_muestral=float(varianza),   # Varianza observada
+        Xi1=float(Xi1),                      # Chi² crítico inferior
+        Xi2=float(Xi2),                      # Chi² crítico superior
+        limite_inferior=float(li),           # Límite inferior para varianza
+        limite_superior=float(ls),           # Límite superior para varianza
+        chi2=float(chi2),                    # Estadístico Chi² calculado
+        p_value=float(p_value),              # Probabilidad de una varianza tan extrema
+        decision=decision,                   # Texto de la decisión
+        isApproved=pasa_prueba
+    )
 
 """
 ¿QUÉ HACE ESTE TEST?
@@ -1,6 +1,9 @@
+import math
 import numpy as np
-from scipy.stats import norm
-import json
+from scipy.stats import norm, chi2
+
+from modules.pruebas.estadisticas import Estadisticas
+from modules.pruebas.resultados import ResultadoRachas, ResultadoRachasArribaAbajo, ResultadoLongitudRachas
 
 def prueba_rachas(muestra, alpha=0.05, mediana_teorica=0.5):
     """
@@ -9,30 +12,26 @@ def prueba_rachas(muestra, alpha=0.05, mediana_teorica=0.5):
     """
     
     # PASO 1: Preparar datos
-    muestra = np.array(muestra)
-    mediana_muestral = np.median(muestra)
-    
-    # PASO 2: Convertir números a signos
-    signos = ['+' if x >= mediana_teorica else '-' for x in muestra]
+    estadisticas = Estadisticas.de(muestra)  # Estadísticos compartidos con las demás pruebas
+    mediana_muestral = estadisticas.mediana if estadisticas.n else None
     
-    # PASO 3: Contar signos
-    n_pos = signos.count('+')
-    n_neg = signos.count('-')
+    # PASO 2-4: Signos ('+' si x >= mediana teórica, '-' si no), sus totales y las rachas
+    n_pos, n_neg, rachas = estadisticas.rachas(mediana_teorica)
     n = n_pos + n_neg
     
-    # PASO 4: Contar rachas
-    rachas = 1
-    for i in range(1, len(signos)):
-        if signos[i] != signos[i-1]:
-            rachas += 1
-    
-    # PASO 5: Estadísticos esperados
-    ur = ((2 * n_pos * n_neg) / n) + 1
-    varianza = (2 * n_pos * n_neg * (2 * n_pos * n_neg - n)) / (n**2 * (n - 1))
+    # PASO 5: Estadísticos esperados (con menos de 2 datos no están definidos)
+    ur = ((2 * n_pos * n_neg) / n) + 1 if n else 0.0
+    varianza = (2 * n_pos * n_neg * (2 * n_pos * n_neg - n)) / (n**2 * (n - 1)) if n > 1 else 0.0
     
     # PASO 6: Calcular Z (controlando varianza=0)
-    if varianza == 0:
-        z = None
+    if n < 2:
+        z, p_value = None, None
+        rango_min, rango_max = None, None
+        rachas = min(rachas, n)  # Sin datos no hay rachas (el conteo parte de 1)
+        decision = "Se necesitan al menos 2 datos. La prueba no aplica."
+        cumple = False
+    elif varianza == 0:
+        z, p_value = None, None
         if rachas == ur:
             decision = "El número de rachas está completamente determinado. La prueba no aplica (compatible con H0)."
             cumple = False
@@ -44,25 +43,172 @@ def prueba_rachas(muestra, alpha=0.05, mediana_teorica=0.5):
         z = (rachas - ur) / np.sqrt(varianza)
         z_crit = norm.ppf(1 - alpha/2)
         rango_min, rango_max = -z_crit, z_crit
-        cumple = rango_min <= z <= rango_max
+        p_value = float(2 * norm.sf(abs(z)))
+        cumple = bool(rango_min <= z <= rango_max)
         decision = "Pasa la prueba de rachas." if cumple else "No pasa la prueba de rachas."
     
     # PASO 7: Resultado
-    result = {
-        "test_name": "Prueba de Rachas",
-        "Mediana_muestral": mediana_muestral,
-        "Mediana_teorica": mediana_teorica,
-        "Total_may": n_pos,
-        "Total_min": n_neg,
-        "Total": n,
-        "Rachas": rachas,
-        "UR": ur,
-        "Varianza": varianza,
-        "Z": None if z is None else float(z),
-        "Rango_min": rango_min,
-        "Rango_max": rango_max,
-        "decision": decision,
-        "isApproved": str(cumple)
-    }
+    return ResultadoRachas(
+        test_name="Prueba de Rachas",
+        Mediana_muestral=None if mediana_muestral is None else float(mediana_muestral),
+        Mediana_teorica=mediana_teorica,
+        Total_may=n_pos,
+        Total_min=n_neg,
+        Total=n,
+        Rachas=rachas,
+        UR=ur,
+        Varianza=varianza,
+        Z=None if z is None else float(z),
+        Rango_min=None if rango_min is None else float(rango_min),
+        Rango_max=None if rango_max is None else float(rango_max),
+        p_value=p_value,
+        decision=decision,
+        isApproved=cumple
+    )
+
+
+def prueba_rachas_arriba_abajo(muestra, alpha=0.05):
+    """
+    Test de Rachas Ascendentes y Descendentes: cuenta las series de datos
+    consecutivos que suben o bajan y compara su cantidad con la esperada
+    para una secuencia independiente. Los empates (diferencia 0) se descartan.
+    """
+    
+    # PASO 1: Rachas por signo de la diferencia entre datos consecutivos (compartidas con la prueba de longitudes)
+    estadisticas = Estadisticas.de(muestra)
+    m, longitudes = estadisticas.rachas_arriba_abajo()
+    rachas = int(longitudes.sum())
+    n = m + 1  # Datos que quedan sin los empates
+    
+    # PASO 2: Estadísticos esperados
+    ur = (2 * n - 1) / 3
+    varianza = (16 * n - 29) / 90
+    
+    # PASO 3: Calcular Z (con menos de 2 datos distintos la prueba no aplica)
+    if m == 0:
+        z, p_value = None, None
+        rango_min, rango_max = None, None
+        decision = "Se necesitan al menos 2 datos consecutivos distintos. La prueba no aplica."
+        cumple = False
+    else:
+        z = (rachas - ur) / np.sqrt(varianza)
+        z_crit = norm.ppf(1 - alpha/2)
+        rango_min, rango_max = -z_crit, z_crit
+        p_value = float(2 * norm.sf(abs(z)))
+        cumple = bool(rango_min <= z <= rango_max)
+        decision = ("Pasa la prueba de rachas ascendentes y descendentes." if cumple
+                    else "No pasa la prueba de rachas ascendentes y descendentes.")
+    
+    # PASO 4: Resultado
+    return ResultadoRachasArribaAbajo(
+        test_name="Prueba de Rachas Ascendentes y Descendentes",
+        Total=n,
+        Empates=max(estadisticas.n - 1 - m, 0),
+        Rachas=rachas,
+        UR=ur,
+        Varianza=varianza,
+        Z=None if z is None else float(z),
+        Rango_min=None if rango_min is None else float(rango_min),
+        Rango_max=None if rango_max is None else float(rango_max),
+        p_value=p_value,
+        decision=decision,
+        isApproved=cumple
+    )
+
+
+def rachas_esperadas(n, k):
+    """
+    Cantidad esperada de rachas ascendentes y descendentes de longitud k en
+    n datos independientes: para k <= n - 2,
+    E[R_k] = 2 [(k² + 3k + 1) n - (k³ + 3k² - k - 4)] / (k + 3)!, y para
+    k = n - 1, E[R_k] = 2 / n!.
+    """
+    if k == n - 1:
+        return 2 / math.factorial(n)
+    return 2 * ((k**2 + 3*k + 1) * n - (k**3 + 3*k**2 - k - 4)) / math.factorial(k + 3)
+
+
+def longitudes_esperadas(n):
+    """
+    rachas_esperadas(n, k) para k = 1, 2, ... hasta la primera longitud con
+    menos de 5 rachas esperadas; el resto se junta en la última clase.
+    """
+    esperadas = []
+    for k in range(1, n - 1):
+        esperada = rachas_esperadas(n, k)
+        esperadas.append(esperada)
+        if esperada < 5:
+            break
+    return esperadas
+
+
+def prueba_longitud_rachas(muestra, alpha=0.05):
+    """
+    Test de Longitud de Rachas: compara, con chi-cuadrado, cuántas rachas
+    ascendentes/descendentes hay de cada longitud con las esperadas para una
+    secuencia independiente. Las clases con menos de 5 rachas esperadas se
+    juntan en una clase final "k o más".
+    """
+    
+    # PASO 1: Rachas observadas por longitud (compartidas con la prueba de rachas ascendentes y descendentes)
+    estadisticas = Estadisticas.de(muestra)
+    m, longitudes = estadisticas.rachas_arriba_abajo()
+    n = m + 1
+    
+    # PASO 2: Clases de longitud: 1, 2, ... y la cola "k o más" con el resto de las rachas esperadas
+    esperadas = longitudes_esperadas(n)
+    total_esperado = (2 * n - 1) / 3
+    while esperadas and esperadas[-1] < 5:
+        esperadas.pop()
+    clases = []
+    for k, esperada in enumerate(esperadas, start=1):
+        oi = int(longitudes[k]) if k < len(longitudes) else 0
+        clases.append((str(k), oi, esperada))
+    cola = len(esperadas) + 1
+    clases.append((f"{cola} o más", int(longitudes[cola:].sum()), total_esperado - sum(esperadas)))
+    if len(clases) > 1 and clases[-1][2] < 5:
+        # La cola también debe tener al menos 5 rachas esperadas: se junta con la clase anterior
+        (_, oi_ant, ei_ant), (_, oi, ei) = clases.pop(-2), clases.pop()
+        clases.append((f"{cola - 1} o más", oi_ant + oi, ei_ant + ei))
+    
+    # PASO 3: Chi-cuadrado por clase
+    intervals_data = []
+    chi2_total = 0
+    for longitud, oi, ei in clases:
+        componente = ((oi - ei) ** 2) / ei if ei > 0 else 0
+        chi2_total += componente
+        intervals_data.append({
+            "Longitud": longitud,
+            "Oi": oi,
+            "Ei": round(ei, 4),
+            "(Oi-Ei)^2/Ei": round(componente, 6)
+        })
+    
+    # PASO 4: Decisión (hace falta al menos 2 clases para tener grados de libertad)
+    gl = len(clases) - 1
+    if gl < 1:
+        chi2_critico, p_value = None, None
+        decision = "Hay muy pocos datos para agrupar las rachas por longitud. La prueba no aplica."
+        cumple = False
+    else:
+        chi2_critico = float(chi2.ppf(1 - alpha, gl))
+        p_value = float(chi2.sf(chi2_total, gl))
+        cumple = bool(chi2_total <= chi2_critico)
+        decision = ("Pasa la prueba de longitud de rachas." if cumple
+                    else "No pasa la prueba de longitud de rachas.")
     
-    return json.dumps(result, indent=4)
+    # PASO 5: Resultado
+    return ResultadoLongitudRachas(
+        test_name="Prueba de Longitud de Rachas",
+        intervals_data=intervals_data,
+        statistics={
+            "Total_rachas": int(longitudes.sum()),
+            "Chi2_calculado": float(chi2_total),
+            "gl": gl,
+            "critical_value": chi2_critico,
+            "p_value": p_value
+        },
+        p_value=p_value,
+        decision=decision,
+        isApproved=cumple
+    )
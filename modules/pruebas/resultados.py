@@ -0,0 +1,145 @@
+from dataclasses import dataclass, fields
+from typing import Optional
+
+# Resultados de las pruebas estadísticas. Cada prueba devuelve uno de estos
+# objetos (con booleanos y números reales, no texto) y se convierten a JSON
+# una sola vez, al responder la petición HTTP, con a_dict(). Los nombres de
+# los campos son las claves que usan las plantillas y el JavaScript.
+
+
+class Resultado:
+    __slots__ = ()
+
+    def a_dict(self):
+        """Campos del resultado en un diccionario (sin copiar las tablas anidadas)."""
+        return {campo.name: getattr(self, campo.name) for campo in fields(self)}
+
+
+def resultado(cls):
+    """
+    @dataclass con __slots__ (un atributo por campo y sin __dict__). Equivale
+    a dataclass(slots=True), que recién existe en Python 3.10: la clase se
+    vuelve a crear con __slots__ antes de convertirla en dataclass.
+    """
+    atributos = {nombre: valor for nombre, valor in vars(cls).items()
+                 if nombre not in ("__dict__", "__weakref__")}
+    atributos["__slots__"] = tuple(cls.__annotations__)
+    return dataclass(type(cls)(cls.__name__, cls.__bases__, atributos))
+
+
+@resultado
+class ResultadoMedias(Resultado):
+    test_name: str
+    n: int
+    alpha: float
+    mu_esperada: float
+    media_muestra: float
+    z: float                    # Valor crítico Z
+    error: float
+    limite_inferior: float
+    limite_superior: float
+    p_value: float
+    decision: str
+    isApproved: bool
+
+
+@resultado
+class ResultadoVarianza(Resultado):
+    test_name: str
+    n: int
+    alpha: float
+    media_muestral: float
+    mu_esperada: float
+    alphaDiv2: float
+    z: float                    # Nivel de confianza (1-α/2)
+    varianza_muestral: float
+    Xi1: float
+    Xi2: float
+    limite_inferior: float
+    limite_superior: float
+    chi2: float
+    p_value: float
+    decision: str
+    isApproved: bool
+
+
+@resultado
+class ResultadoChiCuadrado(Resultado):
+    test_name: str
+    intervals: int
+    n: int
+    range: dict
+    intervals_data: list
+    statistics: dict
+    p_value: float
+    decision: str
+    isApproved: bool
+
+
+@resultado
+class ResultadoKS(Resultado):
+    test_name: str
+    sample_size: int
+    intervals: int
+    range: dict
+    intervals_data: list
+    statistics: dict
+    p_value: float
+    decision: str
+    isApproved: bool
+
+
+@resultado
+class ResultadoPoker(Resultado):
+    test_name: str
+    d: int
+    intervals_data: list
+    statistics: dict
+    p_value: float
+    decision: str
+    isApproved: bool
+
+
+@resultado
+class ResultadoRachas(Resultado):
+    test_name: str
+    Mediana_muestral: Optional[float]
+    Mediana_teorica: float
+    Total_may: int
+    Total_min: int
+    Total: int
+    Rachas: int
+    UR: float
+    Varianza: float
+    Z: Optional[float]
+    Rango_min: Optional[float]
+    Rango_max: Optional[float]
+    p_value: Optional[float]
+    decision: str
+    isApproved: bool
+
+
+@resultado
+class ResultadoRachasArribaAbajo(Resultado):
+    test_name: str
+    Total: int
+    Empates: int
+    Rachas: int
+    UR: float
+    Varianza: float
+    Z: Optional[float]
+    Rango_min: Optional[float]
+    Rango_max: Optional[float]
+    p_value: Optional[float]
+    decision: str
+    isApproved: bool
+
+
+@resultado
+class ResultadoLongitudRachas(Resultado):
+    test_name: str
+    intervals_data: list
+    statistics: dict
+    p_value: Optional[float]
+    decision: str
+    isApproved: bool
@@ -56,7 +56,7 @@ export async function postEvaluar(datos) {
    * 
    * @param {Object} datos - Configuración de las pruebas a ejecutar
    * @param {Array} datos.numeros - Números a analizar (opcional si ya están en servidor)
-   * @param {Object} datos.pruebas - Configuración de qué pruebas ejecutar
+   * @param {Object} datos.pruebasSeleccionadas - Configuración de qué pruebas ejecutar
    * @param {number} datos.alpha - Nivel de significancia (ej: 0.05)
    * @returns {Promise<Object>} Resultados de todas las pruebas ejecutadas
    * @throws {Error} Si la petición falla
@@ -64,12 +64,18 @@ export async function postEvaluar(datos) {
    * Endpoint: POST /evaluar
    * Propósito: Ejecutar múltiples pruebas estadísticas y obtener resultados
    */
-  const response = await fetch("/evaluar", {
+  // Los números viajan en binario (float64) y la configuración en la query string:
+  // ni el navegador ni el servidor tienen que escribir o leer un JSON con todos los números
+  const parametros = new URLSearchParams({
+    pruebasSeleccionadas: JSON.stringify(datos.pruebasSeleccionadas),
+    alpha: datos.alpha
+  });
+  const response = await fetch(`/evaluar?${parametros}`, {
     method: "POST",
     headers: {
-      "Content-Type": "application/json"
+      "Content-Type": "application/octet-stream"
     },
-    body: JSON.stringify(datos)                // Envía configuración completa
+    body: new Float64Array(datos.numeros)
   });
 
   // Verificar éxito de la petición
@@ -78,5 +84,35 @@ export async function postEvaluar(datos) {
   }
 
   // Parsear y retornar resultados de las pruebas
+  return response.json();
+}
+
+export async function postAgregar(datos) {
+  /**
+   * Agrega un lote de números al conjunto de la sesión y obtiene las pruebas actualizadas
+   * 
+   * @param {Object} datos - Lote y configuración de las pruebas
+   * @param {Array} datos.numeros - Solo los números nuevos (los anteriores ya están en el servidor)
+   * @param {Object} datos.pruebasSeleccionadas - Configuración de qué pruebas ejecutar
+   * @param {number} datos.alpha - Nivel de significancia (ej: 0.05)
+   * @param {boolean} datos.reiniciar - true para empezar un conjunto nuevo
+   * @returns {Promise<Object>} Resultados de todas las pruebas ejecutadas
+   * @throws {Error} Si la petición falla
+   * 
+   * Endpoint: POST /evaluar/agregar
+   * Propósito: Actualizar las pruebas sin reenviar ni reevaluar todos los números
+   */
+  const response = await fetch("/evaluar/agregar", {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json"
+    },
+    body: JSON.stringify(datos)
+  });
+
+  if (!response.ok) {
+    throw new Error("Error en /evaluar/agregar");
+  }
+
   return response.json();
 }
\ No newline at end of file
@@ -1,6 +1,15 @@
 // Importar funciones de otros archivos
-import { agregarNumero, importarCSV } from './numeros.js';
+import { agregarNumero, importarCSV, cargarNumeros } from './numeros.js';
 import { generarPruebas } from './pruebas.js';
+import { fetchNumeros } from './api.js';
+
+// En modo incremental se recupera el conjunto del servidor para seguir agregándole números
+if (sessionStorage.getItem("modoIncremental") === "true") {
+  document.getElementById("modoIncremental").checked = true;
+  fetchNumeros()
+    .then(data => cargarNumeros(data, data.length))
+    .catch(err => console.error("Error al cargar los números:", err));
+}
 
 // Botón para agregar números
 document.getElementById("btnAgregar").addEventListener("click", agregarNumero);
@@ -1,6 +1,21 @@
 // Array para guardar todos los números
 export let numeros = [];
 
+// En modo incremental: cuántos de esos números ya están en el servidor
+export let enviados = 0;
+
+// Función para reemplazar los números (p. ej. al recuperar el conjunto incremental)
+export function cargarNumeros(lista, yaEnviados = 0) {
+  numeros = lista;
+  enviados = yaEnviados;
+  mostrarNumeros();
+}
+
+// Función para marcar cuántos números ya están en el servidor (por defecto, todos)
+export function marcarEnviados(cantidad = numeros.length) {
+  enviados = cantidad;
+}
+
 // Función para agregar un número desde el input
 export function agregarNumero() {
   const input = document.getElementById("numeroInput");
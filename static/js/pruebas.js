@@ -1,6 +1,6 @@
 // Importar array de números y funciones de API
-import { numeros } from './numeros.js';
-import { postSet, postEvaluar } from './api.js';
+import { numeros, enviados, marcarEnviados } from './numeros.js';
+import { postSet, postEvaluar, postAgregar } from './api.js';
 
 // Función para obtener qué pruebas seleccionó el usuario
 export function getPruebasSeleccionadas() {
@@ -34,7 +34,9 @@ export function getPruebasSeleccionadas() {
     chi: chiChecked ? { k: chiK } : false,
     kolmogorov: kolChecked ? { k: kolK } : false,
     poker: document.getElementById("pruebaPoker").checked,
-    rachas: document.getElementById("pruebaRachas").checked
+    rachas: document.getElementById("pruebaRachas").checked,
+    arriba_abajo: document.getElementById("pruebaArribaAbajo").checked,
+    longitud_rachas: document.getElementById("pruebaLongitudRachas").checked
   };
 }
 
@@ -56,12 +58,30 @@ export async function generarPruebas() {
   // Preparar datos para enviar al servidor
   const datos = { numeros, pruebasSeleccionadas, alpha };
 
+  // Modo incremental: solo se envían los números nuevos y el servidor actualiza las pruebas
+  const incremental = document.getElementById("modoIncremental").checked;
+  sessionStorage.setItem("modoIncremental", incremental);
+
   try {
-    // Enviar números al servidor
-    await postSet(numeros);
+    let resultado;
+    if (incremental) {
+      resultado = await postAgregar({
+        numeros: numeros.slice(enviados),
+        pruebasSeleccionadas,
+        alpha,
+        reiniciar: enviados === 0
+      });
+      marcarEnviados();
+    } else {
+      // Enviar números al servidor
+      await postSet(numeros);
+
+      // Ejecutar las pruebas en el servidor
+      resultado = await postEvaluar(datos);
 
-    // Ejecutar las pruebas en el servidor
-    const resultado = await postEvaluar(datos);
+      // /set descarta el conjunto incremental: el próximo envío incremental empieza de nuevo
+      marcarEnviados(0);
+    }
 
     // Guardar resultados y redirigir a página de resultados
     sessionStorage.setItem("resultadosPruebas", JSON.stringify(resultado));
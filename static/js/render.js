@@ -14,8 +14,7 @@ export function renderResultados(resultados, nums) {
 
     // Recorrer cada prueba en los resultados
     Object.keys(resultados).forEach(pruebaKey => {
-        // Convertir resultado de JSON a objeto
-        const prueba = JSON.parse(resultados[pruebaKey]);
+        const prueba = resultados[pruebaKey];
 
         // Crear tarjeta para la prueba
         const card = document.createElement("div");
@@ -29,16 +28,20 @@ export function renderResultados(resultados, nums) {
         // Agregar resumen del resultado con color según pase o no
         const resumen = document.createElement("p");
         resumen.textContent = "→ " + prueba.decision;
-        resumen.style.color = prueba.decision.includes("Pasa") ||
-            prueba.decision.includes("No se rechaza") ?
+        resumen.style.color = prueba.isApproved ?
             temaHibrido.successColor : temaHibrido.errorColor;
         card.appendChild(resumen);
 
         let chartContainer = null;
         let canvas = null;
 
-        // Crear contenedor de gráfico para todas las pruebas excepto Poker
-        if (prueba.test_name !== "Prueba de Poker") {
+        // Crear contenedor de gráfico para todas las pruebas excepto las que solo muestran tablas
+        const sinGrafico = [
+            "Prueba de Poker",
+            "Prueba de Rachas Ascendentes y Descendentes",
+            "Prueba de Longitud de Rachas"
+        ];
+        if (!sinGrafico.includes(prueba.test_name)) {
             chartContainer = document.createElement("div");
             chartContainer.className = "chart-container";
             chartContainer.style.height = "400px";
@@ -124,7 +127,11 @@ export function renderResultados(resultados, nums) {
             // Agregar resumen al final de la tabla
             const tfoot = document.createElement("tfoot");
             [
-                ["DMAX", prueba.statistics.max_difference.toFixed(5)],
+                ["DMAX (tabla)", prueba.statistics.max_difference.toFixed(5)],
+                [prueba.statistics.D_reference
+                    ? `D (uniforme en [${prueba.statistics.D_reference.minimum}, ${prueba.statistics.D_reference.maximum}])`
+                    : "D", prueba.statistics.D.toFixed(5)],
+                ["p-value", prueba.statistics.p_value.toFixed(5)],
                 ["Crítico", prueba.statistics.critical_value.toFixed(5)],
                 ["Decisión", prueba.decision]
             ].forEach(([label, val]) => {
@@ -320,7 +327,7 @@ export function renderResultados(resultados, nums) {
         } else if (prueba.test_name === "Prueba de Rachas") {
             // Estadísticas para prueba de rachas
             stats.innerHTML = `
-                <div class="stat-item"><strong>Mediana muestral:</strong> ${prueba.Mediana_muestral}</div>
+                <div class="stat-item"><strong>Mediana muestral:</strong> ${prueba.Mediana_muestral ?? "—"}</div>
                 <div class="stat-item"><strong>Mediana teórica:</strong> ${prueba.Mediana_teorica}</div>
                 
                 <div class="stat-item"><strong>Rachas observadas:</strong> ${prueba.Rachas}</div>
@@ -333,6 +340,71 @@ export function renderResultados(resultados, nums) {
                 <div class="stat-item"><strong>Z:</strong> ${prueba.Z}</div>
                 <div class="stat-item"><strong>Rango crítico (95%):</strong> [${prueba.Rango_min}, ${prueba.Rango_max}]</div>
             `;
+        } else if (prueba.test_name === "Prueba de Rachas Ascendentes y Descendentes") {
+            // Estadísticas para rachas ascendentes y descendentes
+            stats.innerHTML = `
+                <div class="stat-item"><strong>Datos (sin empates):</strong> ${prueba.Total}</div>
+                <div class="stat-item"><strong>Empates descartados:</strong> ${prueba.Empates}</div>
+                <div class="stat-item"><strong>Rachas observadas:</strong> ${prueba.Rachas}</div>
+                <div class="stat-item"><strong>UR (esperado):</strong> ${prueba.UR.toFixed(5)}</div>
+                <div class="stat-item"><strong>Varianza:</strong> ${prueba.Varianza.toFixed(5)}</div>
+                <div class="stat-item"><strong>Z:</strong> ${prueba.Z ?? "—"}</div>
+                <div class="stat-item"><strong>p-value:</strong> ${prueba.p_value ?? "—"}</div>
+                <div class="stat-item"><strong>Rango crítico:</strong> [${prueba.Rango_min}, ${prueba.Rango_max}]</div>
+            `;
+        } else if (prueba.test_name === "Prueba de Longitud de Rachas") {
+            // Tabla de rachas observadas y esperadas por longitud
+            const tabla = document.createElement("table");
+            tabla.style.width = "100%";
+            tabla.style.marginTop = "15px";
+            tabla.style.borderCollapse = "collapse";
+            tabla.style.fontFamily = "'Roboto Mono', monospace";
+            tabla.style.fontSize = "13px";
+            tabla.style.color = "#e2e8f0";
+
+            const thead = document.createElement("thead");
+            const trHead = document.createElement("tr");
+            ["Longitud", "Oi", "Ei", "(Oi-Ei)²/Ei"].forEach(h => {
+                const th = document.createElement("th");
+                th.textContent = h;
+                th.style.borderBottom = "2px solid #06b6d4";
+                th.style.padding = "6px";
+                th.style.textAlign = "center";
+                trHead.appendChild(th);
+            });
+            thead.appendChild(trHead);
+            tabla.appendChild(thead);
+
+            const tbody = document.createElement("tbody");
+            prueba.intervals_data.forEach(row => {
+                const tr = document.createElement("tr");
+
+                [
+                    row.Longitud,
+                    row.Oi,
+                    row.Ei.toFixed(2),
+                    row["(Oi-Ei)^2/Ei"].toFixed(5)
+                ].forEach(val => {
+                    const td = document.createElement("td");
+                    td.textContent = val;
+                    td.style.padding = "6px";
+                    td.style.borderBottom = "1px solid #1e293b";
+                    td.style.textAlign = "center";
+                    tr.appendChild(td);
+                });
+
+                tbody.appendChild(tr);
+            });
+            tabla.appendChild(tbody);
+
+            card.appendChild(tabla);
+
+            stats.innerHTML = `
+                <div class="stat-item"><strong>Total de rachas:</strong> ${prueba.statistics.Total_rachas}</div>
+                <div class="stat-item"><strong>χ² calculado:</strong> ${prueba.statistics.Chi2_calculado.toFixed(5)}</div>
+                <div class="stat-item"><strong>χ² crítico:</strong> ${prueba.statistics.critical_value?.toFixed(5) ?? "—"}</div>
+                <div class="stat-item"><strong>p-value:</strong> ${prueba.statistics.p_value ?? "—"}</div>
+            `;
         }
 
         // Agregar sección de estadísticas a la tarjeta
@@ -11,20 +11,21 @@ export function renderResumenPruebas(resultados) {
         "Prueba Chi-Cuadrado",
         "Prueba KS",
         "Prueba de Poker",
-        "Prueba de Rachas"
+        "Prueba de Rachas",
+        "Prueba de Rachas Ascendentes y Descendentes",
+        "Prueba de Longitud de Rachas"
     ];
 
     // Recorrer cada prueba en el orden establecido
     orden.forEach(nombre => {
         // Buscar la prueba específica en los resultados
         const prueba = Object.values(resultados)
-            .map(r => JSON.parse(r))           // Convertir de JSON a objeto
             .find(p => p.test_name === nombre); // Encontrar por nombre
 
         // Si la prueba existe en los resultados
         if (prueba) {
             // Verificar si la prueba fue aprobada
-            const aprobado = prueba.isApproved === "True";
+            const aprobado = prueba.isApproved === true;
 
             // Crear elemento visual para la prueba
             const div = document.createElement("div");
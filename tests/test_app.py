@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+import app as aplicacion
+from modules.generadores import corridas
+
+
+@pytest.fixture
+def cliente():
+    return aplicacion.app.test_client()
+
+
+def test_estado_fuera_del_repositorio():
+    # conftest.py pone sesiones y corridas en una carpeta temporal
+    raiz = os.path.dirname(os.path.abspath(aplicacion.__file__))
+    for ruta in (aplicacion.RUTA_SESIONES, corridas.RUTA_CORRIDAS):
+        assert not os.path.abspath(ruta).startswith(raiz)
+
+
+def test_sesiones_aisladas():
+    uno, otro = aplicacion.app.test_client(), aplicacion.app.test_client()
+
+    assert uno.post("/set", json=[0.1, 0.2]).status_code == 204
+    uno.post("/lineal", data={"xo": 17, "k": 5, "c": 3, "g": 31, "iteraciones": 50})
+    assert uno.post("/evaluar/agregar", json={"numeros": [0.3, 0.4], "pruebasSeleccionadas": {"medias": True}}
+                    ).status_code == 200
+
+    # La otra cookie no ve los números, la corrida ni el conjunto incremental de la primera
+    assert otro.get("/all").get_json() == []
+    assert otro.get("/obtener_ri/lineal").get_json()["ri"] == []
+    respuesta = otro.post("/evaluar/agregar", json={"numeros": [0.9], "pruebasSeleccionadas": {"medias": True}})
+    assert respuesta.get_json()["medias"]["n"] == 1
+
+    assert uno.get("/all").get_json() == [0.1, 0.2, 0.3, 0.4]
+    assert len(uno.get("/obtener_ri/lineal").get_json()["ri"]) == 50
+    assert otro.get("/all").get_json() == [0.9]
+
+
+def test_limpieza_de_sesiones_espaciada(cliente, monkeypatch):
+    limpiezas = []
+    monkeypatch.setattr(aplicacion.sesiones, "limpiar", lambda: limpiezas.append("sesiones"))
+    monkeypatch.setattr(aplicacion.sesiones_incrementales, "limpiar", lambda: limpiezas.append("incrementales"))
+    monkeypatch.setattr(aplicacion, "ultima_limpieza_sesiones", float("-inf"))
+
+    # Varias peticiones sin cookie: solo la primera limpia
+    for _ in range(5):
+        cliente.delete_cookie(aplicacion.COOKIE_SESION)
+        assert cliente.get("/all").status_code == 200
+    assert limpiezas == ["sesiones", "incrementales"]
+
+    # Pasado el intervalo se vuelve a limpiar
+    monkeypatch.setattr(aplicacion, "ultima_limpieza_sesiones",
+                        aplicacion.ultima_limpieza_sesiones - aplicacion.INTERVALO_LIMPIEZA_SESIONES)
+    cliente.delete_cookie(aplicacion.COOKIE_SESION)
+    cliente.get("/all")
+    assert len(limpiezas) == 4
+
+
+@pytest.mark.parametrize("consulta", [
+    "lineal?xo=17&k=5&c=3&g=0",
+    "lineal?xo=17&k=5&c=3&g=65",
+    "lineal?xo=17&k=-1&c=3&g=31",
+    "lineal?xo=17&k=5&c=-3&g=31",
+    "lineal?xo=-17&k=5&c=3&g=31",
+    "multiplicativo?xo=17&t=-2&g=31",
+    "multiplicativo?xo=17&t=2&g=-4",
+    "lineal?xo=17&k=5&g=31",
+    "lineal?xo=17&k=5&c=3&g=31&inicio=0",
+    "otro?xo=17&g=31",
+])
+def test_ventana_rechaza_parametros_invalidos(cliente, consulta):
+    respuesta = cliente.get(f"/ventana/{consulta}")
+    assert respuesta.status_code == 400
+    assert "error" in respuesta.get_json()
+
+
+def test_ventana(cliente):
+    respuesta = cliente.get("/ventana/multiplicativo?xo=17&t=5&g=64&inicio=1000&cantidad=3")
+    assert respuesta.status_code == 200
+    datos = respuesta.get_json()
+    assert datos["i"] == [1000, 1001, 1002]
+    assert datos["Xi"][1] == (43 * datos["Xi"][0]) % 2 ** 64
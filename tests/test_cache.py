@@ -0,0 +1,61 @@
+import numpy as np
+
+from modules.generadores.cache import CacheLRU
+
+
+def test_acierto_y_fallo():
+    cache = CacheLRU(1000)
+    llamadas = []
+
+    def calcular():
+        llamadas.append(1)
+        return np.zeros(10)
+
+    primero = cache.obtener("a", calcular)
+    segundo = cache.obtener("a", calcular)
+    assert primero is segundo
+    assert len(llamadas) == 1
+    assert (cache.aciertos, cache.fallos) == (1, 1)
+    assert cache.estadisticas()["tasa_aciertos"] == 0.5
+
+
+def test_desaloja_la_usada_hace_mas_tiempo():
+    cache = CacheLRU(3 * 80)
+    for clave in "abc":
+        cache.guardar(clave, np.zeros(10))   # 80 bytes cada uno
+    assert cache.bytes == 240
+
+    cache.obtener("a", lambda: None)          # "a" pasa a ser la más reciente
+    cache.guardar("d", np.zeros(10))
+    assert "b" not in cache
+    assert all(clave in cache for clave in "acd")
+    assert cache.bytes == 240
+    assert cache.desalojos == 1
+
+
+def test_reemplazo_descuenta_el_valor_anterior():
+    cache = CacheLRU(1000)
+    cache.guardar("a", np.zeros(10))
+    cache.guardar("a", np.zeros(20))
+    assert len(cache) == 1
+    assert cache.bytes == 160
+
+
+def test_valor_mas_grande_que_el_presupuesto():
+    cache = CacheLRU(100)
+    cache.guardar("a", np.zeros(5))
+    valor = cache.obtener("grande", lambda: np.zeros(100))
+    assert len(valor) == 100
+    assert "grande" not in cache
+    assert "a" in cache and cache.bytes == 40
+
+
+def test_tamano_por_cantidad_de_entradas():
+    cache = CacheLRU(2, tamano=lambda valor: 1)
+    for clave in "abc":
+        cache.guardar(clave, {"resultado": clave})
+    assert "a" not in cache and "b" in cache and "c" in cache
+    assert cache.bytes == 2
+
+    cache.limpiar()
+    assert len(cache) == 0 and cache.bytes == 0
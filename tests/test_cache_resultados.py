@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+import app as aplicacion
+from modules.generadores.cache import CacheLRU
+from modules.pruebas.dispatcher import clave_resultados
+
+PRUEBAS = {"medias": True, "chi": {"k": 8}, "kolmogorov": {"k": 10}, "poker": {"d": 5}}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = CacheLRU(aplicacion.MAX_RESULTADOS_PRUEBAS, tamano=lambda resultados: 1)
+    monkeypatch.setattr(aplicacion, "cache_resultados", cache)
+    return cache
+
+
+@pytest.fixture
+def cliente():
+    return aplicacion.app.test_client()
+
+
+def datos_de_prueba():
+    return np.random.default_rng(3).random(2000)
+
+
+def evaluar(cliente, datos, pruebas=PRUEBAS, alpha=0.05):
+    return cliente.post("/evaluar", json={"numeros": datos.tolist(), "pruebasSeleccionadas": pruebas, "alpha": alpha})
+
+
+def test_misma_bateria_acierta(cliente, cache):
+    datos = datos_de_prueba()
+    primera = evaluar(cliente, datos)
+    # Las mismas pruebas en otro orden y otros números iguales (otro arreglo) dan la misma clave
+    segunda = evaluar(cliente, datos.copy(), dict(reversed(list(PRUEBAS.items()))))
+    assert primera.status_code == segunda.status_code == 200
+    assert primera.get_json() == segunda.get_json()
+    assert (cache.fallos, cache.aciertos) == (1, 1)
+
+    contadores = cliente.get("/cache/pruebas").get_json()
+    assert contadores["aciertos"] == 1 and contadores["fallos"] == 1 and contadores["entradas"] == 1
+
+
+@pytest.mark.parametrize("cambio", ["alpha", "k", "dato"])
+def test_cambios_fallan(cliente, cache, cambio):
+    datos = datos_de_prueba()
+    evaluar(cliente, datos)
+
+    pruebas, alpha = PRUEBAS, 0.05
+    if cambio == "alpha":
+        alpha = 0.01
+    elif cambio == "k":
+        pruebas = dict(PRUEBAS, chi={"k": 9})
+    else:
+        datos = datos.copy()
+        datos[1234] = np.nextafter(datos[1234], 1.0)
+    assert evaluar(cliente, datos, pruebas, alpha).status_code == 200
+    assert (cache.fallos, cache.aciertos) == (2, 0)
+    assert len(cache) == 2
+
+
+def test_clave_resultados():
+    datos = datos_de_prueba()
+    clave = clave_resultados(datos, PRUEBAS, 0.05)
+    assert clave == clave_resultados(datos.tolist(), PRUEBAS, 0.05)
+    assert clave != clave_resultados(datos[:-1], PRUEBAS, 0.05)
+    assert clave != clave_resultados(datos.astype(np.float32), PRUEBAS, 0.05)
+
+
+def test_errores_no_se_guardan(cliente, cache):
+    datos = datos_de_prueba()
+    respuesta = evaluar(cliente, datos, {"poker": {"d": 7}})
+    assert respuesta.status_code == 400
+    assert len(cache) == 0
+
+    # La misma petición vuelve a calcularse (y a fallar) en lugar de leer un error guardado
+    assert evaluar(cliente, datos, {"poker": {"d": 7}}).status_code == 400
+    assert cache.aciertos == 0 and cache.fallos == 2
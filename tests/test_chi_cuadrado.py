@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+from scipy.stats import chi2, chisquare
+
+from modules.pruebas.prueba_chi2_2 import prueba_chi_cuadrado
+
+
+@pytest.mark.parametrize("k", [4, 8, 10, 20])
+def test_grados_de_libertad_k_menos_1(k):
+    datos = np.random.default_rng(k).random(3000)
+    resultado = prueba_chi_cuadrado(datos, k=k, alpha=0.05)
+
+    observados = [intervalo["frecuencia_obt"] for intervalo in resultado.intervals_data]
+    referencia = chisquare(observados)
+    assert resultado.statistics["chi2_total"] == pytest.approx(referencia.statistic)
+    assert resultado.p_value == pytest.approx(referencia.pvalue)
+    assert resultado.statistics["chi2_critico"] == pytest.approx(chi2.ppf(0.95, k - 1))
+    assert resultado.isApproved == (referencia.statistic <= chi2.ppf(0.95, k - 1))
@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+import pytest
+
+from modules.generadores import congruencia_lineal, corridas
+
+
+@pytest.fixture(autouse=True)
+def carpeta_corridas(tmp_path, monkeypatch):
+    monkeypatch.setattr(corridas, "RUTA_CORRIDAS", str(tmp_path))
+    return tmp_path
+
+
+def guardar(n, parametros=None, filas_por_bloque=700):
+    parametros = parametros or {"metodo": "lineal", "x_o": 17, "k": 5, "c": 3, "g": 31}
+    bloques = congruencia_lineal.generar_por_bloques(17, 5, 3, 31, n, filas_por_bloque)
+    return corridas.guardar_corrida(bloques, n, parametros)
+
+
+def test_ida_y_vuelta():
+    id_ = guardar(2500)
+    leida = corridas.abrir_corrida(id_)
+    completa = congruencia_lineal.generar(17, 5, 3, 31, 2500, procesos=1)
+
+    assert list(leida.columnas) == ["i", "Xi", "Ri"]
+    for columna in ("i", "Xi", "Ri"):
+        assert isinstance(leida[columna], np.memmap)
+        assert np.array_equal(leida[columna], completa[columna])
+    assert np.array_equal(corridas.ri_corrida(id_), completa["Ri"])
+
+
+def test_xi_de_objetos_con_g_mayor_a_64():
+    bloques = congruencia_lineal.generar_por_bloques(17, 5, 3, 80, 1500, 600)
+    id_ = corridas.guardar_corrida(bloques, 1500, {"metodo": "lineal", "g": 80})
+    leida = corridas.abrir_corrida(id_)
+    assert leida["Xi"].tolist() == congruencia_lineal.generar(17, 5, 3, 80, 1500)["Xi"].tolist()
+
+
+def test_misma_corrida_se_reutiliza(carpeta_corridas):
+    id_ = guardar(1000)
+    archivo = os.path.join(carpeta_corridas, id_, "columna_2.npy")
+    modificado = os.stat(archivo).st_mtime_ns
+
+    assert guardar(1000) == id_
+    assert os.stat(archivo).st_mtime_ns == modificado
+    assert guardar(1001) != id_
+    assert sorted(os.listdir(carpeta_corridas)) == sorted([id_, corridas.id_corrida(
+        {"metodo": "lineal", "x_o": 17, "k": 5, "c": 3, "g": 31}, 1001)])
+
+
+@pytest.mark.parametrize("anunciadas", [999, 1001])
+def test_filas_distintas_a_las_anunciadas(carpeta_corridas, anunciadas):
+    bloques = congruencia_lineal.generar_por_bloques(17, 5, 3, 31, 1000, 300)
+    with pytest.raises(ValueError):
+        corridas.guardar_corrida(bloques, anunciadas, {"metodo": "lineal"})
+    # No quedan carpetas temporales ni corridas a medias
+    assert os.listdir(carpeta_corridas) == []
+
+
+def test_limpiar_borra_las_menos_usadas(carpeta_corridas):
+    ids = [guardar(1000, {"corrida": j}) for j in range(4)]
+    for j, id_ in enumerate(ids):
+        os.utime(os.path.join(carpeta_corridas, id_), (1000 + j, 1000 + j))
+
+    tamano = sum(entrada.stat().st_size for entrada in os.scandir(os.path.join(carpeta_corridas, ids[0])))
+    corridas.limpiar_corridas(conservar=ids[0], max_bytes=2 * tamano)
+
+    # Se borran las más antiguas salvo la que se pide conservar
+    assert sorted(os.listdir(carpeta_corridas)) == sorted([ids[0], ids[3]])
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from scipy.special import ndtri
+from scipy.stats import kstest
+
+from modules.generadores.distribucion_normal import (METODOS_NORMAL, U_MIN, distribucion_normal_inversa,
+                                                     normal_acklam, normal_box_muller)
+from modules.generadores.ziggurat import muestras_ziggurat
+
+
+def uniformes_de_prueba(n=200_000, semilla=4):
+    generador = np.random.default_rng(semilla)
+    # Incluye las colas de Acklam (u < 0.02425 o u > 0.97575) hasta el recorte U_MIN
+    return np.concatenate([generador.random(n), generador.random(1000) * 1e-6,
+                           1 - generador.random(1000) * 1e-6, [U_MIN, 1 - U_MIN, 0.5, 0.02425, 0.97575]])
+
+
+def test_acklam_igual_a_ndtri():
+    u = uniformes_de_prueba()
+    exactos = ndtri(u)
+    # Error relativo de la aproximación de Acklam: < 1.15e-9
+    assert np.all(np.abs(normal_acklam(u) - exactos) <= 1.15e-9 * np.abs(exactos) + 1e-15)
+
+
+def test_box_muller_pares_y_distribucion():
+    u = np.clip(np.random.default_rng(8).random(200_000), U_MIN, 1 - U_MIN)
+    z = normal_box_muller(u)
+    radio = np.sqrt(-2 * np.log(u[0::2]))
+    assert np.allclose(z[0::2], radio * np.cos(2 * np.pi * u[1::2]), rtol=1e-12, atol=1e-12)
+    assert np.allclose(z[1::2], radio * np.sin(2 * np.pi * u[1::2]), rtol=1e-12, atol=1e-12)
+    # No es una inversa: se compara la distribución, igual que ndtri sobre los mismos uniformes
+    assert kstest(z, "norm").pvalue > 1e-3
+    assert kstest(ndtri(u), "norm").pvalue > 1e-3
+
+
+@pytest.mark.parametrize("n", [1, 2, 7, 1001])
+def test_box_muller_n_impar(n):
+    u = np.random.default_rng(n).random(n)
+    df = distribucion_normal_inversa(u, 2.0, 10.0, "box_muller")
+    assert len(df) == n - n % 2
+    assert df.attrs["uniformes_consumidos"] == n - n % 2
+    assert np.array_equal(df["U"].to_numpy(), u[:n - n % 2])
+
+
+@pytest.mark.parametrize("metodo", ["ndtri", "acklam"])
+def test_inversas_consumen_un_uniforme_por_valor(metodo):
+    u = np.random.default_rng(2).random(999)
+    df = distribucion_normal_inversa(u, 2.0, 10.0, metodo)
+    assert df.attrs["uniformes_consumidos"] == 999
+    assert np.array_equal(df["i"].to_numpy(), np.arange(999))
+    assert np.allclose(df["Ni"].to_numpy(), 10.0 + 2.0 * ndtri(np.clip(u, U_MIN, 1 - U_MIN)), rtol=1e-8)
+
+
+def test_ziggurat_consumidos():
+    u = np.random.default_rng(6).random(50_000)
+    df = distribucion_normal_inversa(u, 1.0, 0.0, "ziggurat")
+    muestras, consumidos = muestras_ziggurat(u)
+    assert df.attrs["uniformes_consumidos"] == consumidos <= len(u)
+    assert "U" not in df.columns
+    assert np.array_equal(df["Ni"].to_numpy(), muestras)
+
+
+def test_metodos_disponibles_y_desconocido():
+    assert set(METODOS_NORMAL) == {"ndtri", "acklam", "box_muller", "ziggurat"}
+    with pytest.raises(ValueError, match="no soportado"):
+        distribucion_normal_inversa([0.5], 1.0, 0.0, "polar")
+
+
+def test_desviacion_no_positiva_no_da_resultados():
+    for metodo in METODOS_NORMAL:
+        assert len(distribucion_normal_inversa(np.random.default_rng(1).random(100), 0.0, 0.0, metodo)) == 0
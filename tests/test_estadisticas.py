@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from modules.pruebas.estadisticas import ELEMENTOS_POR_BLOQUE, Estadisticas
+
+
+@pytest.mark.parametrize("n", [2, 3, 1000, ELEMENTOS_POR_BLOQUE, 3 * ELEMENTOS_POR_BLOQUE + 17])
+@pytest.mark.parametrize("desplazamiento", [0.0, 1e6])
+def test_momentos_en_una_pasada(n, desplazamiento):
+    datos = desplazamiento + np.random.default_rng(n).random(n)
+    estadisticas = Estadisticas(datos)
+
+    assert estadisticas.suma == pytest.approx(np.sum(datos), rel=1e-14)
+    assert estadisticas.media == pytest.approx(np.mean(datos), rel=1e-14)
+    assert estadisticas.varianza == pytest.approx(np.var(datos, ddof=1), rel=1e-9)
+    assert estadisticas.suma_cuadrados == pytest.approx(np.dot(datos, datos), rel=1e-12)
+
+
+def test_un_solo_dato():
+    estadisticas = Estadisticas([0.25])
+    assert estadisticas.media == 0.25
+    assert np.isnan(estadisticas.varianza)
@@ -0,0 +1,95 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+import app as aplicacion
+
+PRUEBAS = {"medias": True, "varianza": True, "chi": {"k": 8}, "kolmogorov": {"k": 10}, "poker": True, "rachas": True}
+
+
+@pytest.fixture
+def cliente():
+    return aplicacion.app.test_client()
+
+
+def datos_de_prueba(semilla=1, n=3000):
+    return np.random.default_rng(semilla).random(n)
+
+
+def evaluar_json(cliente, datos):
+    respuesta = cliente.post("/evaluar", json={"numeros": datos.tolist(), "pruebasSeleccionadas": PRUEBAS,
+                                               "alpha": 0.05})
+    assert respuesta.status_code == 200
+    return respuesta.get_json()
+
+
+def evaluar_binario(cliente, cuerpo, tipo="float64"):
+    consulta = {"pruebasSeleccionadas": json.dumps(PRUEBAS), "alpha": "0.05", "tipo": tipo}
+    return cliente.post("/evaluar", query_string=consulta, data=cuerpo,
+                        content_type="application/octet-stream")
+
+
+def archivo_npy(datos):
+    contenido = io.BytesIO()
+    np.save(contenido, datos)
+    contenido.seek(0)
+    return contenido
+
+
+def test_float64_igual_a_json(cliente):
+    datos = datos_de_prueba()
+    respuesta = evaluar_binario(cliente, datos.astype("<f8").tobytes())
+    assert respuesta.status_code == 200
+    assert respuesta.get_json() == evaluar_json(cliente, datos)
+
+
+def test_float32(cliente):
+    datos = datos_de_prueba().astype(np.float32)
+    respuesta = evaluar_binario(cliente, datos.astype("<f4").tobytes(), "float32")
+    assert respuesta.status_code == 200
+    assert respuesta.get_json() == evaluar_json(cliente, datos.astype(np.float64))
+
+
+def test_multipart_varios_conjuntos(cliente):
+    uno, otro = datos_de_prueba(1), datos_de_prueba(2, 1500)
+    respuesta = cliente.post("/evaluar", content_type="multipart/form-data", data={
+        "pruebasSeleccionadas": json.dumps(PRUEBAS),
+        "alpha": "0.05",
+        "uno": (archivo_npy(uno), "uno.npy"),
+        "otro": (io.BytesIO(otro.astype("<f8").tobytes()), "otro.f8"),
+    })
+    assert respuesta.status_code == 200
+    resultados = respuesta.get_json()
+    assert resultados["uno.npy"] == evaluar_json(cliente, uno)
+    assert resultados["otro.f8"] == evaluar_json(cliente, otro)
+
+
+@pytest.mark.parametrize("cuerpo", [b"", b"\x00" * 8 * 10 + b"\x01\x02\x03"])
+def test_cuerpos_invalidos(cliente, cuerpo):
+    respuesta = evaluar_binario(cliente, cuerpo)
+    assert respuesta.status_code == 400
+    assert "error" in respuesta.get_json()
+
+
+def test_float32_incompleto(cliente):
+    assert evaluar_binario(cliente, b"\x00" * 6, "float32").status_code == 400
+
+
+def test_multipart_invalido(cliente):
+    sin_archivos = cliente.post("/evaluar", content_type="multipart/form-data",
+                                data={"pruebasSeleccionadas": json.dumps(PRUEBAS)})
+    assert sin_archivos.status_code == 400
+
+    matriz = cliente.post("/evaluar", content_type="multipart/form-data", data={
+        "pruebasSeleccionadas": json.dumps(PRUEBAS),
+        "matriz": (archivo_npy(np.zeros((3, 3))), "matriz.npy"),
+    })
+    assert matriz.status_code == 400
+
+    vacio = cliente.post("/evaluar", content_type="multipart/form-data", data={
+        "pruebasSeleccionadas": json.dumps(PRUEBAS),
+        "vacio": (io.BytesIO(b""), "vacio.f8"),
+    })
+    assert vacio.status_code == 400
@@ -0,0 +1,105 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+import app as aplicacion
+from modules.generadores import congruencia_lineal, congruencia_multi
+from modules.generadores.exportacion import (ALINEACION_CRUDO, encabezado_crudo, encabezado_npy, flujo_crudo,
+                                             flujo_npy)
+
+LINEAL = {"xo": 17, "k": 5, "c": 3, "g": 31, "iteraciones": 5000}
+
+
+@pytest.fixture
+def cliente():
+    return aplicacion.app.test_client()
+
+
+def bloques_lineales(n=5000, filas_por_bloque=1200):
+    return congruencia_lineal.generar_por_bloques(17, 5, 3, 31, n, filas_por_bloque)
+
+
+def test_flujo_npy(tmp_path):
+    ruta = tmp_path / "ri.npy"
+    ruta.write_bytes(b"".join(flujo_npy(bloques_lineales(), 5000)))
+
+    completa = congruencia_lineal.generar(17, 5, 3, 31, 5000)
+    assert np.array_equal(np.load(ruta), completa["Ri"])
+    assert np.array_equal(np.load(ruta, mmap_mode="r"), completa["Ri"])
+    assert len(encabezado_npy(5000)) % 64 == 0
+
+
+@pytest.mark.parametrize("n", [0, 1, 5000, 12345])
+def test_encabezado_crudo_alineado(n):
+    encabezado = encabezado_crudo(n, {"metodo": "lineal", "xo": 17})
+    assert len(encabezado) % ALINEACION_CRUDO == 0
+    assert encabezado.endswith(b"\n")
+    descripcion = json.loads(encabezado)
+    offsets = [columna["offset"] for columna in descripcion["columnas"]]
+    assert offsets == [len(encabezado), len(encabezado) + 4 * n]
+    assert all(offset % 4 == 0 for offset in offsets)
+
+
+def test_flujo_crudo_se_mapea(tmp_path):
+    parametros = {"metodo": "multiplicativo", "xo": 17, "t": 5, "g": 32}
+    ruta = tmp_path / "secuencia.bin"
+    crear_bloques = lambda: congruencia_multi.generar_por_bloques(17, 5, 32, 3000, 700)
+    ruta.write_bytes(b"".join(flujo_crudo(crear_bloques, 3000, parametros)))
+
+    with open(ruta, "rb") as archivo:
+        descripcion = json.loads(archivo.readline())
+    assert descripcion["parametros"] == parametros
+    columnas = {c["nombre"]: np.memmap(ruta, dtype=c["dtype"], mode="r", offset=c["offset"], shape=(3000,))
+                for c in descripcion["columnas"]}
+
+    completa = congruencia_multi.generar(17, 5, 32, 3000)
+    assert np.array_equal(columnas["Xi"], completa["Xi"].astype(np.uint32))
+    assert np.array_equal(columnas["Ri"], completa["Ri"].astype(np.float32))
+    assert ruta.stat().st_size == descripcion["columnas"][1]["offset"] + 4 * 3000
+
+
+@pytest.mark.parametrize("formato", ["npy", "crudo"])
+def test_content_length_igual_a_lo_enviado(cliente, formato):
+    respuesta = cliente.post(f"/export_binario/lineal/{formato}", data=LINEAL)
+    assert respuesta.status_code == 200
+    cuerpo = respuesta.get_data()
+    assert int(respuesta.headers["Content-Length"]) == len(cuerpo)
+
+    if formato == "npy":
+        ri = np.load(io.BytesIO(cuerpo))
+        assert np.array_equal(ri, congruencia_lineal.generar(17, 5, 3, 31, 5000)["Ri"])
+
+
+def test_cuadrados_npy(cliente):
+    respuesta = cliente.post("/export_binario/cuadrados/npy", data={"semilla": 5735, "iteraciones": 100})
+    assert respuesta.status_code == 200
+    assert int(respuesta.headers["Content-Length"]) == len(respuesta.get_data())
+
+
+@pytest.mark.parametrize("ruta, formulario", [
+    ("lineal/crudo", dict(LINEAL, g=33)),
+    ("multiplicativo/crudo", {"xo": 17, "t": 5, "g": 40, "iteraciones": 100}),
+    ("lineal/zip", LINEAL),
+    ("lineal/npy", {"xo": 17, "k": 5, "g": 31, "iteraciones": 100}),
+])
+def test_exportaciones_invalidas(cliente, ruta, formulario):
+    respuesta = cliente.post(f"/export_binario/{ruta}", data=formulario)
+    assert respuesta.status_code == 400
+    assert "error" in respuesta.get_json()
+
+
+def test_parquet(cliente):
+    respuesta = cliente.post("/export_binario/lineal/parquet", data=LINEAL)
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        # pyarrow es opcional: sin él la exportación responde 501
+        assert respuesta.status_code == 501
+        return
+
+    tabla = pq.read_table(io.BytesIO(respuesta.get_data()))
+    completa = congruencia_lineal.generar(17, 5, 3, 31, 5000)
+    assert np.array_equal(tabla["Xi"].to_numpy(), completa["Xi"])
+    assert np.array_equal(tabla["Ri"].to_numpy(), completa["Ri"])
@@ -0,0 +1,111 @@
+import json
+
+import numpy as np
+import pytest
+
+from modules.pruebas.estadisticas import Estadisticas
+from modules.pruebas.incremental import EstadisticasIncrementales, RANGO_INCREMENTAL
+from modules.pruebas.prueba_chi2_2 import bordes_chi
+
+PRUEBAS = {"chi": {"k": 8}, "kolmogorov": {"k": 10}, "poker": {"d": 4}}
+
+
+def lotes_de_prueba(semilla=7):
+    rng = np.random.default_rng(semilla)
+    # Dos decimales: hay empates, que las rachas ascendentes y descendentes deben saltar
+    datos = np.round(rng.random(5000), 2)
+    tamanos = [1, 1, 2, 500, 37, 1, 1999, 1, 2459]
+    return datos, np.split(datos, np.cumsum(tamanos)[:-1])
+
+
+def acumular(lotes, serializar=False):
+    incrementales = EstadisticasIncrementales()
+    incrementales.preparar(PRUEBAS)
+    for lote in lotes:
+        if serializar:
+            # Como entre peticiones: el estado pasa por JSON en el almacén de la sesión
+            incrementales = EstadisticasIncrementales.desde_dict(json.loads(json.dumps(incrementales.a_dict())))
+        incrementales.agregar(lote)
+    return incrementales
+
+
+@pytest.mark.parametrize("serializar", [False, True])
+def test_lotes_igual_a_todos_los_datos(serializar):
+    datos, lotes = lotes_de_prueba()
+    incrementales = acumular(lotes, serializar)
+    completas = Estadisticas(datos)
+
+    assert incrementales.n == len(datos)
+    assert incrementales.media == pytest.approx(completas.media, rel=1e-12)
+    assert incrementales.suma == pytest.approx(completas.suma, rel=1e-12)
+    assert incrementales.varianza == pytest.approx(completas.varianza, rel=1e-10)
+    assert incrementales.rachas(0.5) == completas.rachas(0.5)
+
+    m, longitudes = incrementales.rachas_arriba_abajo()
+    m_completo, longitudes_completas = completas.rachas_arriba_abajo()
+    assert m == m_completo
+    largo = max(len(longitudes), len(longitudes_completas))
+    assert np.array_equal(np.pad(longitudes, (0, largo - len(longitudes))),
+                          np.pad(longitudes_completas, (0, largo - len(longitudes_completas))))
+
+    assert incrementales.patrones_poker(4) == completas.patrones_poker(4)
+    assert incrementales.patrones_poker(5) == completas.patrones_poker(5)
+
+    bordes = bordes_chi(*RANGO_INCREMENTAL, 8)
+    assert np.array_equal(incrementales.histograma(bordes), completas.histograma(bordes))
+
+
+def test_varianza_con_media_lejos_de_cero():
+    # Welford no pierde precisión con datos desplazados (la fórmula de sumas sí)
+    datos = 1e8 + np.arange(1000, dtype=np.float64) / 7
+    incrementales = EstadisticasIncrementales()
+    for lote in np.array_split(datos, 13):
+        incrementales.agregar(lote)
+    assert incrementales.varianza == pytest.approx(np.var(datos, ddof=1), rel=1e-9)
+
+
+def test_registrar_despues_de_tener_datos():
+    datos, lotes = lotes_de_prueba(3)
+    incrementales = EstadisticasIncrementales()
+    incrementales.agregar(lotes[0])
+    incrementales.agregar(lotes[1])
+
+    previos = np.concatenate(lotes[:2])
+    with pytest.raises(ValueError):
+        incrementales.preparar({"chi": {"k": 6}})
+    incrementales.preparar({"chi": {"k": 6}, "poker": {"d": 3}}, datos_previos=lambda: previos)
+    for lote in lotes[2:]:
+        incrementales.agregar(lote)
+
+    completas = Estadisticas(datos)
+    bordes = bordes_chi(*RANGO_INCREMENTAL, 6)
+    assert np.array_equal(incrementales.histograma(bordes), completas.histograma(bordes))
+    assert incrementales.patrones_poker(3) == completas.patrones_poker(3)
+
+
+def test_sin_datos_ordenados():
+    incrementales = acumular(lotes_de_prueba()[1])
+    assert incrementales.mediana is None
+    with pytest.raises(ValueError):
+        incrementales.ordenados
+    with pytest.raises(ValueError):
+        incrementales.d_kolmogorov()
+    with pytest.raises(ValueError):
+        incrementales.hasta([0.3])
+
+
+def test_ks_sin_tabla_usa_los_bordes():
+    from modules.pruebas.ks import kolmogorov_smirnov_test
+
+    # Todos los datos en la mitad inferior: KS debe rechazar también sin la tabla
+    incrementales = EstadisticasIncrementales()
+    incrementales.preparar(PRUEBAS)
+    incrementales.agregar(np.linspace(0.0, 0.5, 2000))
+
+    con_tabla = kolmogorov_smirnov_test(incrementales, k=10, tabla=True)
+    sin_tabla = kolmogorov_smirnov_test(incrementales, k=10, tabla=False)
+    assert sin_tabla.intervals_data == []
+    assert sin_tabla.statistics["D"] == pytest.approx(con_tabla.statistics["D"])
+    assert sin_tabla.statistics["D"] == pytest.approx(0.5)
+    assert not sin_tabla.statistics["D_all_points"]
+    assert not sin_tabla.isApproved
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from scipy.stats import kstest
+
+from modules.pruebas.estadisticas import Estadisticas
+from modules.pruebas.incremental import EstadisticasIncrementales
+from modules.pruebas.ks import kolmogorov_smirnov_test
+
+
+@pytest.mark.parametrize("n", [5, 200, 5000])
+def test_d_igual_a_scipy(n):
+    datos = np.random.default_rng(n).random(n) * 0.9  # Sin datos cerca de 1: D no es trivial
+    resultado = kolmogorov_smirnov_test(datos, k=10)
+    referencia = kstest(datos, "uniform", method="exact" if n <= 200 else "auto")
+
+    assert resultado.statistics["D"] == pytest.approx(referencia.statistic)
+    assert resultado.p_value == pytest.approx(referencia.pvalue, rel=1e-6, abs=1e-12)
+    assert resultado.statistics["D_all_points"]
+    assert resultado.statistics["D_reference"] == {"minimum": 0.0, "maximum": 1.0}
+    # La tabla, en cambio, usa el rango observado
+    assert resultado.range["minimum"] == datos.min() and resultado.range["maximum"] == datos.max()
+
+
+def test_errores_de_d_no_se_ocultan(monkeypatch):
+    def falla(self, minimo=0.0, maximo=1.0):
+        raise ValueError("error dentro de d_kolmogorov")
+
+    monkeypatch.setattr(Estadisticas, "d_kolmogorov", falla)
+    with pytest.raises(ValueError, match="dentro de d_kolmogorov"):
+        kolmogorov_smirnov_test(np.random.default_rng(0).random(100))
+
+
+def test_incrementales_usan_los_bordes():
+    incrementales = EstadisticasIncrementales()
+    incrementales.preparar({"kolmogorov": {"k": 10}})
+    incrementales.agregar(np.random.default_rng(1).random(1000))
+
+    resultado = kolmogorov_smirnov_test(incrementales, k=10)
+    assert not resultado.statistics["D_all_points"]
+    assert resultado.statistics["D"] == resultado.statistics["max_difference"]
+    assert resultado.statistics["D_reference"] == {"minimum": 0.0, "maximum": 1.0}
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from modules.generadores import congruencia_lineal, congruencia_multi
+from modules.generadores.motor_congruencial import TAMANO_BLOQUE, saltar, secuencia_congruencial, tablas_bloque
+
+
+def secuencia_iterativa(x, a, c, g, n):
+    m = 2 ** g
+    valores = []
+    for _ in range(n):
+        x = (a * x + c) % m
+        valores.append(x)
+    return valores
+
+
+@pytest.mark.parametrize("a, c, g", [
+    (11, 3, 31),                # Congruencia lineal típica (a = 1 + 2k)
+    (43, 0, 20),                # Multiplicativa (a = 8t + 3)
+    (6364136223846793005, 1442695040888963407, 64),  # Aritmética en el límite de uint64
+    (5, 7, 1),
+])
+def test_bloques_igual_a_la_recurrencia(a, c, g):
+    # Más de un bloque, con el último incompleto
+    n = TAMANO_BLOQUE + 1234
+    obtenido = secuencia_congruencial(17, a, c, g, n)
+    assert obtenido.dtype == np.uint64
+    assert obtenido.tolist() == secuencia_iterativa(17, a, c, g, n)
+
+
+def test_g_mayor_a_64_usa_enteros_exactos():
+    a, c, g = 1 + 2 * 12345, 99991, 80
+    assert secuencia_congruencial(3, a, c, g, 500).tolist() == secuencia_iterativa(3, a, c, g, 500)
+
+
+def test_tablas_de_salto():
+    a, c, g = 11, 3, 64
+    A, C = tablas_bloque(a, c, 1000)
+    x0 = 123456789
+    for j in (1, 2, 3, 500, 1000):
+        esperado = secuencia_iterativa(x0, a, c, g, j)[-1]
+        assert (int(A[j - 1]) * x0 + int(C[j - 1])) % 2 ** 64 == esperado
+
+
+def test_n_cero():
+    assert len(secuencia_congruencial(5, 11, 3, 31, 0)) == 0
+
+
+def test_generar_lineal_y_multiplicativo():
+    lineal = congruencia_lineal.generar(17, 5, 3, 16, 3000, procesos=1)
+    assert lineal["Xi"].tolist() == secuencia_iterativa(17, 11, 3, 16, 3000)
+    assert np.array_equal(lineal["i"], np.arange(1, 3001))
+
+    multi = congruencia_multi.generar(17, 5, 16, 3000, procesos=1)
+    assert multi["Xi"].tolist() == secuencia_iterativa(17, 43, 0, 16, 3000)
+
+
+def test_por_bloques_igual_a_generar():
+    completo = congruencia_lineal.generar(17, 5, 3, 31, 10_000, procesos=1)
+    bloques = list(congruencia_lineal.generar_por_bloques(17, 5, 3, 31, 10_000, filas_por_bloque=3000))
+    assert [len(b) for b in bloques] == [3000, 3000, 3000, 1000]
+    for columna in ("i", "Xi", "Ri"):
+        assert np.array_equal(np.concatenate([b[columna] for b in bloques]), completo[columna])
+
+
+@pytest.mark.parametrize("pasos", [0, 1, 2, 63, 64, 65, TAMANO_BLOQUE + 1, 100_000])
+def test_saltar_igual_a_avanzar(pasos):
+    a, c, g = 11, 3, 64
+    esperado = 17 if pasos == 0 else secuencia_iterativa(17, a, c, g, pasos)[-1]
+    assert saltar(17, a, c, g, pasos) == esperado
+    assert congruencia_lineal.saltar_a(17, 5, 3, 64, pasos) == esperado
+
+
+def test_saltar_multiplicativo():
+    completo = congruencia_multi.generar(17, 5, 20, 5000, procesos=1)
+    for indice in (1, 2, 1000, 5000):
+        assert congruencia_multi.saltar_a(17, 5, 20, indice) == completo["Xi"][indice - 1]
+
+
+@pytest.mark.parametrize("inicio, cantidad", [(1, 10), (2, 1), (4000, 1000), (4990, 11), (100, 0)])
+def test_ventana_igual_a_un_tramo(inicio, cantidad):
+    lineal = congruencia_lineal.generar(17, 5, 3, 31, 5000, procesos=1)
+    multi = congruencia_multi.generar(17, 5, 31, 5000, procesos=1)
+    tramo = slice(inicio - 1, inicio - 1 + cantidad)
+    for completo, parcial in ((lineal, congruencia_lineal.ventana(17, 5, 3, 31, inicio, cantidad)),
+                              (multi, congruencia_multi.ventana(17, 5, 31, inicio, cantidad))):
+        for columna in ("i", "Xi", "Ri"):
+            assert np.array_equal(parcial[columna], completo[columna][tramo])
+
+
+@pytest.mark.parametrize("procesos", [2, 3])
+def test_por_bloques_en_paralelo_igual_al_secuencial(procesos):
+    secuencial = list(congruencia_lineal.generar_por_bloques(17, 5, 3, 64, 25_000, 4000, procesos=1))
+    paralelo = list(congruencia_lineal.generar_por_bloques(17, 5, 3, 64, 25_000, 4000, procesos=procesos))
+    assert [len(b) for b in paralelo] == [len(b) for b in secuencial]
+    for bloque_paralelo, bloque_secuencial in zip(paralelo, secuencial):
+        for columna in ("i", "Xi", "Ri"):
+            assert np.array_equal(bloque_paralelo[columna], bloque_secuencial[columna])
+
+    multi = np.concatenate([b["Xi"] for b in congruencia_multi.generar_por_bloques(17, 5, 40, 9000, 2000,
+                                                                                   procesos=procesos)])
+    assert np.array_equal(multi, congruencia_multi.generar(17, 5, 40, 9000, procesos=1)["Xi"])
+
+
+def test_llamadas_concurrentes_con_distintos_procesos():
+    # Todas comparten un pool: pedir otra cantidad de procesos no cierra el que usan los demás hilos
+    from concurrent.futures import ThreadPoolExecutor
+    from modules.generadores.motor_congruencial import columnas_paralelas
+
+    esperado = secuencia_congruencial(17, 11, 3, 40, 30_000)
+    with ThreadPoolExecutor(max_workers=4) as hilos:
+        futuros = [hilos.submit(columnas_paralelas, 17, 11, 3, 40, 30_000, 2 ** 40, procesos)
+                   for procesos in (2, 3, 4, 2, 3, 4)]
+        for futuro in futuros:
+            xi, _ = futuro.result()
+            assert np.array_equal(xi, esperado)
@@ -0,0 +1,68 @@
+import pytest
+
+from modules.generadores.minimos_cuadrados import siguiente_estado
+from modules.generadores.periodo import periodo_cuadrados, periodo_lineal, periodo_multiplicativo
+
+
+def periodo_por_recorrido(x0, a, c, m):
+    # a es impar, así que la recurrencia es biyectiva y la semilla siempre vuelve
+    x = (a * x0 + c) % m
+    pasos = 1
+    while x != x0:
+        x = (a * x + c) % m
+        pasos += 1
+    return pasos
+
+
+@pytest.mark.parametrize("g", [1, 2, 3, 5, 8, 10])
+def test_periodo_lineal(g):
+    m = 2 ** g
+    for k in range(0, 6):
+        for c in range(0, 5):
+            for x_o in range(0, min(m, 12)):
+                resultado = periodo_lineal(x_o, k, c, g)
+                assert resultado["periodo"] == periodo_por_recorrido(x_o, 1 + 2 * k, c, m)
+                assert resultado["maximo_valores"] == resultado["periodo"]
+                assert resultado["periodo_completo"] == (resultado["periodo"] == m)
+
+
+def test_hull_dobell():
+    assert periodo_lineal(7, 2, 3, 16)["hull_dobell"]        # a = 5, c impar
+    assert not periodo_lineal(7, 1, 3, 16)["hull_dobell"]    # a = 3 ≢ 1 (mod 4)
+    assert not periodo_lineal(7, 2, 4, 16)["hull_dobell"]    # c par
+    assert periodo_lineal(7, 2, 3, 64)["periodo"] == 2 ** 64
+
+
+@pytest.mark.parametrize("g", [1, 2, 3, 4, 7, 10])
+def test_periodo_multiplicativo(g):
+    m = 2 ** g
+    for t in range(0, 6):
+        for x0 in range(0, min(m, 20)):
+            esperado = periodo_por_recorrido(x0, 8 * t + 3, 0, m)
+            assert periodo_multiplicativo(x0, t, g)["periodo"] == esperado
+
+
+def test_periodo_multiplicativo_maximo():
+    resultado = periodo_multiplicativo(13, 5, 32)
+    assert resultado["periodo"] == 2 ** 30
+    assert resultado["periodo_completo"]
+
+
+@pytest.mark.parametrize("semilla", [0, 1, 10, 99, 1234, 2100, 3792, 5735, 6100, 9999, 12345, 987654])
+def test_periodo_cuadrados(semilla):
+    vistos = {}
+    x = semilla
+    while x is not None and x not in vistos:
+        vistos[x] = len(vistos)
+        x = siguiente_estado(x)
+
+    resultado = periodo_cuadrados(semilla)
+    if x is None:
+        assert resultado["degenerada"]
+        assert resultado["periodo"] == 0
+        assert resultado["maximo_valores"] == len(vistos) - 1
+    else:
+        assert not resultado["degenerada"]
+        assert resultado["cola"] == vistos[x]
+        assert resultado["periodo"] == len(vistos) - vistos[x]
+        assert resultado["maximo_valores"] == len(vistos)
@@ -0,0 +1,66 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from modules.pruebas.estadisticas import MANOS_POKER, manos_poker, tabla_poker
+from modules.pruebas.poker import poker_test_json, probabilidades_poker
+
+
+def categoria(digitos, d):
+    """Letra de la mano de poker de una cadena de d dígitos, por las multiplicidades de sus dígitos."""
+    multiplicidades = tuple(sorted(Counter(digitos).values(), reverse=True))
+    return next(letra for letra, manos in MANOS_POKER[d].items() if manos == multiplicidades)
+
+
+def conteos_por_cadena(datos, d, decimales):
+    letras = Counter(categoria(f"{x:.{decimales}f}".split(".")[1][:d], d) for x in datos)
+    return [letras[letra] for letra in MANOS_POKER[d]]
+
+
+@pytest.mark.parametrize("d", [3, 4, 5])
+def test_tabla_igual_al_clasificador_de_cadenas(d):
+    letras = list(MANOS_POKER[d])
+    tabla = tabla_poker(d)
+    assert len(tabla) == 10 ** d
+    for entero in range(10 ** d):
+        assert letras[tabla[entero]] == categoria(str(entero).zfill(d), d)
+
+
+@pytest.mark.parametrize("d", [3, 4, 5])
+def test_frecuencias_de_la_tabla(d):
+    # Cada categoría aparece en la tabla tantas veces como indica su probabilidad teórica
+    conteos = np.bincount(tabla_poker(d), minlength=len(MANOS_POKER[d]))
+    probabilidades = probabilidades_poker(d)
+    assert conteos.tolist() == [round(probabilidades[letra] * 10 ** d) for letra in MANOS_POKER[d]]
+
+
+@pytest.mark.parametrize("d", [3, 4, 5])
+def test_manos_igual_a_los_digitos_escritos(d):
+    # Números con 8 decimales exactos: su cadena con 8 decimales son los dígitos escritos
+    datos = np.random.default_rng(d).integers(0, 10 ** 8, 20_000) / 10 ** 8
+    assert manos_poker(datos, d).tolist() == conteos_por_cadena(datos, d, 8)
+
+
+@pytest.mark.parametrize("d", [3, 4, 5])
+def test_bordes_del_margen(d):
+    # Productos que quedan un ulp por debajo del entero: 0.29 * 10^5 = 28999.999999999996
+    datos = [0.29, 0.99999, 0.57, 0.58, 0.1, 0.3, 0.7, 0.00001, 0.0, 0.12345, 0.11111, 0.9, 0.123,
+             0.0003, 0.00056, 0.00112, 0.00399]
+    assert manos_poker(datos, d).tolist() == conteos_por_cadena(datos, d, 8)
+    for x in datos:
+        letra = list(MANOS_POKER[d])[np.argmax(manos_poker([x], d))]
+        assert letra == categoria(f"{x:.8f}"[2:2 + d], d), x
+
+
+def test_casos_conocidos():
+    letras = list(MANOS_POKER[5])
+    datos = (0.29, 0.99999, 0.12345, 0.11234, 0.0003, 0.00112)
+    clase = {x: letras[np.argmax(manos_poker([x], 5))] for x in datos}
+    # Sin el margen, 0.0003 y 0.00112 se leerían como 00029 (K) y 00111 (F)
+    assert clase == {0.29: "K", 0.99999: "Q", 0.12345: "D", 0.11234: "O", 0.0003: "P", 0.00112: "T"}
+
+
+def test_d_no_soportado():
+    with pytest.raises(ValueError):
+        poker_test_json([0.1, 0.2], d=6)
@@ -0,0 +1,102 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from modules.pruebas.estadisticas import Estadisticas
+from modules.pruebas.rachas import (longitudes_esperadas, prueba_longitud_rachas, prueba_rachas,
+                                    prueba_rachas_arriba_abajo, rachas_esperadas)
+
+
+def longitudes_por_recorrido(datos):
+    """Largo de cada racha ascendente/descendente, recorriendo los datos uno por uno (sin empates)."""
+    longitudes = []
+    sube_anterior = None
+    for anterior, actual in zip(datos, datos[1:]):
+        sube = actual > anterior
+        if sube == sube_anterior:
+            longitudes[-1] += 1
+        else:
+            longitudes.append(1)
+        sube_anterior = sube
+    return longitudes
+
+
+@pytest.mark.parametrize("n", [3, 4, 5, 6, 7])
+def test_rachas_esperadas_por_enumeracion(n):
+    # Todas las permutaciones de n datos distintos son igualmente probables si los datos son independientes
+    conteos = np.zeros(n)
+    for permutacion in itertools.permutations(range(n)):
+        for longitud in longitudes_por_recorrido(permutacion):
+            conteos[longitud] += 1
+    promedio = conteos / math.factorial(n)
+
+    for k in range(1, n):
+        assert rachas_esperadas(n, k) == pytest.approx(promedio[k])
+    assert sum(rachas_esperadas(n, k) for k in range(1, n)) == pytest.approx((2 * n - 1) / 3)
+
+
+def test_longitudes_esperadas_cortan_en_5():
+    esperadas = longitudes_esperadas(1000)
+    assert esperadas == [rachas_esperadas(1000, k) for k in range(1, len(esperadas) + 1)]
+    assert all(e >= 5 for e in esperadas[:-1]) and esperadas[-1] < 5
+
+
+def test_longitudes_observadas_igual_al_recorrido():
+    datos = np.random.default_rng(9).random(3000)
+    m, longitudes = Estadisticas(datos).rachas_arriba_abajo()
+    assert m == len(datos) - 1
+    assert np.array_equal(longitudes[1:], np.bincount(longitudes_por_recorrido(datos.tolist()))[1:])
+
+
+def test_arriba_abajo_a_mano():
+    # Diferencias: +, -, 0 (empate), -, +, +, -  ->  sin el empate: + | - - | + + | -  (4 rachas)
+    datos = [0.1, 0.5, 0.3, 0.3, 0.2, 0.8, 0.9, 0.4]
+    resultado = prueba_rachas_arriba_abajo(datos)
+    assert resultado.Total == 7
+    assert resultado.Empates == 1
+    assert resultado.Rachas == 4
+    assert resultado.UR == pytest.approx(13 / 3)
+    assert resultado.Varianza == pytest.approx(83 / 90)
+    assert resultado.Z == pytest.approx((4 - 13 / 3) / math.sqrt(83 / 90))
+    assert resultado.p_value == pytest.approx(2 * norm.sf(abs(resultado.Z)))
+    assert resultado.isApproved
+
+    longitudes = prueba_longitud_rachas(datos)
+    assert longitudes.statistics["Total_rachas"] == 4
+
+
+def test_rachas_a_mano():
+    # Signos respecto a 0.5: + + - - - + - +  ->  5 rachas, 4 arriba y 4 abajo
+    datos = [0.7, 0.9, 0.1, 0.2, 0.4, 0.5, 0.3, 0.6]
+    resultado = prueba_rachas(datos)
+    assert (resultado.Total_may, resultado.Total_min, resultado.Rachas) == (4, 4, 5)
+    assert resultado.UR == pytest.approx(5.0)
+    assert resultado.Varianza == pytest.approx(2 * 16 * (32 - 8) / (64 * 7))
+    assert resultado.Z == pytest.approx(0.0)
+    assert resultado.Mediana_muestral == pytest.approx(0.45)
+
+
+@pytest.mark.parametrize("datos", [[], [0.3], [0.3, 0.3]])
+def test_menos_de_2_datos_distintos(datos):
+    rachas = prueba_rachas(datos)
+    arriba_abajo = prueba_rachas_arriba_abajo(datos)
+    longitudes = prueba_longitud_rachas(datos)
+
+    for resultado in (rachas, arriba_abajo, longitudes):
+        assert resultado.p_value is None
+        assert not resultado.isApproved
+        assert "no aplica" in resultado.decision
+    assert rachas.Rachas == min(len(datos), 1)
+    assert arriba_abajo.Rachas == 0
+
+
+def test_dos_datos():
+    arriba_abajo = prueba_rachas_arriba_abajo([0.3, 0.7])
+    assert (arriba_abajo.Total, arriba_abajo.Rachas) == (2, 1)
+    assert arriba_abajo.UR == pytest.approx(1.0) and arriba_abajo.Z == pytest.approx(0.0)
+    # Una racha de cada lado: el número de rachas está determinado (varianza 0)
+    assert prueba_rachas([0.3, 0.7]).Varianza == 0
+    assert "no aplica" in prueba_longitud_rachas([0.3, 0.7]).decision
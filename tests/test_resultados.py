@@ -0,0 +1,18 @@
+import pytest
+
+from modules.pruebas.resultados import ResultadoKS, ResultadoRachas
+
+
+def test_resultado_con_slots():
+    resultado = ResultadoRachas("Rachas", None, 0.5, 3, 2, 5, 4, 3.5, 1.2, None, None, None, None, "Pasa", True)
+    assert not hasattr(resultado, "__dict__")
+    with pytest.raises(AttributeError):
+        resultado.otro_campo = 1
+    assert resultado.a_dict()["Mediana_teorica"] == 0.5
+    assert list(resultado.a_dict()) == list(ResultadoRachas.__annotations__)
+
+
+def test_a_dict_no_copia_las_tablas():
+    intervalos = [{"No": 1}]
+    resultado = ResultadoKS("KS", 10, 1, {}, intervalos, {}, 0.5, "Pasa", True)
+    assert resultado.a_dict()["intervals_data"] is intervalos
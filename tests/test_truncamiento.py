@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from modules.generadores.truncamiento import truncar_decimales_inteligente, truncar_decimales_vectorizado
+
+
+def valores_de_prueba(semilla):
+    generador = np.random.default_rng(semilla)
+    # Valores justo debajo y encima de cada frontera de 5 decimales (x.xxxxx9999...)
+    fronteras = generador.integers(0, 10 ** 5, 20_000) / 10 ** 5
+    return np.concatenate([
+        generador.random(50_000),                                # Ri típicos en [0, 1)
+        generador.integers(0, 2 ** 31, 20_000) / 2.0 ** 31,      # Xi / m de congruencia
+        generador.integers(0, 10_000, 10_000) / 10_000,          # Extracciones de cuadrados medios
+        np.nextafter(fronteras, -np.inf),
+        np.nextafter(fronteras, np.inf),
+        fronteras - 1e-12,
+        generador.uniform(-1e6, 1e6, 10_000),                    # Magnitudes y signos arbitrarios
+        generador.random(10_000) * 1e-5,                         # Valores que truncan a 0
+    ])
+
+
+BORDES = [0.0, -0.0, 1.0, np.nextafter(1.0, 0.0), 1 - 1e-16, 0.99999999, 0.123459999,
+          0.999999999, 1e-05, np.nextafter(1e-05, 0.0), 5e-324, 0.1 + 0.2, 0.29, 0.57]
+
+
+def bits(valores):
+    return np.asarray(valores, dtype=np.float64).view(np.int64)
+
+
+@pytest.mark.parametrize("semilla", [0, 1, 2])
+def test_vectorizado_igual_bit_a_bit_al_escalar(semilla):
+    valores = valores_de_prueba(semilla)
+    esperado = [truncar_decimales_inteligente(v) for v in valores]
+    # view(int64) distingue 0.0 de -0.0 y cualquier diferencia de un ulp
+    np.testing.assert_array_equal(bits(truncar_decimales_vectorizado(valores)), bits(esperado))
+
+
+@pytest.mark.parametrize("valor", BORDES)
+def test_bordes(valor):
+    assert bits([truncar_decimales_vectorizado(np.array([valor]))[0]]) == bits([truncar_decimales_inteligente(valor)])
+
+
+def test_no_devuelve_cero_negativo():
+    resultado = truncar_decimales_vectorizado(np.array([-0.0, -1e-7]))
+    assert not np.signbit(resultado).any()
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from scipy.stats import kstest
+
+from modules.generadores import congruencia_lineal
+from modules.generadores.ziggurat import FuenteUniformes, muestras_ziggurat, tabla_ziggurat
+
+
+@pytest.mark.parametrize("distribucion, referencia", [("normal", "norm"), ("exponencial", "expon")])
+def test_distribucion(distribucion, referencia):
+    uniformes = np.random.default_rng(11).random(1_000_000)
+    muestras, consumidos = muestras_ziggurat(uniformes, 200_000, distribucion)
+    assert len(muestras) == 200_000
+    assert kstest(muestras, referencia).pvalue > 1e-3
+    if distribucion == "normal":
+        assert abs(np.mean(muestras)) < 0.01 and abs(np.std(muestras) - 1) < 0.01
+        # La cola x > R también se muestrea
+        assert np.any(np.abs(muestras) > tabla_ziggurat("normal")[0][1])
+
+
+@pytest.mark.parametrize("distribucion", ["normal", "exponencial"])
+def test_uniformes_consumidos(distribucion):
+    fuente = FuenteUniformes(np.random.default_rng(5).random(500_000))
+    muestras, consumidos = muestras_ziggurat(fuente, 100_000, distribucion)
+    assert consumidos == fuente.consumidos
+    # Dos por intento y un ~2-3 % de intentos extra (cuñas, cola y rechazos)
+    assert 2.0 < consumidos / len(muestras) < 2.1
+
+
+def test_se_terminan_los_uniformes():
+    uniformes = np.random.default_rng(2).random(10_001)
+    muestras, consumidos = muestras_ziggurat(uniformes, 1_000_000)
+    assert 4800 < len(muestras) < 5000
+    assert consumidos <= len(uniformes)
+
+    todas, _ = muestras_ziggurat(uniformes)
+    assert np.array_equal(todas, muestras)
+
+
+def test_bloques_igual_a_un_arreglo():
+    bloques = list(congruencia_lineal.generar_por_bloques(17, 5, 3, 40, 60_000, 7_000))
+    uniformes = np.concatenate([bloque.ri for bloque in bloques])
+
+    desde_bloques, consumidos_bloques = muestras_ziggurat(iter(bloques), 20_000)
+    desde_arreglo, consumidos_arreglo = muestras_ziggurat(uniformes, 20_000)
+    assert np.array_equal(desde_bloques, desde_arreglo)
+    assert consumidos_bloques == consumidos_arreglo
+
+
+def test_fuente_entre_bloques():
+    fuente = FuenteUniformes(iter([np.arange(3.0), np.arange(3.0, 5.0), np.arange(5.0, 9.0)]))
+    assert fuente.tomar(4).tolist() == [0, 1, 2, 3]
+    assert fuente.tomar(0).tolist() == []
+    assert fuente.tomar(10).tolist() == [4, 5, 6, 7, 8]
+    assert fuente.consumidos == 9